@@ -0,0 +1,6 @@
+"""Shared helpers for AgentTeams scripts.
+
+Scripts under ``scripts/`` are executed directly (``python scripts/<name>.py``),
+which places this directory on ``sys.path`` so ``agentteams_lib`` is importable
+without installation.
+"""
@@ -0,0 +1,236 @@
+"""Approval-chain state machine shared by the task validators, audit and orchestrate.
+
+A task's approval evidence is a stream of events: team-leader gate results,
+the QA gate, the overall leader gate, and declarations (which matter only
+when they record rework). ``ApprovalChain.apply`` folds one event into the
+current state in O(1):
+
+- per team, the latest timestamped leader result (ties go to the later event)
+- the QA and leader gate results
+- the latest rework declaration time
+
+so a whole task costs O(events) and appending an event never requires a
+replay. History moved out by ``task archive`` enters the fold through its
+digest (``history_events``), so an archived rejection still needs a later
+rework declaration. ``violations`` checks the chain policy (team leaders ->
+QA -> overall leader; rejections need a later rework declaration) against
+that state and returns findings that each caller words in its own output
+format. ``taskmodel.Task`` builds the same events once at load and hands them
+to ``ApprovalChain.from_task`` directly.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import re
+
+APPROVAL_STATUS = {"pending", "approved", "rejected"}
+TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+QA_TEAM = "qa-review-guild"
+COORDINATOR_TEAM = "coordinator"
+REWORK_MARKERS = ("rework", "fix", "address_rejection")
+REVIEW_STATUSES = {"in_review", "done"}
+
+
+def parse_at(value: object) -> datetime | None:
+    raw = str(value or "").strip()
+    if not TIMESTAMP_PATTERN.fullmatch(raw):
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+def leader_teams(required_teams: list[str] | set[str]) -> list[str]:
+    """Teams whose leader must approve: the required teams plus coordinator, minus QA."""
+    teams = sorted({str(team).strip() for team in required_teams if str(team).strip()} | {COORDINATOR_TEAM})
+    return [team for team in teams if team != QA_TEAM]
+
+
+def is_rework_action(action: object) -> bool:
+    text = str(action or "").strip().lower()
+    return any(marker in text for marker in REWORK_MARKERS)
+
+
+@dataclass
+class ApprovalEvent:
+    kind: str  # team_leader | qa | leader | declaration
+    at: datetime | None
+    status: str = ""
+    team: str = ""
+    action: str = ""
+
+
+@dataclass
+class GateState:
+    status: str = ""
+    at: datetime | None = None
+    seq: int = -1
+
+
+@dataclass
+class Violation:
+    code: str
+    teams: list[str] = field(default_factory=list)
+    status: str = ""
+
+
+def history_events(history: object) -> list[ApprovalEvent]:
+    """Events standing in for history moved out by ``task archive`` (see ``taskhistory``).
+
+    The digest keeps the last state of each team leader gate and the last rework time, which is all
+    the fold needs from the archived entries.
+    """
+    if not isinstance(history, dict):
+        return []
+    events: list[ApprovalEvent] = []
+    gates = history.get("team_leader_gates")
+    for team, gate in sorted(gates.items()) if isinstance(gates, dict) else []:
+        if isinstance(gate, dict) and str(team).strip():
+            status = str(gate.get("status") or "").strip()
+            events.append(ApprovalEvent("team_leader", parse_at(gate.get("at")), status, str(team).strip()))
+    rework_at = parse_at(history.get("last_rework_at"))
+    if rework_at is not None:
+        events.append(ApprovalEvent("declaration", rework_at, action="rework"))
+    return events
+
+
+def task_events(task: dict) -> list[ApprovalEvent]:
+    """Events in document order (archived history first, then gates, then declarations)."""
+    events = history_events(task.get("history"))
+    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
+    gates = approvals.get("team_leader_gates")
+    for gate in gates if isinstance(gates, list) else []:
+        if isinstance(gate, dict):
+            events.append(
+                ApprovalEvent(
+                    "team_leader",
+                    parse_at(gate.get("at")),
+                    str(gate.get("status") or "").strip(),
+                    str(gate.get("team") or "").strip(),
+                )
+            )
+    for kind, key in [("qa", "qa_gate"), ("leader", "leader_gate")]:
+        gate = approvals.get(key)
+        if isinstance(gate, dict):
+            events.append(ApprovalEvent(kind, parse_at(gate.get("at")), str(gate.get("status") or "").strip()))
+    declarations = task.get("declarations")
+    for entry in declarations if isinstance(declarations, list) else []:
+        if isinstance(entry, dict):
+            events.append(
+                ApprovalEvent("declaration", parse_at(entry.get("at")), action=str(entry.get("action") or "").strip())
+            )
+    return events
+
+
+class ApprovalChain:
+    def __init__(self, required_leaders: list[str]) -> None:
+        self.required_leaders = list(required_leaders)
+        self.teams: dict[str, GateState] = {}
+        self.teams_seen: set[str] = set()
+        self.qa = GateState()
+        self.leader = GateState()
+        self.last_rework_at: datetime | None = None
+        self._seq = 0
+
+    @classmethod
+    def from_task(cls, task: object, required_leaders: list[str]) -> "ApprovalChain":
+        """Chain of a task mapping, or of a ``taskmodel.Task``, whose events are already built."""
+        chain = cls(required_leaders)
+        for event in task_events(task) if isinstance(task, dict) else task.approval_events:
+            chain.apply(event)
+        return chain
+
+    def apply(self, event: ApprovalEvent) -> None:
+        self._seq += 1
+        if event.kind == "declaration":
+            if event.at is not None and is_rework_action(event.action):
+                if self.last_rework_at is None or event.at > self.last_rework_at:
+                    self.last_rework_at = event.at
+            return
+        if event.kind == "team_leader":
+            if not event.team:
+                return
+            self.teams_seen.add(event.team)
+            if event.at is None:
+                return
+            current = self.teams.get(event.team)
+            if current is None or event.at >= current.at:
+                self.teams[event.team] = GateState(event.status, event.at, self._seq)
+            return
+        if event.kind in ("qa", "leader"):
+            # One QA / leader gate per task: a newer event replaces it unless it is timestamped earlier.
+            current = self.qa if event.kind == "qa" else self.leader
+            if current.seq < 0 or event.at is None or current.at is None or event.at >= current.at:
+                state = GateState(event.status, event.at, self._seq)
+                if event.kind == "qa":
+                    self.qa = state
+                else:
+                    self.leader = state
+            return
+        raise ValueError(f"unknown approval event kind: {event.kind}")
+
+    def team_status(self, team: str) -> str:
+        state = self.teams.get(team)
+        return state.status if state is not None else ""
+
+    def rejected_gates(self, strict: bool = False) -> list[GateState]:
+        """Rejected gates of required teams, QA and leader that carry a valid timestamp.
+
+        ``strict`` also counts rejections by teams outside the required set and
+        QA / leader rejections whose timestamp is missing or malformed.
+        """
+        teams = self.teams if strict else {team: self.teams[team] for team in self.required_leaders if team in self.teams}
+        gates = [state for state in teams.values() if state.status == "rejected"]
+        gates.extend(gate for gate in (self.qa, self.leader) if gate.status == "rejected" and (strict or gate.at is not None))
+        return gates
+
+    @property
+    def rework_required(self) -> bool:
+        times = [gate.at for gate in self.rejected_gates() if gate.at is not None]
+        return bool(times) and (self.last_rework_at is None or self.last_rework_at < max(times))
+
+    def next_gate(self) -> str:
+        """The gate the chain is waiting on: team_leaders, qa, leader, rework or complete."""
+        if self.rework_required:
+            return "rework"
+        if any(self.team_status(team) != "approved" for team in self.required_leaders):
+            return "team_leaders"
+        if self.qa.status != "approved":
+            return "qa"
+        if self.leader.status != "approved":
+            return "leader"
+        return "complete"
+
+    def violations(self, task_status: str, strict_rejections: bool = False) -> list[Violation]:
+        found: list[Violation] = []
+        if task_status in REVIEW_STATUSES:
+            missing = [team for team in self.required_leaders if team not in self.teams_seen]
+            if missing:
+                found.append(Violation("team_leaders_missing", missing))
+            not_approved = [team for team in self.required_leaders if self.team_status(team) != "approved"]
+            if not_approved:
+                found.append(Violation("team_leaders_not_approved", not_approved))
+            if self.qa.status != "approved":
+                found.append(Violation("qa_not_approved", status=self.qa.status))
+        if task_status == "done" and self.leader.status != "approved":
+            found.append(Violation("leader_not_approved", status=self.leader.status))
+
+        if self.qa.status == "approved" and self.qa.at is not None:
+            for team in self.required_leaders:
+                state = self.teams.get(team)
+                if state is not None and state.at > self.qa.at:
+                    found.append(Violation("team_after_qa", [team]))
+
+        if self.leader.status == "approved":
+            if self.qa.status != "approved":
+                found.append(Violation("leader_before_qa"))
+            if self.leader.at is not None and self.qa.at is not None and self.leader.at < self.qa.at:
+                found.append(Violation("leader_at_before_qa_at"))
+
+        if task_status == "done" and self.rejected_gates(strict_rejections):
+            found.append(Violation("rejected_done"))
+        if self.rework_required:
+            found.append(Violation("rework_missing"))
+        return found
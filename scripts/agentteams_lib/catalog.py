@@ -0,0 +1,331 @@
+"""In-memory graph and ID-indexed store over the control-plane catalogs.
+
+Each catalog file is parsed once. Catalog entries become nodes keyed by
+``(kind, id)`` and every reference field becomes an edge, so integrity checks
+(dangling references, unreferenced skills, enabled rules pointing at disabled
+entries) are single passes over the edge list instead of repeated file loads.
+
+``CatalogStore`` is the write side: it keeps an ``id -> position`` index
+beside the ordered entry list, so ``add``/``upsert``/``disable``/``remove``
+are O(1) and applying ``m`` updates to a catalog of ``n`` entries costs
+O(n + m). On save, untouched entries are copied from the original text
+verbatim and only new or changed entries are rendered, and the file is
+re-hashed first so a concurrent edit is reported instead of overwritten.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+import re
+from typing import Callable
+
+from agentteams_lib.fsio import write_atomic
+from agentteams_lib import yamlio
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    kind: str
+    rel_path: str
+    list_key: str
+    id_key: str
+    enabled_key: str
+
+
+CATALOG_SPECS = [
+    CatalogSpec("team", "team-catalog/teams.yaml", "teams", "team_id", "active"),
+    CatalogSpec("rule", "rule-catalog/routing-rules.yaml", "rules", "rule_id", "enabled"),
+    CatalogSpec("skill", "skill-catalog/skills.yaml", "skills", "skill_id", "enabled"),
+]
+# (source kind, field, target kind): every reference the catalogs can carry.
+REFERENCE_FIELDS = [
+    ("team", "skill_refs", "skill"),
+    ("rule", "require_teams", "team"),
+    ("rule", "require_skills", "skill"),
+    ("skill", "applies_to_teams", "team"),
+]
+
+
+@dataclass
+class CatalogNode:
+    kind: str
+    node_id: str
+    index: int
+    item: dict
+    enabled: bool
+
+
+@dataclass
+class CatalogEdge:
+    source: CatalogNode
+    field_name: str
+    target_kind: str
+    target_id: str
+
+
+@dataclass
+class CatalogSection:
+    spec: CatalogSpec
+    path: Path
+    exists: bool = False
+    items: list = field(default_factory=list)
+    nodes: dict[str, CatalogNode] = field(default_factory=dict)
+    duplicates: list[str] = field(default_factory=list)
+
+
+class CatalogGraph:
+    def __init__(self) -> None:
+        self.sections: dict[str, CatalogSection] = {}
+        self.edges: list[CatalogEdge] = []
+        self.incoming: dict[tuple[str, str], list[CatalogEdge]] = {}
+
+    @classmethod
+    def load(cls, root: Path, loader: Callable[[Path], dict]) -> "CatalogGraph":
+        graph = cls()
+        for spec in CATALOG_SPECS:
+            section = CatalogSection(spec, root / spec.rel_path)
+            graph.sections[spec.kind] = section
+            if not section.path.exists():
+                continue
+            section.exists = True
+            data = loader(section.path)
+            items = data.get(spec.list_key)
+            section.items = items if isinstance(items, list) else []
+            for idx, item in enumerate(section.items):
+                if not isinstance(item, dict):
+                    continue
+                node_id = str(item.get(spec.id_key) or "").strip()
+                if not node_id:
+                    continue
+                if node_id in section.nodes:
+                    section.duplicates.append(node_id)
+                    continue
+                section.nodes[node_id] = CatalogNode(spec.kind, node_id, idx, item, item.get(spec.enabled_key) is True)
+
+        for source_kind, field_name, target_kind in REFERENCE_FIELDS:
+            for node in graph.sections[source_kind].nodes.values():
+                refs = node.item.get(field_name)
+                for ref in refs if isinstance(refs, list) else []:
+                    target_id = str(ref).strip()
+                    if not target_id:
+                        continue
+                    edge = CatalogEdge(node, field_name, target_kind, target_id)
+                    graph.edges.append(edge)
+                    graph.incoming.setdefault((target_kind, target_id), []).append(edge)
+        return graph
+
+    def ids(self, kind: str) -> set[str]:
+        return set(self.sections[kind].nodes)
+
+    def node(self, kind: str, node_id: str) -> CatalogNode | None:
+        return self.sections[kind].nodes.get(node_id)
+
+    def dangling_edges(self) -> list[CatalogEdge]:
+        return [edge for edge in self.edges if edge.target_id not in self.sections[edge.target_kind].nodes]
+
+    def unreferenced(self, kind: str, by: set[str] | None = None) -> list[CatalogNode]:
+        """Nodes of ``kind`` with no incoming edge (optionally only counting sources of kinds in ``by``)."""
+        result = []
+        for node in self.sections[kind].nodes.values():
+            edges = self.incoming.get((kind, node.node_id), [])
+            if not any(by is None or edge.source.kind in by for edge in edges):
+                result.append(node)
+        return result
+
+    def enabled_to_disabled(self) -> list[CatalogEdge]:
+        """Edges from an enabled/active node to an existing but disabled/inactive one."""
+        result = []
+        for edge in self.edges:
+            if not edge.source.enabled:
+                continue
+            target = self.node(edge.target_kind, edge.target_id)
+            if target is not None and not target.enabled:
+                result.append(edge)
+        return result
+
+
+class CatalogConflict(RuntimeError):
+    pass
+
+
+def _sha256(raw: bytes | None) -> str | None:
+    return hashlib.sha256(raw).hexdigest() if raw is not None else None
+
+
+class CatalogStore:
+    """One catalog file, indexed by entry ID.
+
+    Entries keep their file positions; removed entries leave a tombstone until
+    the next save, so no operation shifts the list. Non-mapping items and
+    duplicate IDs are carried through untouched (the validator reports them).
+    """
+
+    def __init__(self, spec: CatalogSpec, path: Path, raw: bytes | None) -> None:
+        self.spec = spec
+        self.path = path
+        self._load(raw)
+
+    def _load(self, raw: bytes | None) -> None:
+        self.digest = _sha256(raw)
+        self._text = raw.decode("utf-8") if raw is not None else None
+        data = yamlio.loads(self._text) if self._text is not None else None
+        self.data: dict = data if isinstance(data, dict) else {"version": 1, self.spec.list_key: []}
+        items = self.data.get(self.spec.list_key)
+        # Each slot is [item, original position or None once added/changed]; item None marks a removal.
+        self._slots: list[list] = [[item, pos] for pos, item in enumerate(items if isinstance(items, list) else [])]
+        self._index: dict[str, int] = {}
+        for pos, (item, _) in enumerate(self._slots):
+            entry_id = self.entry_id(item)
+            if entry_id and entry_id not in self._index:
+                self._index[entry_id] = pos
+        # Original positions whose only change is enabled/active -> false; saved as a one-line edit.
+        self._disabled: set[int] = set()
+        self.changed = False
+
+    @classmethod
+    def open(cls, root: Path, spec: CatalogSpec) -> "CatalogStore":
+        path = root / spec.rel_path
+        # Bytes, not read_text(): universal newlines would hide CRLF and break the verbatim copy.
+        return cls(spec, path, path.read_bytes() if path.exists() else None)
+
+    def entry_id(self, item: object) -> str:
+        return str(item.get(self.spec.id_key) or "").strip() if isinstance(item, dict) else ""
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, entry_id: str) -> dict | None:
+        pos = self._index.get(entry_id)
+        return self._slots[pos][0] if pos is not None else None
+
+    def entries(self) -> list:
+        return [item for item, _ in self._slots if item is not None]
+
+    def add(self, entry: dict) -> bool:
+        """Append ``entry`` unless its ID is already present."""
+        entry_id = self.entry_id(entry)
+        if not entry_id or entry_id in self._index:
+            return False
+        self._index[entry_id] = len(self._slots)
+        self._slots.append([entry, None])
+        self.changed = True
+        return True
+
+    def upsert(self, entry: dict) -> str:
+        """Add ``entry`` or replace the entry with its ID in place; returns added/updated/unchanged."""
+        entry_id = self.entry_id(entry)
+        if not entry_id:
+            raise ValueError(f"{self.spec.kind} entry has no {self.spec.id_key}")
+        pos = self._index.get(entry_id)
+        if pos is None:
+            self.add(entry)
+            return "added"
+        if self._slots[pos][0] == entry:
+            return "unchanged"
+        self._slots[pos] = [entry, None]
+        self.changed = True
+        return "updated"
+
+    def disable(self, entry_id: str) -> bool:
+        item = self.get(entry_id)
+        if item is None or item.get(self.spec.enabled_key) is False:
+            return False
+        pos = self._index[entry_id]
+        origin = self._slots[pos][1]
+        self._slots[pos] = [dict(item, **{self.spec.enabled_key: False}), origin]
+        if origin is not None:
+            self._disabled.add(origin)
+        self.changed = True
+        return True
+
+    def remove(self, entry_id: str) -> bool:
+        pos = self._index.pop(entry_id, None)
+        if pos is None:
+            return False
+        self._slots[pos] = [None, None]
+        self.changed = True
+        return True
+
+    def check(self) -> None:
+        """Raise ``CatalogConflict`` if the file changed on disk since it was opened."""
+        raw = self.path.read_bytes() if self.path.exists() else None
+        if _sha256(raw) != self.digest:
+            raise CatalogConflict(f"{self.path.as_posix()} changed on disk since it was loaded")
+
+    def render(self) -> str:
+        if not self.changed and self._text is not None:
+            return self._text
+        text = self._splice() if self._text is not None else None
+        if text is None:
+            self.data[self.spec.list_key] = self.entries()
+            fmt = yamlio.text_format(self._text) if self._text is not None else "yaml"
+            text = yamlio.dumps(self.data, fmt)
+        return text
+
+    def save(self) -> bool:
+        """Write the catalog if anything changed; returns whether it was written."""
+        if not self.changed:
+            return False
+        self.check()
+        text = self.render()
+        write_atomic(self.path, text)
+        self._load(text.encode("utf-8"))
+        return True
+
+    def _splice(self) -> str | None:
+        """Rebuild the YAML text, copying unchanged entries verbatim; ``None`` to fall back to a full dump."""
+        text = self._text
+        if yamlio.text_format(text) != "yaml" or not self.entries() or yamlio.yaml is None:
+            return None
+        loader = getattr(yamlio.yaml, "CSafeLoader", None) or yamlio.yaml.SafeLoader
+        root = yamlio.yaml.compose(text, Loader=loader)
+        sequence = None
+        for key, value in root.value if isinstance(root, yamlio.yaml.MappingNode) else []:
+            if key.value == self.spec.list_key:
+                sequence = value
+        if not isinstance(sequence, yamlio.yaml.SequenceNode) or sequence.flow_style is True:
+            return None
+
+        starts = []
+        for node in sequence.value:
+            line_start = text.rfind("\n", 0, node.start_mark.index) + 1
+            if text[line_start : node.start_mark.index].strip() != "-":
+                return None
+            starts.append(line_start)
+        if not starts:
+            return None
+        end = sequence.end_mark.index
+        if text.rfind("\n", 0, end) + 1 != end and end != len(text):
+            return None
+        spans = [(start, starts[pos + 1] if pos + 1 < len(starts) else end) for pos, start in enumerate(starts)]
+
+        indent = " " * (text.index("-", starts[0]) - starts[0])
+        newline = "\r\n" if text.count("\r\n") * 2 > text.count("\n") else "\n"
+        parts = [text[: starts[0]]]
+        for item, origin in self._slots:
+            if item is None:
+                continue
+            if parts[-1] and not parts[-1].endswith("\n"):
+                parts.append(newline)
+            if origin is not None:
+                chunk = text[spans[origin][0] : spans[origin][1]]
+                if origin not in self._disabled:
+                    parts.append(chunk)
+                    continue
+                chunk, count = re.subn(
+                    rf"^({indent}  {re.escape(self.spec.enabled_key)}:)[ \t]*true[ \t]*(\r?)$",
+                    r"\1 false\2",
+                    chunk,
+                    flags=re.MULTILINE,
+                )
+                if count == 1:
+                    parts.append(chunk)
+                    continue
+            rendered = yamlio.dumps([item], "yaml")
+            parts.append("".join(indent + line + newline for line in rendered.splitlines()))
+        parts.append(text[end:])
+        return "".join(parts)
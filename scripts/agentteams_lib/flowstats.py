@@ -0,0 +1,203 @@
+"""Per-team flow analytics: queue wait, service time, gate latency, critical path.
+
+Built on ``flowtrace.task_flow`` so the analytics and the Perfetto trace agree
+on what a wait or a gate span is. All durations are hours.
+
+- queue wait: a handoff to the receiving team's first declaration after it
+  (handoffs nobody picked up are counted as ``unclaimed``)
+- service time: one visit of a team, from its first declaration after a
+  handoff to it (or its first declaration at all) to its last declaration or
+  outgoing handoff before the next handoff to it
+- gate latency: request to decision for each team leader gate, the QA gate
+  and the leader gate (see ``flowtrace`` for the request times)
+- critical path: the task's events in time order. The interval before each
+  event is charged to the team that produced it (a pickup charges the queue
+  wait to the receiving team, a decision charges the gate wait to the
+  decider), so the charged intervals add up to the task's lead time and the
+  team with the largest share is the task's bottleneck.
+
+``FlowStats`` folds one task at a time into flat per-team sample lists and
+only sorts each list once when the report is built.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+import math
+
+from agentteams_lib.flowtrace import FlowItem, task_flow, team_of
+
+# Same thresholds as detect-role-overload.py applies to intake snapshots.
+QUEUE_P95_SLO_HOURS = 24.0
+LEAD_TIME_P50_SLO_HOURS = 48.0
+METRICS = ("queue_wait", "service", "gate_latency")
+GATE_STAGES = ("team_leader", "qa", "leader")
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Linearly interpolated percentile (``q`` in 0..100) of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_hours": round(percentile(ordered, 50), 3),
+        "p95_hours": round(percentile(ordered, 95), 3),
+        "max_hours": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def _hours(start: datetime, end: datetime) -> float:
+    return max((end - start).total_seconds(), 0.0) / 3600.0
+
+
+@dataclass
+class TaskPath:
+    task: str
+    lead_time: float
+    segments: list[tuple[str, float]]  # consecutive (team, hours), same team merged
+
+    @property
+    def charged(self) -> dict[str, float]:
+        totals: dict[str, float] = defaultdict(float)
+        for team, hours in self.segments:
+            totals[team] += hours
+        return totals
+
+    @property
+    def bottleneck(self) -> str:
+        charged = self.charged
+        return max(sorted(charged), key=lambda team: charged[team]) if charged else ""
+
+
+def critical_path(task_id: str, flow: list[FlowItem]) -> TaskPath:
+    events: list[tuple[datetime, str]] = []
+    for item in flow:
+        if item.kind == "handoff":
+            events.append((item.start, team_of(item.args.get("from")) or item.team))
+        elif item.kind == "gate":
+            events.append((item.end or item.start, item.team))
+        else:
+            events.append((item.start, item.team))
+    events.sort(key=lambda event: event[0])
+
+    segments: list[tuple[str, float]] = []
+    for (previous, _), (at, team) in zip(events, events[1:]):
+        hours = _hours(previous, at)
+        if hours <= 0:
+            continue
+        if segments and segments[-1][0] == team:
+            segments[-1] = (team, segments[-1][1] + hours)
+        else:
+            segments.append((team, hours))
+    lead_time = _hours(events[0][0], events[-1][0]) if events else 0.0
+    return TaskPath(task_id, lead_time, segments)
+
+
+def service_visits(flow: list[FlowItem]) -> list[tuple[str, float]]:
+    activity: dict[str, list[datetime]] = defaultdict(list)
+    pickups: dict[str, list[datetime]] = defaultdict(list)
+    for item in flow:
+        if item.kind == "declaration":
+            activity[item.team].append(item.start)
+        elif item.kind == "handoff":
+            sender = team_of(item.args.get("from"))
+            if sender:
+                activity[sender].append(item.start)
+            if item.end is not None:
+                pickups[item.team].append(item.end)
+
+    visits: list[tuple[str, float]] = []
+    for team, times in activity.items():
+        times.sort()
+        bounds = sorted(set(pickups.get(team, [])))
+        start = end = times[0]
+        next_bound = 0
+        for at in times[1:]:
+            while next_bound < len(bounds) and bounds[next_bound] <= start:
+                next_bound += 1
+            if next_bound < len(bounds) and at >= bounds[next_bound]:
+                visits.append((team, _hours(start, end)))
+                start = at
+            end = at
+        visits.append((team, _hours(start, end)))
+    return visits
+
+
+@dataclass
+class FlowStats:
+    tasks: int = 0
+    samples: dict[tuple[str, str], list[float]] = field(default_factory=lambda: defaultdict(list))
+    gates: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    unclaimed: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    lead_times: list[float] = field(default_factory=list)
+    critical_hours: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    on_path: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    bottlenecks: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, task: dict) -> TaskPath:
+        task_id = str(task.get("id") or "")
+        flow = task_flow(task)
+        for item in flow:
+            if item.kind == "handoff":
+                if item.end is None:
+                    self.unclaimed[item.team] += 1
+                else:
+                    self.samples[(item.team, "queue_wait")].append(_hours(item.start, item.end))
+            elif item.kind == "gate" and item.end is not None:
+                hours = _hours(item.start, item.end)
+                self.samples[(item.team, "gate_latency")].append(hours)
+                self.gates[str(item.args.get("gate") or "")].append(hours)
+        for team, hours in service_visits(flow):
+            self.samples[(team, "service")].append(hours)
+
+        path = critical_path(task_id, flow)
+        self.tasks += 1
+        if path.segments:
+            self.lead_times.append(path.lead_time)
+            for team, hours in path.charged.items():
+                self.critical_hours[team] += hours
+                self.on_path[team] += 1
+            self.bottlenecks[path.bottleneck] += 1
+        return path
+
+    def teams(self) -> list[str]:
+        return sorted({team for team, _ in self.samples} | set(self.unclaimed) | set(self.critical_hours))
+
+    def team_report(self, team: str) -> dict:
+        report = {metric: summarize(self.samples.get((team, metric), [])) for metric in METRICS}
+        report["unclaimed_handoffs"] = self.unclaimed.get(team, 0)
+        return report
+
+    def gate_report(self) -> dict[str, dict]:
+        return {stage: summarize(self.gates.get(stage, [])) for stage in GATE_STAGES}
+
+    def ranking(self) -> list[dict]:
+        """Teams by how many tasks they bottleneck, then by critical-path hours."""
+        total = sum(self.critical_hours.values())
+        ranked = sorted(
+            self.critical_hours,
+            key=lambda team: (-self.bottlenecks.get(team, 0), -self.critical_hours[team], team),
+        )
+        return [
+            {
+                "rank": index,
+                "team": team,
+                "bottleneck_tasks": self.bottlenecks.get(team, 0),
+                "on_path_tasks": self.on_path[team],
+                "critical_hours": round(self.critical_hours[team], 3),
+                "share": round(self.critical_hours[team] / total, 3) if total else 0.0,
+            }
+            for index, team in enumerate(ranked, start=1)
+        ]
+
+    def lead_time(self) -> dict:
+        return summarize(self.lead_times)
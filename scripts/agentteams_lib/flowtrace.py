@@ -0,0 +1,199 @@
+"""Chrome Trace Event / Perfetto export of task flow across teams.
+
+``task_flow`` turns one task's declarations, handoffs and gates into
+timestamped flow items; ``TraceWriter`` streams them as Trace Event JSON (open
+it in ``ui.perfetto.dev`` or ``chrome://tracing``) one task at a time, so a
+trace over thousands of tasks never holds more than one task in memory.
+
+Layout: every team is a process track named after the team.
+
+- each declaration is an instant event on its team's track
+- ``handoff`` spans run from a handoff to the receiving team's first
+  declaration at or after it (an unclaimed handoff is an instant)
+- ``gate`` spans run from the gate request to its decision, on the deciding
+  team's track. Tasks record no explicit request, so the request time is the
+  step the gate waits on: for a team leader gate, that team's latest
+  declaration before the decision; for QA, the latest team leader decision;
+  for the overall leader, the QA decision.
+
+Spans are async events keyed by task, so overlapping tasks on one team stack
+instead of being cut off.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+from typing import TextIO
+
+
+def parse_time(value: object) -> datetime | None:
+    """UTC datetime for ``at`` values (``...Z`` strings, ISO strings or YAML timestamps)."""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        raw = str(value or "").strip()
+        if not raw:
+            return None
+        try:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def team_of(ref: object) -> str:
+    return str(ref or "").strip().split("/", 1)[0].strip()
+
+
+@dataclass
+class FlowItem:
+    kind: str  # declaration | handoff | gate
+    team: str
+    name: str
+    start: datetime
+    end: datetime | None = None  # None for instants
+    args: dict = field(default_factory=dict)
+
+
+def task_flow(task: dict) -> list[FlowItem]:
+    """Flow items of one task, ordered by start time."""
+    task_id = str(task.get("id") or "")
+    items: list[FlowItem] = []
+
+    declarations: list[tuple[datetime, str, dict]] = []
+    for entry in task.get("declarations") if isinstance(task.get("declarations"), list) else []:
+        if not isinstance(entry, dict):
+            continue
+        at = parse_time(entry.get("at"))
+        team = team_of(entry.get("team"))
+        if at is None or not team:
+            continue
+        declarations.append((at, team, entry))
+        items.append(
+            FlowItem(
+                "declaration",
+                team,
+                str(entry.get("action") or "declaration").strip(),
+                at,
+                args={"task": task_id, "role": str(entry.get("role") or ""), "what": str(entry.get("what") or "")},
+            )
+        )
+    declarations.sort(key=lambda item: item[0])
+
+    for entry in task.get("handoffs") if isinstance(task.get("handoffs"), list) else []:
+        if not isinstance(entry, dict):
+            continue
+        at = parse_time(entry.get("at"))
+        dst = team_of(entry.get("to"))
+        if at is None or not dst:
+            continue
+        pickup = next((when for when, team, _ in declarations if team == dst and when >= at), None)
+        args = {"task": task_id, "from": str(entry.get("from") or ""), "to": str(entry.get("to") or "")}
+        if pickup is None:
+            items.append(FlowItem("handoff", dst, f"{task_id} handoff unclaimed", at, args=args))
+        else:
+            items.append(FlowItem("handoff", dst, f"{task_id} handoff wait", at, pickup, args))
+
+    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
+    team_decisions: list[datetime] = []
+    gates = approvals.get("team_leader_gates")
+    for gate in gates if isinstance(gates, list) else []:
+        if not isinstance(gate, dict):
+            continue
+        decided = parse_time(gate.get("at"))
+        team = team_of(gate.get("team"))
+        if decided is None or not team:
+            continue
+        team_decisions.append(decided)
+        requested = max((when for when, owner, _ in declarations if owner == team and when <= decided), default=None)
+        items.append(_gate_item(task_id, "team_leader", f"{team} leader gate", team, requested, decided, gate))
+
+    qa_gate = approvals.get("qa_gate") if isinstance(approvals.get("qa_gate"), dict) else {}
+    qa_decided = parse_time(qa_gate.get("at"))
+    if qa_decided is not None:
+        requested = max((when for when in team_decisions if when <= qa_decided), default=None)
+        team = team_of(qa_gate.get("by")) or "qa"
+        items.append(_gate_item(task_id, "qa", "qa gate", team, requested, qa_decided, qa_gate))
+
+    leader_gate = approvals.get("leader_gate") if isinstance(approvals.get("leader_gate"), dict) else {}
+    leader_decided = parse_time(leader_gate.get("at"))
+    if leader_decided is not None:
+        requested = qa_decided if qa_decided is not None and qa_decided <= leader_decided else None
+        team = team_of(leader_gate.get("by")) or "leader"
+        items.append(_gate_item(task_id, "leader", "leader gate", team, requested, leader_decided, leader_gate))
+
+    return sorted(items, key=lambda item: item.start)
+
+
+def _gate_item(
+    task_id: str, stage: str, label: str, team: str, requested: datetime | None, decided: datetime, gate: dict
+) -> FlowItem:
+    args = {
+        "task": task_id,
+        "gate": stage,
+        "status": str(gate.get("status") or ""),
+        "note": str(gate.get("note") or ""),
+    }
+    if requested is None:
+        return FlowItem("gate", team, f"{task_id} {label}", decided, args=args)
+    return FlowItem("gate", team, f"{task_id} {label}", requested, decided, args)
+
+
+def _micros(at: datetime) -> int:
+    return int(at.timestamp() * 1_000_000)
+
+
+class TraceWriter:
+    """Stream Trace Event JSON to ``handle`` (see ``fsio.atomic_writer``); call ``close`` once at the end."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self._handle = handle
+        self._handle.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+        self._first = True
+        self._pids: dict[str, int] = {}
+        self._span_ids = 0
+        self.events = 0
+
+    def _emit(self, event: dict) -> None:
+        if not self._first:
+            self._handle.write(",\n")
+        self._first = False
+        self._handle.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+        self.events += 1
+
+    def _pid(self, team: str) -> int:
+        pid = self._pids.get(team)
+        if pid is None:
+            pid = self._pids[team] = len(self._pids) + 1
+            self._emit({"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": team}})
+            self._emit({"ph": "M", "name": "process_sort_index", "pid": pid, "tid": 0, "args": {"sort_index": pid}})
+        return pid
+
+    def add(self, item: FlowItem) -> None:
+        pid = self._pid(item.team)
+        start = _micros(item.start)
+        if item.end is None:
+            self._emit(
+                {"ph": "i", "s": "p", "cat": item.kind, "name": item.name, "pid": pid, "tid": 0, "ts": start, "args": item.args}
+            )
+            return
+        self._span_ids += 1
+        span = {"cat": item.kind, "name": item.name, "pid": pid, "tid": 0, "id": self._span_ids}
+        self._emit(dict(span, ph="b", ts=start, args=item.args))
+        self._emit(dict(span, ph="e", ts=max(_micros(item.end), start)))
+
+    def add_task(self, task: dict) -> int:
+        flow = task_flow(task)
+        for item in flow:
+            self.add(item)
+        return len(flow)
+
+    @property
+    def teams(self) -> int:
+        return len(self._pids)
+
+    def close(self) -> None:
+        self._handle.write("\n]}\n")
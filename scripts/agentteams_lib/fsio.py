@@ -0,0 +1,149 @@
+"""Crash-safe writes and advisory locks for files shared between pipeline runs.
+
+``write_atomic`` writes to a temp file in the destination directory, fsyncs it
+and renames it over the target, so readers see either the old or the new
+content and never a partial file; ``atomic_writer`` does the same for output
+streamed through a handle. ``advisory_lock`` serializes
+read-modify-write sections across processes via ``flock`` (``msvcrt`` on
+Windows) on a sidecar lock file; control-plane writers use named locks under
+``<control-plane>/.locks/``. Locks are advisory: only cooperating AgentTeams
+scripts honour them.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Iterator, TextIO
+
+LOCK_DIR = ".locks"
+LOCK_TIMEOUT_ENV = "AGENTTEAMS_LOCK_TIMEOUT"
+DEFAULT_LOCK_TIMEOUT = 300.0
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class LockTimeout(RuntimeError):
+    pass
+
+
+def write_atomic(path: Path, content: str | bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+                handle.flush()
+                os.fsync(handle.fileno())
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+                handle.write(content)
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[TextIO]:
+    """Text handle for streaming a large file; it replaces ``path`` only if the block succeeds."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def lock_timeout() -> float:
+    try:
+        return float(os.environ.get(LOCK_TIMEOUT_ENV, "") or DEFAULT_LOCK_TIMEOUT)
+    except ValueError:
+        return DEFAULT_LOCK_TIMEOUT
+
+
+def _try_lock(fd: int, shared: bool) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # exclusive only
+            return True
+        except OSError:
+            return False
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def advisory_lock(path: Path, shared: bool = False, timeout: float | None = None) -> Iterator[None]:
+    """Hold an exclusive (or shared) lock on ``path`` for the ``with`` block.
+
+    Raises ``LockTimeout`` after ``timeout`` seconds (default:
+    ``$AGENTTEAMS_LOCK_TIMEOUT`` or 300). A shared lock on a read-only
+    checkout, where the lock file cannot be created, is skipped: nothing can be
+    writing there.
+    """
+    deadline = time.monotonic() + (lock_timeout() if timeout is None else timeout)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o666)
+    except OSError:
+        if not shared:
+            raise
+        yield
+        return
+    try:
+        delay = 0.01
+        while not _try_lock(fd, shared):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"timed out waiting for lock {path.as_posix()}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def control_plane_lock(cp_root: Path, name: str, shared: bool = False, timeout: float | None = None):
+    """Named lock for one control-plane area (``signals``, ``catalogs``, ``refresh-queue``, ``intake``)."""
+    return advisory_lock(cp_root / LOCK_DIR / f"{name}.lock", shared=shared, timeout=timeout)
@@ -0,0 +1,160 @@
+"""Small git helpers shared by ``init`` and the fleet commands.
+
+Clones go through a local bare-mirror cache keyed by repository URL
+(``$AGENTTEAMS_GIT_CACHE`` or ``~/.cache/agentteams/git-mirrors``). The mirror
+is created once with ``clone --mirror``, refreshed with ``fetch --prune``, and
+working clones borrow its objects via ``--reference --dissociate`` so only the
+delta crosses the network and the checkout stays independent of the cache.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import re
+import shutil
+import subprocess
+import threading
+from typing import TextIO
+
+URL_PREFIXES = ("http://", "https://", "ssh://", "git://", "file://", "git@")
+DEFAULT_URL_TEMPLATE = "https://{repo}.git"
+GIT_CACHE_ENV = "AGENTTEAMS_GIT_CACHE"
+_MIRROR_LOCKS: dict[str, threading.Lock] = {}
+_MIRROR_LOCKS_GUARD = threading.Lock()
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def resolve_repo_url(repo: str, url_template: str = DEFAULT_URL_TEMPLATE, base_dir: Path | None = None) -> str:
+    """Turn a registry ``repo`` value into something ``git clone`` accepts.
+
+    Full URLs and ``git@host:path`` pass through, existing local paths are used
+    as-is (resolved against ``base_dir``), and bare ``host/org/name`` values are
+    expanded with ``url_template``.
+    """
+    value = repo.strip()
+    if value.startswith(URL_PREFIXES):
+        return value
+    candidate = Path(value).expanduser()
+    if not candidate.is_absolute() and base_dir is not None:
+        candidate = base_dir / candidate
+    if candidate.exists():
+        return str(candidate.resolve())
+    return url_template.format(repo=value.rstrip("/"))
+
+
+def run_git(args: list[str], cwd: Path | None = None, log: TextIO | None = None) -> str:
+    cmd = ["git", *args]
+    if log is not None:
+        log.write(f"$ {' '.join(cmd)}" + (f"  (cwd={cwd.as_posix()})" if cwd else "") + "\n")
+        log.flush()
+    proc = subprocess.run(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    output = proc.stdout.strip()
+    if log is not None:
+        if output:
+            log.write(output + "\n")
+        log.write(f"exit={proc.returncode}\n")
+        log.flush()
+    if proc.returncode != 0:
+        lines = output.splitlines()
+        reason = next((line for line in lines if line.startswith(("fatal:", "error:"))), lines[-1] if lines else "")
+        raise GitError(reason or f"git {args[0]} failed")
+    return output
+
+
+def is_git_worktree(path: Path) -> bool:
+    return (path / ".git").exists()
+
+
+@dataclass
+class CloneOptions:
+    use_cache: bool = True
+    cache_dir: str = ""
+    depth: int = 0
+    filter_spec: str = ""
+
+    def resolved_cache_dir(self) -> Path:
+        if self.cache_dir:
+            return Path(self.cache_dir).expanduser()
+        from_env = os.environ.get(GIT_CACHE_ENV, "").strip()
+        if from_env:
+            return Path(from_env).expanduser()
+        return Path.home() / ".cache" / "agentteams" / "git-mirrors"
+
+
+def mirror_path(cache_dir: Path, url: str) -> Path:
+    leaf = re.sub(r"[^A-Za-z0-9._-]", "-", url.rstrip("/").split("/")[-1].split(":")[-1]) or "repo"
+    if not leaf.endswith(".git"):
+        leaf += ".git"
+    return cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}-{leaf}"
+
+
+def _mirror_lock(path: Path) -> threading.Lock:
+    with _MIRROR_LOCKS_GUARD:
+        return _MIRROR_LOCKS.setdefault(str(path), threading.Lock())
+
+
+def ensure_mirror(url: str, cache_dir: Path, log: TextIO | None = None) -> Path:
+    """Create or incrementally refresh the bare mirror for ``url``."""
+    mirror = mirror_path(cache_dir, url)
+    with _mirror_lock(mirror):
+        if (mirror / "HEAD").exists():
+            run_git(["--git-dir", str(mirror), "fetch", "--prune", "origin"], log=log)
+            return mirror
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = mirror.with_name(f"{mirror.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            run_git(["clone", "--mirror", url, str(staging)], log=log)
+            try:
+                os.rename(staging, mirror)
+            except OSError:
+                if not (mirror / "HEAD").exists():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return mirror
+
+
+def clone(url: str, target: Path, log: TextIO | None = None, options: CloneOptions | None = None) -> str:
+    """Clone ``url`` into ``target``; returns ``mirror`` or ``direct`` for the path taken."""
+    opts = options or CloneOptions()
+    extra: list[str] = []
+    if opts.depth > 0:
+        extra.extend(["--depth", str(opts.depth)])
+    if opts.filter_spec:
+        extra.append(f"--filter={opts.filter_spec}")
+
+    if opts.use_cache:
+        try:
+            mirror = ensure_mirror(url, opts.resolved_cache_dir(), log)
+        except (GitError, OSError) as exc:
+            if log is not None:
+                log.write(f"mirror cache unavailable, cloning directly: {exc}\n")
+        else:
+            run_git(["clone", "--reference", str(mirror), "--dissociate", *extra, url, str(target)], log=log)
+            return "mirror"
+    run_git(["clone", *extra, url, str(target)], log=log)
+    return "direct"
+
+
+def fast_forward(target: Path, log: TextIO | None = None) -> None:
+    """Fetch and fast-forward the current branch; refuses to merge or rebase."""
+    run_git(["fetch", "--prune"], cwd=target, log=log)
+    try:
+        run_git(["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"], cwd=target, log=log)
+    except GitError:
+        return  # detached HEAD or no upstream: fetched, nothing to fast-forward
+    run_git(["merge", "--ff-only", "@{u}"], cwd=target, log=log)
@@ -0,0 +1,133 @@
+"""Read and compact control-plane intake snapshots.
+
+Recent snapshots stay as loose ``intake/<project>/<stamp>.yaml`` files. Older
+ones are rolled into ``intake/<project>/archive/<YYYY-MM>.jsonl.gz``: one JSON
+line per snapshot, ordered by file name. A line carries the snapshot ``data``
+only when its content (ignoring ``captured_at``) differs from the previous
+line; otherwise it just records ``name``/``captured_at``/``sha256`` and readers
+reuse the previous body, so long runs of identical captures cost one copy.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import hashlib
+import io
+import json
+from pathlib import Path
+import re
+from typing import Callable, Iterator
+
+from agentteams_lib.fsio import write_atomic
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+STAMP_PATTERN = re.compile(r"^(\d{8}T\d{6}Z)\.yaml$")
+MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})\.jsonl\.gz$")
+
+
+@dataclass
+class IntakeSnapshot:
+    project_dir: str
+    name: str
+    data: dict
+    archive: Path | None = None
+
+    @property
+    def origin(self) -> str:
+        if self.archive is None:
+            return f"{self.project_dir}/{self.name}"
+        return f"{self.project_dir}/{ARCHIVE_DIR}/{self.archive.name}#{self.name}"
+
+
+def stamp_of(name: str) -> datetime | None:
+    match = STAMP_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+
+
+def archive_month(name: str) -> tuple[int, int] | None:
+    match = MONTH_PATTERN.match(name)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def content_hash(data: dict) -> str:
+    body = {key: value for key, value in data.items() if key != "captured_at"}
+    encoded = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def loose_files(intake_root: Path) -> list[Path]:
+    return sorted(intake_root.glob("*/*.yaml"))
+
+
+def archive_files(intake_root: Path) -> list[Path]:
+    return sorted(intake_root.glob(f"*/{ARCHIVE_DIR}/*{ARCHIVE_SUFFIX}"))
+
+
+def read_archive(path: Path) -> list[dict]:
+    """Return archive records with every ``data`` body filled in."""
+    records: list[dict] = []
+    previous: dict | None = None
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "data" not in record:
+                if previous is None:
+                    raise ValueError(f"{path.as_posix()}: first record has no data")
+                record["data"] = dict(previous["data"], captured_at=record.get("captured_at"))
+            records.append(record)
+            previous = record
+    return records
+
+
+def write_archive(path: Path, records: list[dict]) -> int:
+    """Write ``records`` (sorted by name, deduplicated); returns stored bodies."""
+    buffer = io.BytesIO()
+    stored = 0
+    previous_hash = ""
+    # mtime=0 keeps the output byte-identical for identical input, so git sees no churn.
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buffer, mtime=0) as gz:
+        for record in sorted(records, key=lambda item: item["name"]):
+            digest = content_hash(record["data"])
+            line = {"name": record["name"], "captured_at": record["data"].get("captured_at"), "sha256": digest}
+            if digest != previous_hash:
+                line["data"] = record["data"]
+                stored += 1
+            previous_hash = digest
+            gz.write((json.dumps(line, ensure_ascii=False, sort_keys=True, default=str) + "\n").encode("utf-8"))
+
+    write_atomic(path, buffer.getvalue())
+    return stored
+
+
+def iter_snapshots(
+    intake_root: Path,
+    loader: Callable[[Path], dict],
+    include_archive: bool = False,
+    since: datetime | None = None,
+) -> Iterator[IntakeSnapshot]:
+    """Yield loose snapshots, plus archived ones when requested.
+
+    With ``since`` set, archives are opened only for months that can contain
+    captures at or after it, so callers with a time window read history only
+    when the window reaches past the loose files.
+    """
+    for path in loose_files(intake_root):
+        yield IntakeSnapshot(path.parent.name, path.name, loader(path))
+    if not include_archive and since is None:
+        return
+    for path in archive_files(intake_root):
+        month = archive_month(path.name)
+        if month is None:
+            continue
+        if since is not None and not include_archive and month < (since.year, since.month):
+            continue
+        project_dir = path.parent.parent.name
+        for record in read_archive(path):
+            yield IntakeSnapshot(project_dir, str(record["name"]), record["data"], path)
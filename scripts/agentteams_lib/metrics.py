@@ -0,0 +1,219 @@
+"""Run metrics for validators, auditors, and fleet pipeline steps.
+
+Every script accepts ``--metrics-out <path>`` (``.json`` selects the JSON
+record, anything else the OpenMetrics text format). When the flag is absent
+and ``AGENTTEAMS_METRICS_DIR`` is set, the record is written to
+``$AGENTTEAMS_METRICS_DIR/<script>.prom`` (or ``.json`` when
+``AGENTTEAMS_METRICS_FORMAT=json``) so a node-exporter textfile collector can
+pick it up. Files are written to a temp file and renamed into place.
+"""
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import time
+from typing import Iterator, TextIO
+
+from agentteams_lib.fsio import write_atomic
+
+METRICS_DIR_ENV = "AGENTTEAMS_METRICS_DIR"
+METRICS_FORMAT_ENV = "AGENTTEAMS_METRICS_FORMAT"
+METRIC_PREFIX = "agentteams"
+CODE_LINE_PATTERN = re.compile(r"^(ERROR|WARN) \[([A-Za-z0-9_]+)\]")
+NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--metrics-out", default="", help="write run metrics (.json or OpenMetrics text)")
+    parser.add_argument(
+        "--metrics-format",
+        default="",
+        choices=["", "openmetrics", "json"],
+        help="metrics format (default: inferred from --metrics-out extension)",
+    )
+
+
+def metric_name(value: str) -> str:
+    return NAME_PATTERN.sub("_", value.strip()).strip("_").lower()
+
+
+def escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_number(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(round(float(value), 6))
+
+
+class _CodeCountingStream:
+    """Pass-through stdout wrapper that counts ``ERROR [CODE]`` / ``WARN [CODE]`` lines."""
+
+    def __init__(self, target: TextIO, metrics: "RunMetrics") -> None:
+        self._target = target
+        self._metrics = metrics
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        self._pending += text
+        while "\n" in self._pending:
+            line, self._pending = self._pending.split("\n", 1)
+            self._metrics.record_line(line)
+        return self._target.write(text)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def finish(self) -> None:
+        if self._pending:
+            self._metrics.record_line(self._pending)
+            self._pending = ""
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._target, name)
+
+
+class RunMetrics:
+    def __init__(self, script: str, output: str = "", fmt: str = "") -> None:
+        self.script = script
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+        self.errors: dict[str, int] = {}
+        self.warnings: dict[str, int] = {}
+        self.output, self.format = self._resolve_output(output, fmt)
+
+    def _resolve_output(self, output: str, fmt: str) -> tuple[Path | None, str]:
+        if output:
+            path = Path(output)
+            return path, fmt or ("json" if path.suffix.lower() == ".json" else "openmetrics")
+        metrics_dir = os.environ.get(METRICS_DIR_ENV, "").strip()
+        if not metrics_dir:
+            return None, fmt or "openmetrics"
+        resolved = fmt or os.environ.get(METRICS_FORMAT_ENV, "").strip().lower() or "openmetrics"
+        suffix = ".json" if resolved == "json" else ".prom"
+        return Path(metrics_dir) / f"{self.script}{suffix}", resolved
+
+    @property
+    def enabled(self) -> bool:
+        return self.output is not None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def inc(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def record_line(self, line: str) -> None:
+        match = CODE_LINE_PATTERN.match(line)
+        if not match:
+            return
+        bucket = self.errors if match.group(1) == "ERROR" else self.warnings
+        bucket[match.group(2)] = bucket.get(match.group(2), 0) + 1
+
+    @contextmanager
+    def capture_codes(self) -> Iterator[None]:
+        stream = _CodeCountingStream(sys.stdout, self)
+        original = sys.stdout
+        sys.stdout = stream  # type: ignore[assignment]
+        try:
+            yield
+        finally:
+            stream.finish()
+            sys.stdout = original
+
+    def as_record(self, exit_code: int) -> dict:
+        return {
+            "script": self.script,
+            "started_at": round(self.started_at, 3),
+            "duration_seconds": round(time.perf_counter() - self._started, 6),
+            "exit_code": exit_code,
+            "phases": {key: round(value, 6) for key, value in self.phases.items()},
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "errors": dict(sorted(self.errors.items())),
+            "warnings": dict(sorted(self.warnings.items())),
+        }
+
+    def render_openmetrics(self, record: dict) -> str:
+        script = escape_label(self.script)
+        lines: list[str] = []
+
+        def family(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            if not samples:
+                return
+            full = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} gauge")
+            for labels, value in samples:
+                label_text = f'script="{script}"' + (f",{labels}" if labels else "")
+                lines.append(f"{full}{{{label_text}}} {format_number(value)}")
+
+        family("run_duration_seconds", "Wall time of the script run.", [("", record["duration_seconds"])])
+        family("run_exit_code", "Exit code of the script run.", [("", record["exit_code"])])
+        family("run_started_timestamp_seconds", "Unix time the run started.", [("", record["started_at"])])
+        family(
+            "phase_duration_seconds",
+            "Wall time spent per phase.",
+            [(f'phase="{escape_label(name)}"', value) for name, value in record["phases"].items()],
+        )
+        for name, value in record["counters"].items():
+            family(metric_name(name), f"Count of {name} in the run.", [("", value)])
+        for name, value in record["gauges"].items():
+            family(metric_name(name), f"Value of {name} at the end of the run.", [("", value)])
+        family(
+            "errors",
+            "ERROR lines emitted per code.",
+            [(f'code="{escape_label(code)}"', count) for code, count in record["errors"].items()],
+        )
+        family(
+            "warnings",
+            "WARN lines emitted per code.",
+            [(f'code="{escape_label(code)}"', count) for code, count in record["warnings"].items()],
+        )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, exit_code: int) -> None:
+        if self.output is None:
+            return
+        record = self.as_record(exit_code)
+        if self.format == "json":
+            content = json.dumps(record, ensure_ascii=False, indent=2) + "\n"
+        else:
+            content = self.render_openmetrics(record)
+        write_atomic(self.output, content)
+
+
+def run_with_metrics(script: str, args: argparse.Namespace, runner) -> int:
+    """Run ``runner(args, metrics)`` with ERROR/WARN code counting and write the record."""
+    metrics = RunMetrics(
+        script,
+        str(getattr(args, "metrics_out", "") or ""),
+        str(getattr(args, "metrics_format", "") or ""),
+    )
+    with metrics.capture_codes():
+        code = runner(args, metrics)
+    metrics.write(code)
+    return code
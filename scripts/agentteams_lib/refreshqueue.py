@@ -0,0 +1,134 @@
+"""Apply refresh-queue actions to the control-plane catalogs.
+
+Queue items (``refresh-queue/R-*.yaml``) carry ``actions`` with team, routing
+rule and skill entries to add. ``merge_actions`` folds any number of items into
+one change set (first item in refresh-id order wins per entry ID) and
+``apply_actions`` opens each catalog once as a ``CatalogStore``, appends
+entries whose ID is not already present, and writes each catalog at most
+once. Callers hold the ``refresh-queue`` and ``catalogs`` control-plane locks.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agentteams_lib.catalog import CATALOG_SPECS, CatalogStore
+from agentteams_lib.fsio import write_atomic
+from agentteams_lib.yamlio import loads, read_document, rewrite
+
+PENDING_STATUSES = {"pending_review"}
+APPLIED_STATUS = "applied"
+ACTION_KEYS = {
+    "team": "team_catalog_updates",
+    "rule": "routing_rule_updates",
+    "skill": "skill_updates",
+}
+
+@dataclass
+class QueueItem:
+    path: Path
+    text: str  # as stored, line endings included
+    data: dict
+
+    @property
+    def refresh_id(self) -> str:
+        return str(self.data.get("refresh_id") or self.path.stem)
+
+    @property
+    def status(self) -> str:
+        return str(self.data.get("status") or "").strip()
+
+
+@dataclass
+class ApplyResult:
+    added: dict[str, list[str]] = field(default_factory=dict)
+    updated_files: list[str] = field(default_factory=list)
+
+
+def read_item(path: Path) -> QueueItem:
+    return QueueItem(path, *read_document(path))
+
+
+def read_queue(queue_root: Path) -> list[QueueItem]:
+    return [read_item(path) for path in sorted(queue_root.glob("R-*.yaml"))]
+
+
+def mark_applied(item: QueueItem, applied_at: str) -> None:
+    """Set ``status: applied`` and ``applied_at`` in place, so the item's diff is those two lines."""
+    old = loads(item.text)
+    item.data["status"] = APPLIED_STATUS
+    item.data["applied_at"] = applied_at
+    item.text = rewrite(item.text, old if isinstance(old, dict) else {}, item.data)
+    write_atomic(item.path, item.text)
+
+
+def action_entries(item: dict, kind: str) -> list[dict]:
+    actions = item.get("actions") if isinstance(item.get("actions"), dict) else {}
+    entries = actions.get(ACTION_KEYS[kind])
+    return [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+
+def merge_actions(items: list[dict]) -> dict[str, list[dict]]:
+    merged: dict[str, list[dict]] = {}
+    for spec in CATALOG_SPECS:
+        seen: set[str] = set()
+        entries: list[dict] = []
+        for item in items:
+            for entry in action_entries(item, spec.kind):
+                entry_id = str(entry.get(spec.id_key) or "").strip()
+                if entry_id and entry_id not in seen:
+                    seen.add(entry_id)
+                    entries.append(entry)
+        merged[spec.kind] = entries
+    return merged
+
+
+def skill_doc_text(skill_id: str) -> str:
+    return (
+        "\n".join(
+            [
+                f"# Skill: {skill_id}",
+                "",
+                "Generated by auto refresh proposal.",
+                "",
+                "Checklist:",
+                "- verify proposed scope",
+                "- validate evidence collection requirements",
+                f"- include `skill:{skill_id}` in declarations",
+            ]
+        )
+        + "\n"
+    )
+
+
+def apply_actions(cp_root: Path, merged: dict[str, list[dict]], dry_run: bool = False) -> ApplyResult:
+    """Add merged entries whose ID is not in the catalog yet.
+
+    Raises ``CatalogConflict`` (before writing anything) when a catalog was
+    edited on disk while the batch was being applied.
+    """
+    result = ApplyResult()
+    stores = [CatalogStore.open(cp_root, spec) for spec in CATALOG_SPECS]
+    for store in stores:
+        result.added[store.spec.kind] = [
+            store.entry_id(entry) for entry in merged.get(store.spec.kind) or [] if store.add(entry)
+        ]
+    if dry_run:
+        return result
+    for store in stores:
+        if store.changed:
+            store.check()
+    for store in stores:
+        if store.save():
+            result.updated_files.append(store.path.as_posix())
+
+    for entry in merged.get("skill") or []:
+        skill_id = str(entry.get("skill_id") or "").strip()
+        if not skill_id:
+            continue
+        skill_doc = cp_root.parent / "skills" / f"{skill_id}.md"
+        if skill_doc.exists():
+            continue
+        write_atomic(skill_doc, skill_doc_text(skill_id))
+        result.updated_files.append(skill_doc.as_posix())
+    return result
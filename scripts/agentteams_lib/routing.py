@@ -0,0 +1,267 @@
+"""Rule-catalog routing: which teams, rules and skills a task needs.
+
+``RoutingTable`` compiles the enabled routing rules and skills once into a
+decision table. Each rule is filed under its most selective condition
+(incident fingerprint, then capability tag, then status; rules without
+conditions are always candidates), so routing a task only looks at the
+buckets for its own fingerprints, tags and status and then checks the
+remaining conditions with set lookups. Skills are filed by
+``applies_to_teams`` and trigger tag the same way.
+
+Rule conditions (all given ones must hold):
+
+- ``when.any_status``: task status is one of the listed statuses
+- ``when.capability_tags``: task shares at least one tag
+- ``when.incident_fingerprint``: task lists it in ``routing.incident_fingerprints``
+
+Skill selection keeps the evidence validators' semantics: an enabled skill
+applies when its ``applies_to_teams`` (if any) meets the teams and its trigger
+tags (if any, and if the task has tags) meet the task tags.
+
+Tasks are routed from their mapping or from a ``taskmodel.Task``, which has
+the routing values already normalized the same way.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from agentteams_lib.taskmodel import Task
+
+RULES_CATALOG = "rule-catalog/routing-rules.yaml"
+SKILLS_CATALOG = "skill-catalog/skills.yaml"
+
+
+def _strings(values: object) -> list[str]:
+    if isinstance(values, str):
+        values = [values]
+    if not isinstance(values, list):
+        return []
+    result: list[str] = []
+    for value in values:
+        text = str(value or "").strip()
+        if text and text not in result:
+            result.append(text)
+    return result
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    rule_id: str
+    priority: int
+    statuses: frozenset
+    tags: frozenset
+    fingerprints: frozenset
+    require_teams: tuple
+    require_skills: tuple
+
+    def matches(self, status: str, tags: set[str], fingerprints: set[str]) -> bool:
+        if self.statuses and status not in self.statuses:
+            return False
+        if self.tags and self.tags.isdisjoint(tags):
+            return False
+        if self.fingerprints and self.fingerprints.isdisjoint(fingerprints):
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class RouteSkill:
+    skill_id: str
+    description: str
+    teams: frozenset
+    tags: frozenset
+
+    def matches(self, teams: set[str], tags: set[str]) -> bool:
+        if self.teams and self.teams.isdisjoint(teams):
+            return False
+        if self.tags and tags and self.tags.isdisjoint(tags):
+            return False
+        return True
+
+
+@dataclass
+class RouteDecision:
+    status: str
+    capability_tags: list[str]
+    incident_fingerprints: list[str]
+    declared_teams: list[str]
+    rules: list[RouteRule] = field(default_factory=list)
+    derived_teams: list[str] = field(default_factory=list)
+    skills: list[RouteSkill] = field(default_factory=list)
+
+    @property
+    def rule_ids(self) -> list[str]:
+        return [rule.rule_id for rule in self.rules]
+
+    @property
+    def required_teams(self) -> list[str]:
+        return self.declared_teams + self.derived_teams
+
+    @property
+    def rule_skills(self) -> list[str]:
+        return _strings([skill for rule in self.rules for skill in rule.require_skills])
+
+    @property
+    def required_skills(self) -> list[str]:
+        return _strings(self.rule_skills + [skill.skill_id for skill in self.skills])
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "capability_tags": self.capability_tags,
+            "incident_fingerprints": self.incident_fingerprints,
+            "declared_teams": self.declared_teams,
+            "derived_teams": self.derived_teams,
+            "required_teams": self.required_teams,
+            "rules": [
+                {"rule_id": rule.rule_id, "priority": rule.priority, "require_teams": list(rule.require_teams)}
+                for rule in self.rules
+            ],
+            "required_skills": self.required_skills,
+        }
+
+
+def task_routing(task: dict | Task) -> tuple[str, list[str], list[str], list[str]]:
+    """``(status, declared teams, capability tags, incident fingerprints)`` of a task mapping or ``Task``."""
+    if isinstance(task, Task):
+        routing = task.routing
+        return (
+            task.status,
+            list(routing.required_teams),
+            list(routing.capability_tags),
+            list(routing.incident_fingerprints),
+        )
+    routing = task.get("routing") if isinstance(task.get("routing"), dict) else {}
+    return (
+        str(task.get("status") or "").strip(),
+        _strings(routing.get("required_teams")),
+        _strings(routing.get("capability_tags")),
+        _strings(routing.get("incident_fingerprints")),
+    )
+
+
+class RoutingTable:
+    def __init__(self) -> None:
+        self.rules: list[RouteRule] = []
+        self.skills: list[RouteSkill] = []
+        self._always: list[int] = []
+        self._by_fingerprint: dict[str, list[int]] = {}
+        self._by_tag: dict[str, list[int]] = {}
+        self._by_status: dict[str, list[int]] = {}
+        self._skills_by_team: dict[str, list[int]] = {}
+        self._skills_by_tag: dict[str, list[int]] = {}
+        self._skills_any: list[int] = []
+        self._skills_tagged: list[int] = []
+
+    @classmethod
+    def load(cls, cp_root: Path, loader: Callable[[Path], dict]) -> "RoutingTable":
+        rules_path = cp_root / RULES_CATALOG
+        skills_path = cp_root / SKILLS_CATALOG
+        rules = loader(rules_path).get("rules") if rules_path.exists() else []
+        skills = loader(skills_path).get("skills") if skills_path.exists() else []
+        return cls.compile(rules if isinstance(rules, list) else [], skills if isinstance(skills, list) else [])
+
+    @classmethod
+    def compile(cls, rules: list, skills: list) -> "RoutingTable":
+        table = cls()
+        compiled: list[RouteRule] = []
+        seen: set[str] = set()
+        for item in rules:
+            if not isinstance(item, dict) or not bool(item.get("enabled", False)):
+                continue
+            rule_id = str(item.get("rule_id") or "").strip()
+            if not rule_id or rule_id in seen:
+                continue
+            seen.add(rule_id)
+            when = item.get("when") if isinstance(item.get("when"), dict) else {}
+            try:
+                priority = int(item.get("priority") or 0)
+            except (TypeError, ValueError):
+                priority = 0
+            compiled.append(
+                RouteRule(
+                    rule_id=rule_id,
+                    priority=priority,
+                    statuses=frozenset(_strings(when.get("any_status"))),
+                    tags=frozenset(_strings(when.get("capability_tags"))),
+                    fingerprints=frozenset(_strings(when.get("incident_fingerprint"))),
+                    require_teams=tuple(_strings(item.get("require_teams"))),
+                    require_skills=tuple(_strings(item.get("require_skills"))),
+                )
+            )
+        # Table order is evaluation order: highest priority first, rule_id breaks ties.
+        table.rules = sorted(compiled, key=lambda rule: (-rule.priority, rule.rule_id))
+        for pos, rule in enumerate(table.rules):
+            if rule.fingerprints:
+                keys, bucket = rule.fingerprints, table._by_fingerprint
+            elif rule.tags:
+                keys, bucket = rule.tags, table._by_tag
+            elif rule.statuses:
+                keys, bucket = rule.statuses, table._by_status
+            else:
+                table._always.append(pos)
+                continue
+            for key in keys:
+                bucket.setdefault(key, []).append(pos)
+
+        seen = set()
+        for item in skills:
+            if not isinstance(item, dict) or not bool(item.get("enabled", False)):
+                continue
+            skill_id = str(item.get("skill_id") or "").strip()
+            if not skill_id or skill_id in seen:
+                continue
+            seen.add(skill_id)
+            trigger = item.get("trigger") if isinstance(item.get("trigger"), dict) else {}
+            skill = RouteSkill(
+                skill_id=skill_id,
+                description=str(item.get("description") or "").strip(),
+                teams=frozenset(_strings(item.get("applies_to_teams"))),
+                tags=frozenset(_strings(trigger.get("capability_tags"))),
+            )
+            pos = len(table.skills)
+            table.skills.append(skill)
+            if skill.teams:
+                for team in skill.teams:
+                    table._skills_by_team.setdefault(team, []).append(pos)
+            elif skill.tags:
+                table._skills_tagged.append(pos)
+                for tag in skill.tags:
+                    table._skills_by_tag.setdefault(tag, []).append(pos)
+            else:
+                table._skills_any.append(pos)
+        return table
+
+    def match_rules(self, status: str, tags: set[str], fingerprints: set[str]) -> list[RouteRule]:
+        candidates = set(self._always)
+        candidates.update(self._by_status.get(status, ()))
+        for tag in tags:
+            candidates.update(self._by_tag.get(tag, ()))
+        for fingerprint in fingerprints:
+            candidates.update(self._by_fingerprint.get(fingerprint, ()))
+        return [self.rules[pos] for pos in sorted(candidates) if self.rules[pos].matches(status, tags, fingerprints)]
+
+    def match_skills(self, teams: set[str], tags: set[str]) -> list[RouteSkill]:
+        candidates = set(self._skills_any)
+        for team in teams:
+            candidates.update(self._skills_by_team.get(team, ()))
+        if tags:
+            for tag in tags:
+                candidates.update(self._skills_by_tag.get(tag, ()))
+        else:
+            candidates.update(self._skills_tagged)
+        return [self.skills[pos] for pos in sorted(candidates) if self.skills[pos].matches(teams, tags)]
+
+    def route(self, task: dict | Task) -> RouteDecision:
+        status, declared, tags, fingerprints = task_routing(task)
+        decision = RouteDecision(status, tags, fingerprints, declared)
+        decision.rules = self.match_rules(status, set(tags), set(fingerprints))
+        decision.derived_teams = [
+            team
+            for team in _strings([team for rule in decision.rules for team in rule.require_teams])
+            if team not in declared
+        ]
+        decision.skills = self.match_skills(set(decision.required_teams), set(tags))
+        return decision
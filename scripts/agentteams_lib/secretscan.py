@@ -0,0 +1,506 @@
+"""Offline secret scanner that understands the subset of ``.gitleaks.toml`` we use.
+
+Supported config keys: ``[extend] useDefault / path / disabledRules``,
+``[[rules]]`` (``id``, ``description``, ``regex``, ``secretGroup``,
+``entropy``, ``keywords``, ``path``, ``allowlists``/``allowlist``) and global
+``[[allowlists]]``/``[allowlist]`` (``paths``, ``regexes``, ``regexTarget``,
+``stopwords``, ``condition``). ``useDefault`` pulls in ``DEFAULT_RULES``, the
+high-signal token rules from the upstream gitleaks default config -- a small
+subset of it, so the resolved config records ``bundled_default`` and the
+scanner warns that its coverage is reduced.
+
+Like gitleaks, rule keywords are matched first (one literal alternation pass
+over the lowercased file) and only rules whose keyword occurs are evaluated.
+Finding semantics follow gitleaks: the secret is ``secretGroup`` (or the first
+non-empty group), rule ``entropy`` is a Shannon-entropy floor, ``generic-*``
+rules also require a digit, and allowlists are matched against the secret
+unless ``regexTarget`` says ``match`` or ``line``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+import math
+from pathlib import Path
+import re
+from typing import Any
+
+from agentteams_lib.textscan import TokenMatcher, is_binary
+
+try:  # Python 3.11+
+    import tomllib as _toml  # type: ignore
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as _toml  # type: ignore
+    except ImportError:
+        _toml = None  # type: ignore
+
+STATE_VERSION = 1
+TOKEN_END = r"""(?:[\x60'"\s;]|\\[nr]|$)"""
+
+DEFAULT_RULES: list[dict[str, Any]] = [
+    {
+        "id": "aws-access-token",
+        "description": "AWS access key ID",
+        "regex": r"\b((?:A3T[A-Z0-9]|AKIA|ASIA|ABIA|ACCA)[A-Z2-7]{16})\b",
+        "entropy": 3,
+        "keywords": ["a3t", "akia", "asia", "abia", "acca"],
+        "allowlists": [{"regexes": [r".+EXAMPLE$"]}],
+    },
+    {
+        "id": "github-pat",
+        "description": "GitHub personal access token",
+        "regex": r"ghp_[0-9a-zA-Z]{36}",
+        "entropy": 3,
+        "keywords": ["ghp_"],
+    },
+    {
+        "id": "github-fine-grained-pat",
+        "description": "GitHub fine-grained personal access token",
+        "regex": r"github_pat_\w{82}",
+        "entropy": 3,
+        "keywords": ["github_pat_"],
+    },
+    {
+        "id": "github-oauth",
+        "description": "GitHub OAuth access token",
+        "regex": r"gho_[0-9a-zA-Z]{36}",
+        "entropy": 3,
+        "keywords": ["gho_"],
+    },
+    {
+        "id": "github-app-token",
+        "description": "GitHub app token",
+        "regex": r"(?:ghu|ghs)_[0-9a-zA-Z]{36}",
+        "entropy": 3,
+        "keywords": ["ghu_", "ghs_"],
+    },
+    {
+        "id": "github-refresh-token",
+        "description": "GitHub refresh token",
+        "regex": r"ghr_[0-9a-zA-Z]{36}",
+        "entropy": 3,
+        "keywords": ["ghr_"],
+    },
+    {
+        "id": "gitlab-pat",
+        "description": "GitLab personal access token",
+        "regex": r"glpat-[\w-]{20}",
+        "entropy": 3,
+        "keywords": ["glpat-"],
+    },
+    {
+        "id": "slack-bot-token",
+        "description": "Slack bot token",
+        "regex": r"(xoxb-[0-9]{10,13}-[0-9]{10,13}[a-zA-Z0-9-]*)",
+        "entropy": 3,
+        "keywords": ["xoxb"],
+    },
+    {
+        "id": "slack-user-token",
+        "description": "Slack user token",
+        "regex": r"(xox[pe](?:-[0-9]{10,13}){3}-[a-zA-Z0-9-]{28,34})",
+        "entropy": 2,
+        "keywords": ["xoxp-", "xoxe-"],
+    },
+    {
+        "id": "slack-webhook-url",
+        "description": "Slack webhook URL",
+        "regex": r"(?:https?://)?hooks.slack.com/(?:services|workflows|triggers)/[A-Za-z0-9+/]{43,56}",
+        "keywords": ["hooks.slack.com"],
+    },
+    {
+        "id": "private-key",
+        "description": "Private key block",
+        "regex": r"(?i)-----BEGIN[ A-Z0-9_-]{0,100}PRIVATE KEY(?: BLOCK)?-----[\s\S-]{64,}?KEY(?: BLOCK)?-----",
+        "keywords": ["-----begin"],
+    },
+    {
+        "id": "stripe-access-token",
+        "description": "Stripe access token",
+        "regex": r"\b((?:sk|rk)_(?:test|live|prod)_[a-zA-Z0-9]{10,99})" + TOKEN_END,
+        "entropy": 2,
+        "keywords": ["sk_test", "sk_live", "sk_prod", "rk_test", "rk_live", "rk_prod"],
+    },
+    {
+        "id": "gcp-api-key",
+        "description": "Google Cloud API key",
+        "regex": r"\b(AIza[\w-]{35})" + TOKEN_END,
+        "entropy": 3,
+        "keywords": ["aiza"],
+    },
+    {
+        "id": "npm-access-token",
+        "description": "npm access token",
+        "regex": r"(?i)\b(npm_[a-z0-9]{36})" + TOKEN_END,
+        "entropy": 2,
+        "keywords": ["npm_"],
+    },
+    {
+        "id": "openai-api-key",
+        "description": "OpenAI API key",
+        "regex": r"\b(sk-(?:proj|svcacct|admin)-(?:[A-Za-z0-9_-]{74}|[A-Za-z0-9_-]{58})T3BlbkFJ"
+        r"(?:[A-Za-z0-9_-]{74}|[A-Za-z0-9_-]{58})\b|sk-[a-zA-Z0-9]{20}T3BlbkFJ[a-zA-Z0-9]{20})" + TOKEN_END,
+        "entropy": 3,
+        "keywords": ["t3blbkfj"],
+    },
+    {
+        "id": "anthropic-api-key",
+        "description": "Anthropic API key",
+        "regex": r"\b(sk-ant-api03-[a-zA-Z0-9_\-]{93}AA)" + TOKEN_END,
+        "keywords": ["sk-ant-api03"],
+    },
+    {
+        "id": "jwt",
+        "description": "JSON Web Token",
+        "regex": r"\b(ey[a-zA-Z0-9]{17,}\.ey[a-zA-Z0-9/\\_-]{17,}\.(?:[a-zA-Z0-9/\\_-]{10,}={0,2})?)" + TOKEN_END,
+        "entropy": 3,
+        "keywords": ["ey"],
+    },
+    {
+        "id": "generic-api-key",
+        "description": "Generic API key assignment",
+        "regex": r"(?i)[\w.-]{0,50}?(?:access|auth|(?-i:[Aa]pi|API)|credential|creds|key|passw(?:or)?d|secret|token)"
+        r"(?:[ \t\w.-]{0,20})[\s'\"]{0,3}(?:=|>|:{1,3}=|\|\||:|=>|\?=|,)[\x60'\"\s=]{0,5}"
+        r"([\w.=-]{10,150}|[a-z0-9][a-z0-9+/]{11,}={0,3})" + TOKEN_END,
+        "entropy": 3.5,
+        "keywords": ["access", "api", "auth", "key", "credential", "creds", "passwd", "password", "secret", "token"],
+        "allowlists": [
+            {"regexes": [r"^[a-zA-Z_.-]+$"]},
+            {"stopwords": ["example", "placeholder", "changeme", "redacted", "xxxxxxxx"]},
+        ],
+    },
+]
+
+DEFAULT_ALLOWLIST: dict[str, Any] = {
+    "description": "global allow list",
+    "paths": [
+        r"(?:^|/)\.?gitleaks\.toml$",
+        r"(?i)\.(?:bmp|gif|jpe?g|png|svg|tiff?|ico|webp|woff2?|ttf|eot|pdf)$",
+        r"(?:^|/)(?:package-lock\.json|pnpm-lock\.yaml|yarn\.lock|go\.sum|Cargo\.lock|poetry\.lock|Pipfile\.lock)$",
+        r"(?:^|/)node_modules/",
+        r"(?:^|/)vendor/",
+        r"(?:^|/)\.git/",
+    ],
+}
+
+
+class SecretScanConfigError(ValueError):
+    pass
+
+
+def _compile(pattern: str) -> re.Pattern[str]:
+    """Compile a gitleaks (RE2) pattern; a non-leading ``(?i)`` becomes a global flag."""
+    text = pattern
+    flags = 0
+    if "(?i)" in text[1:]:
+        text = text.replace("(?i)", "")
+        flags |= re.IGNORECASE
+    try:
+        return re.compile(text, flags)
+    except re.error as exc:
+        raise SecretScanConfigError(f"invalid regex {pattern!r}: {exc}") from exc
+
+
+@dataclass
+class Allowlist:
+    paths: list[re.Pattern[str]] = field(default_factory=list)
+    regexes: list[re.Pattern[str]] = field(default_factory=list)
+    stopwords: list[str] = field(default_factory=list)
+    regex_target: str = "secret"
+    condition: str = "OR"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Allowlist":
+        return cls(
+            paths=[_compile(str(item)) for item in data.get("paths") or []],
+            regexes=[_compile(str(item)) for item in data.get("regexes") or []],
+            stopwords=[str(item).lower() for item in data.get("stopwords") or []],
+            regex_target=str(data.get("regexTarget") or "secret").lower(),
+            condition=str(data.get("condition") or "OR").upper(),
+        )
+
+    def allows(self, path: str, secret: str, match: str, line: str) -> bool:
+        target = {"match": match, "line": line}.get(self.regex_target, secret)
+        checks: list[bool] = []
+        if self.paths:
+            checks.append(any(p.search(path) for p in self.paths))
+        if self.regexes:
+            checks.append(any(r.search(target) for r in self.regexes))
+        if self.stopwords:
+            lowered = secret.lower()
+            checks.append(any(word in lowered for word in self.stopwords))
+        if not checks:
+            return False
+        return all(checks) if self.condition == "AND" else any(checks)
+
+    def allows_path(self, path: str) -> bool:
+        if not self.paths:
+            return False
+        if self.condition == "AND" and (self.regexes or self.stopwords):
+            return False
+        return any(p.search(path) for p in self.paths)
+
+
+@dataclass
+class Rule:
+    rule_id: str
+    description: str
+    regex: re.Pattern[str] | None
+    secret_group: int = 0
+    entropy: float = 0.0
+    keywords: list[str] = field(default_factory=list)
+    path: re.Pattern[str] | None = None
+    allowlists: list[Allowlist] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Rule":
+        rule_id = str(data.get("id") or "").strip()
+        if not rule_id:
+            raise SecretScanConfigError("rule without id")
+        raw_allowlists = data.get("allowlists")
+        if raw_allowlists is None and isinstance(data.get("allowlist"), dict):
+            raw_allowlists = [data["allowlist"]]
+        return cls(
+            rule_id=rule_id,
+            description=str(data.get("description") or ""),
+            regex=_compile(str(data["regex"])) if data.get("regex") else None,
+            secret_group=int(data.get("secretGroup") or 0),
+            entropy=float(data.get("entropy") or 0),
+            keywords=[str(item).lower() for item in data.get("keywords") or []],
+            path=_compile(str(data["path"])) if data.get("path") else None,
+            allowlists=[Allowlist.from_dict(item) for item in raw_allowlists or [] if isinstance(item, dict)],
+        )
+
+
+@dataclass
+class Finding:
+    rule_id: str
+    description: str
+    file: str
+    start_line: int
+    end_line: int
+    start_column: int
+    end_column: int
+    match: str
+    secret: str
+    entropy: float
+
+    @property
+    def fingerprint(self) -> str:
+        return f"{self.file}:{self.rule_id}:{self.start_line}"
+
+    def as_report(self, redact: bool) -> dict[str, Any]:
+        secret = "REDACTED" if redact else self.secret
+        match = self.match.replace(self.secret, "REDACTED") if redact and self.secret else self.match
+        return {
+            "RuleID": self.rule_id,
+            "Description": self.description,
+            "StartLine": self.start_line,
+            "EndLine": self.end_line,
+            "StartColumn": self.start_column,
+            "EndColumn": self.end_column,
+            "Match": match,
+            "Secret": secret,
+            "File": self.file,
+            "Entropy": round(self.entropy, 6),
+            "Fingerprint": self.fingerprint,
+        }
+
+
+def shannon_entropy(value: str) -> float:
+    if not value:
+        return 0.0
+    counts: dict[str, int] = {}
+    for char in value:
+        counts[char] = counts.get(char, 0) + 1
+    length = len(value)
+    return -sum((n / length) * math.log2(n / length) for n in counts.values())
+
+
+def load_toml(path: Path) -> dict[str, Any]:
+    if _toml is None:
+        raise SecretScanConfigError("tomllib (Python 3.11+) or the tomli package is required to read .gitleaks.toml")
+    with path.open("rb") as handle:
+        return _toml.load(handle)
+
+
+def _global_allowlists(config: dict[str, Any]) -> list[dict[str, Any]]:
+    items = [item for item in config.get("allowlists") or [] if isinstance(item, dict)]
+    if isinstance(config.get("allowlist"), dict):
+        items.append(config["allowlist"])
+    return items
+
+
+def resolve_config(path: Path, _seen: set[Path] | None = None) -> dict[str, Any]:
+    """Flatten ``[extend]`` chains into ``{"rules": [...], "allowlists": [...], "bundled_default": bool}``.
+
+    ``bundled_default`` is true when any config in the chain sets ``useDefault``, which this scanner can only
+    approximate with ``DEFAULT_RULES``.
+    """
+    seen = _seen if _seen is not None else set()
+    resolved_path = path.resolve()
+    if resolved_path in seen:
+        raise SecretScanConfigError(f"circular [extend] path: {path.as_posix()}")
+    seen.add(resolved_path)
+
+    config = load_toml(path)
+    extend = config.get("extend") if isinstance(config.get("extend"), dict) else {}
+    rules: dict[str, dict[str, Any]] = {}
+    allowlists: list[dict[str, Any]] = []
+    bundled_default = bool(extend.get("useDefault"))
+
+    if extend.get("url"):
+        raise SecretScanConfigError("[extend] url is not supported offline; vendor the file and use path")
+    if extend.get("useDefault"):
+        rules.update({rule["id"]: rule for rule in DEFAULT_RULES})
+        allowlists.append(DEFAULT_ALLOWLIST)
+    if extend.get("path"):
+        base = resolve_config((path.parent / str(extend["path"])), seen)
+        rules.update({rule["id"]: rule for rule in base["rules"]})
+        allowlists.extend(base["allowlists"])
+        bundled_default = bundled_default or base["bundled_default"]
+    for rule_id in extend.get("disabledRules") or []:
+        rules.pop(str(rule_id), None)
+
+    for rule in config.get("rules") or []:
+        if not isinstance(rule, dict) or not rule.get("id"):
+            continue
+        merged = dict(rules.get(str(rule["id"]), {}))
+        merged.update(rule)
+        rules[str(rule["id"])] = merged
+    allowlists.extend(_global_allowlists(config))
+    return {"rules": list(rules.values()), "allowlists": allowlists, "bundled_default": bundled_default}
+
+
+class SecretScanner:
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.rules = [Rule.from_dict(item) for item in config.get("rules") or []]
+        self.allowlists = [Allowlist.from_dict(item) for item in config.get("allowlists") or []]
+        self._always = [rule for rule in self.rules if not rule.keywords]
+        self._by_keyword: dict[str, list[Rule]] = {}
+        for rule in self.rules:
+            for keyword in rule.keywords:
+                self._by_keyword.setdefault(keyword, []).append(rule)
+        self._keywords = TokenMatcher(self._by_keyword.keys())
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SecretScanner":
+        return cls(resolve_config(path))
+
+    def path_allowed(self, relpath: str) -> bool:
+        return any(allowlist.allows_path(relpath) for allowlist in self.allowlists)
+
+    def candidate_rules(self, data: bytes) -> list[Rule]:
+        selected = list(self._always)
+        seen = {id(rule) for rule in selected}
+        for keyword in self._keywords.find(data.lower()):
+            for rule in self._by_keyword[keyword]:
+                if id(rule) not in seen:
+                    seen.add(id(rule))
+                    selected.append(rule)
+        return selected
+
+    def scan_bytes(self, relpath: str, data: bytes) -> list[Finding]:
+        if is_binary(data):
+            return []
+        rules = self.candidate_rules(data)
+        if not rules:
+            return []
+        text = data.decode("utf-8", errors="replace")
+        line_starts: list[int] | None = None
+        findings: list[Finding] = []
+        for rule in rules:
+            if rule.path is not None and not rule.path.search(relpath):
+                continue
+            if rule.regex is None:
+                if rule.path is not None:
+                    findings.append(Finding(rule.rule_id, rule.description, relpath, 0, 0, 0, 0, "", "", 0.0))
+                continue
+            for match in rule.regex.finditer(text):
+                secret = self._secret(rule, match)
+                if not secret:
+                    continue
+                entropy = shannon_entropy(secret)
+                if rule.entropy and entropy <= rule.entropy:
+                    continue
+                if rule.rule_id.startswith("generic") and rule.entropy and not any(ch.isdigit() for ch in secret):
+                    continue
+                if line_starts is None:
+                    line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+                start_line, start_col = _position(line_starts, match.start())
+                end_line, end_col = _position(line_starts, max(match.end() - 1, match.start()))
+                line_end = text.find("\n", match.start())
+                line = text[line_starts[start_line - 1] : line_end if line_end >= 0 else len(text)]
+                if any(a.allows(relpath, secret, match.group(0), line) for a in rule.allowlists):
+                    continue
+                if any(a.allows(relpath, secret, match.group(0), line) for a in self.allowlists):
+                    continue
+                findings.append(
+                    Finding(
+                        rule.rule_id,
+                        rule.description,
+                        relpath,
+                        start_line,
+                        end_line,
+                        start_col,
+                        end_col,
+                        match.group(0),
+                        secret,
+                        entropy,
+                    )
+                )
+        findings.sort(key=lambda f: (f.start_line, f.start_column, f.rule_id))
+        return findings
+
+    @staticmethod
+    def _secret(rule: Rule, match: re.Match[str]) -> str:
+        if rule.secret_group and rule.secret_group <= (match.re.groups or 0):
+            return match.group(rule.secret_group) or ""
+        for group in match.groups():
+            if group:
+                return group
+        return match.group(0)
+
+
+def _position(line_starts: list[int], offset: int) -> tuple[int, int]:
+    low, high = 0, len(line_starts) - 1
+    while low < high:
+        mid = (low + high + 1) // 2
+        if line_starts[mid] <= offset:
+            low = mid
+        else:
+            high = mid - 1
+    return low + 1, offset - line_starts[low] + 1
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def config_fingerprint(config: dict[str, Any]) -> str:
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{STATE_VERSION}:{payload}".encode("utf-8")).hexdigest()
+
+
+_WORKER_SCANNER: SecretScanner | None = None
+
+
+def worker_init(config: dict[str, Any]) -> None:
+    global _WORKER_SCANNER
+    _WORKER_SCANNER = SecretScanner(config)
+
+
+def worker_scan(item: tuple[str, str, str]) -> tuple[str, str, list[Finding] | None, str]:
+    """Scan one file; returns ``(relpath, sha256, findings or None when unchanged, error)``."""
+    path, relpath, cached_hash = item
+    assert _WORKER_SCANNER is not None
+    try:
+        data = Path(path).read_bytes()
+    except OSError as exc:
+        return relpath, "", [], str(exc)
+    digest = content_hash(data)
+    if cached_hash and cached_hash == digest:
+        return relpath, digest, None, ""
+    return relpath, digest, _WORKER_SCANNER.scan_bytes(relpath, data), ""
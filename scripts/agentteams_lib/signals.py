@@ -0,0 +1,202 @@
+"""Sharded fleet signals: a small manifest plus one file per section/project.
+
+``aggregate-fleet-signals.py`` writes ``signals/manifest.yaml`` and shards
+under ``signals/sections/`` and ``signals/projects/``. The manifest carries the
+scalar header fields and, for every shard, its path and content hash. Writers
+skip shards whose hash is unchanged and replace the manifest last, so a reader
+never sees a manifest pointing at shards from a different run. Readers load
+the manifest and then only the shards they ask for; trees that still have a
+monolithic ``signals/latest.yaml`` are read through the same interface.
+"""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+import re
+from typing import Callable
+
+from agentteams_lib.fsio import write_atomic
+
+MANIFEST_NAME = "manifest.yaml"
+LEGACY_NAME = "latest.yaml"
+MANIFEST_VERSION = 1
+HEADER_KEYS = ["generated_at", "window_days", "incident_window_days", "notes"]
+SECTIONS = {
+    "fingerprint_project_counts": ("sections/fingerprint-project-counts.yaml", dict),
+    "overload_candidates": ("sections/overload-candidates.yaml", list),
+}
+
+Loader = Callable[[Path], dict]
+Dumper = Callable[[dict], str]
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def project_shard_path(project_id: str) -> str:
+    return f"projects/{re.sub(r'[^A-Za-z0-9._-]', '_', project_id)}.yaml"
+
+
+def write_signals(signals_root: Path, signals: dict, dump: Dumper, load: Loader) -> dict:
+    """Write ``signals`` as shards plus manifest; returns ``{"written", "unchanged", "removed"}``."""
+    previous = load(signals_root / MANIFEST_NAME) if (signals_root / MANIFEST_NAME).exists() else {}
+    previous_hashes: dict[str, str] = {}
+    for entry in list((previous.get("sections") or {}).values()) + list((previous.get("projects") or {}).values()):
+        if isinstance(entry, dict) and entry.get("path"):
+            previous_hashes[str(entry["path"])] = str(entry.get("sha256") or "")
+
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    manifest: dict = {"version": MANIFEST_VERSION}
+    for key in HEADER_KEYS:
+        if key in signals:
+            manifest[key] = signals[key]
+
+    def put(rel: str, payload: dict) -> str:
+        text = dump(payload)
+        digest = _sha256(text)
+        target = signals_root / rel
+        if previous_hashes.get(rel) == digest and target.exists():
+            counts["unchanged"] += 1
+        else:
+            write_atomic(target, text)
+            counts["written"] += 1
+        return digest
+
+    manifest["sections"] = {}
+    for name, (rel, kind) in SECTIONS.items():
+        value = signals.get(name)
+        value = value if isinstance(value, kind) else kind()
+        manifest["sections"][name] = {"path": rel, "sha256": put(rel, {name: value}), "entries": len(value)}
+
+    manifest["projects"] = {}
+    for project in signals.get("projects") or []:
+        if not isinstance(project, dict) or not project.get("project_id"):
+            continue
+        project_id = str(project["project_id"])
+        rel = project_shard_path(project_id)
+        manifest["projects"][project_id] = {
+            "path": rel,
+            "sha256": put(rel, project),
+            "captured_at": project.get("captured_at"),
+        }
+
+    write_atomic(signals_root / MANIFEST_NAME, dump(manifest))
+
+    live = {entry["path"] for entry in manifest["projects"].values()}
+    projects_dir = signals_root / "projects"
+    if projects_dir.is_dir():
+        for stale in projects_dir.glob("*.yaml"):
+            if f"projects/{stale.name}" not in live:
+                stale.unlink()
+                counts["removed"] += 1
+    return counts
+
+
+class SignalsReader:
+    """Lazy access to fleet signals under ``signals_root``.
+
+    Accepts the signals directory, its ``manifest.yaml``, or a legacy
+    ``latest.yaml`` path.
+    """
+
+    def __init__(self, path: Path, load: Loader) -> None:
+        self._load = load
+        if path.suffix == ".yaml" and path.name != MANIFEST_NAME:
+            self.root = path.parent
+            candidates = [("legacy", path)]
+        else:
+            self.root = path.parent if path.name == MANIFEST_NAME else path
+            candidates = [("manifest", self.root / MANIFEST_NAME), ("legacy", self.root / LEGACY_NAME)]
+        self.legacy: dict | None = None
+        self.manifest: dict = {}
+        self.source = candidates[0][1]
+        for kind, candidate in candidates:
+            if not candidate.is_file():
+                continue
+            self.source = candidate
+            if kind == "manifest":
+                self.manifest = load(candidate)
+            else:
+                self.legacy = load(candidate)
+            break
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.manifest) or self.legacy is not None
+
+    def header(self) -> dict:
+        data = self.legacy if self.legacy is not None else self.manifest
+        return {key: data[key] for key in HEADER_KEYS if key in data}
+
+    def keys(self) -> set[str]:
+        """Top-level keys the equivalent monolithic document would have."""
+        if self.legacy is not None:
+            return set(self.legacy)
+        if not self.manifest:
+            return set()
+        keys = {key for key in HEADER_KEYS if key in self.manifest}
+        keys.update(name for name in (self.manifest.get("sections") or {}))
+        if isinstance(self.manifest.get("projects"), dict):
+            keys.add("projects")
+        return keys
+
+    def section(self, name: str) -> object:
+        """Return one section (``None`` when absent)."""
+        if self.legacy is not None:
+            return self.legacy.get(name)
+        entry = (self.manifest.get("sections") or {}).get(name)
+        if not isinstance(entry, dict):
+            return None
+        path = self.root / str(entry.get("path") or "")
+        if not path.is_file():
+            return None
+        return self._load(path).get(name)
+
+    def project_index(self) -> dict[str, dict]:
+        """Manifest-level ``{project_id: {path, sha256, captured_at}}`` without opening shards."""
+        if self.legacy is not None:
+            projects = self.legacy.get("projects") if isinstance(self.legacy.get("projects"), list) else []
+            return {
+                str(item.get("project_id")): {"captured_at": item.get("captured_at")}
+                for item in projects
+                if isinstance(item, dict)
+            }
+        projects = self.manifest.get("projects")
+        return dict(projects) if isinstance(projects, dict) else {}
+
+    def projects(self, only: set[str] | None = None) -> list[dict]:
+        if self.legacy is not None:
+            projects = self.legacy.get("projects") if isinstance(self.legacy.get("projects"), list) else []
+            return [
+                item for item in projects if isinstance(item, dict) and (only is None or item.get("project_id") in only)
+            ]
+        result = []
+        for project_id, entry in sorted(self.project_index().items()):
+            if only is not None and project_id not in only:
+                continue
+            path = self.root / str(entry.get("path") or "")
+            if path.is_file():
+                result.append(self._load(path))
+        return result
+
+    def missing_shards(self) -> list[str]:
+        if self.legacy is not None:
+            return []
+        entries = list((self.manifest.get("sections") or {}).values()) + list(self.project_index().values())
+        return sorted(
+            str(entry.get("path"))
+            for entry in entries
+            if isinstance(entry, dict) and not (self.root / str(entry.get("path") or "")).is_file()
+        )
+
+    def as_document(self) -> dict:
+        """Reassemble the monolithic document (loads every shard)."""
+        if self.legacy is not None:
+            return dict(self.legacy)
+        document = self.header()
+        document["projects"] = self.projects()
+        for name in SECTIONS:
+            value = self.section(name)
+            document[name] = value if value is not None else SECTIONS[name][1]()
+        return document
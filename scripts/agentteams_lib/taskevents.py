@@ -0,0 +1,189 @@
+"""Append-only task event logs with the task YAML as a materialized snapshot.
+
+A task may keep new evidence in ``.takt/tasks/<id>.events.jsonl`` (``<id>`` is
+the task's ``id``, e.g. ``T-00100``) instead of rewriting ``TASK-*.yaml`` for
+every declaration, handoff or gate. Each line is one JSON event:
+
+    {"type": "declaration", "at": "2026-02-07T02:00:00Z", "team": ..., ...}
+
+``type`` selects how the remaining fields fold into the task:
+
+- ``declaration`` / ``handoff`` / ``team_leader_gate``: appended to
+  ``declarations`` / ``handoffs`` / ``approvals.team_leader_gates``
+- ``qa_gate`` / ``leader_gate``: replace ``approvals.qa_gate`` / ``leader_gate``
+- ``status``: sets ``status``
+
+Events are checked before they are appended: required fields, the ``at``
+format, and ``status`` values (a task status for ``status`` events, an
+approval status for gates), so ``task rotate`` never acts on a bad status.
+
+Appending is a single ``O_APPEND`` write of one line, so concurrent writers
+never rewrite or lock a shared file. The YAML keeps ``event_seq``, the number
+of log lines already folded into it; readers fold only the lines after that,
+and ``task snapshot`` folds them into the YAML in batches. A line without a
+trailing newline is a write still in flight (or torn by a crash) and is left
+for the next reader.
+"""
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import re
+from typing import Callable
+
+from agentteams_lib.approvals import APPROVAL_STATUS
+from agentteams_lib.tasklayout import task_files, walk
+
+EVENTS_SUFFIX = ".events.jsonl"
+# Advisory lock in the task directory held by every command that rewrites task YAML (snapshot, archive, rotate).
+SNAPSHOT_LOCK = ".snapshot.lock"
+SEQ_KEY = "event_seq"
+TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+LIST_EVENTS = {"declaration": "declarations", "handoff": "handoffs"}
+GATE_EVENTS = {"qa_gate", "leader_gate"}
+EVENT_TYPES = ("declaration", "handoff", "team_leader_gate", "qa_gate", "leader_gate", "status")
+TASK_STATUSES = ("todo", "in_progress", "in_review", "blocked", "done")
+# Fields an event must carry before it is accepted into the log.
+REQUIRED_FIELDS = {
+    "declaration": ("at", "team", "role", "action", "what", "controlled_by"),
+    "handoff": ("at", "from", "to", "memo"),
+    "team_leader_gate": ("at", "team", "leader_role", "status", "note", "controlled_by"),
+    "qa_gate": ("at", "by", "status", "note", "controlled_by"),
+    "leader_gate": ("at", "by", "status", "note", "controlled_by"),
+    "status": ("at", "status"),
+}
+
+
+class EventLogError(ValueError):
+    pass
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def events_path(task_dir: Path, task_id: str) -> Path:
+    return task_dir / f"{task_id}{EVENTS_SUFFIX}"
+
+
+def task_file_for_id(task_dir: Path, task_id: str, loader: Callable[[Path], dict]) -> Path | None:
+    """The ``TASK-*.yaml`` snapshot whose ``id`` is ``task_id`` (``T-00100`` lives in ``TASK-00100*.yaml``)."""
+    number = task_id.split("-", 1)[-1]
+    files = task_files(task_dir)
+    candidates = [path for path in files if path.name.startswith(f"TASK-{number}")] if number.isdigit() else []
+    for path in candidates or files:
+        if str(loader(path).get("id") or "") == task_id:
+            return path
+    return None
+
+
+def event_log_index(task_dir: Path, include_archive: bool = True) -> dict[str, Path]:
+    """``{task id: log path}`` for every event log in ``task_dir`` and its partitions (one walk)."""
+    return {
+        name[: -len(EVENTS_SUFFIX)]: directory / name
+        for directory, filenames in walk(task_dir, include_archive)
+        for name in filenames
+        if name.endswith(EVENTS_SUFFIX)
+    }
+
+
+def event_errors(event: object) -> list[str]:
+    if not isinstance(event, dict):
+        return ["event must be a JSON object"]
+    kind = str(event.get("type") or "")
+    if kind not in EVENT_TYPES:
+        return [f"type must be one of {list(EVENT_TYPES)}"]
+    errors = [f"{kind}.{key} is required" for key in REQUIRED_FIELDS[kind] if key not in event]
+    at = str(event.get("at") or "")
+    if "at" in event and kind != "handoff" and not TIMESTAMP_PATTERN.fullmatch(at):
+        errors.append(f"{kind}.at must match YYYY-MM-DDTHH:MM:SSZ")
+    # The log is append-only, so a bad status must be refused here rather than corrected later.
+    allowed = TASK_STATUSES if kind == "status" else sorted(APPROVAL_STATUS) if kind.endswith("_gate") else ()
+    if allowed and "status" in event and str(event["status"]) not in allowed:
+        errors.append(f"{kind}.status must be one of {list(allowed)}")
+    return errors
+
+
+def append_event(path: Path, event: dict) -> None:
+    """Append one event as a single write; raises ``EventLogError`` for invalid events."""
+    errors = event_errors(event)
+    if errors:
+        raise EventLogError("; ".join(errors))
+    line = (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_events(path: Path, start: int = 0) -> list[dict]:
+    """Complete events after the first ``start`` lines of the log."""
+    if not path.exists():
+        return []
+    events: list[dict] = []
+    with path.open("rb") as handle:
+        for lineno, raw in enumerate(handle, 1):
+            if not raw.endswith(b"\n"):
+                break
+            if lineno <= start:
+                continue
+            try:
+                event = json.loads(raw.decode("utf-8"))
+            except ValueError as exc:
+                raise EventLogError(f"{path.as_posix()}:{lineno}: invalid JSON: {exc}") from exc
+            errors = event_errors(event)
+            if errors:
+                raise EventLogError(f"{path.as_posix()}:{lineno}: {'; '.join(errors)}")
+            events.append(event)
+    return events
+
+
+def snapshot_seq(task: dict) -> int:
+    try:
+        return max(int(task.get(SEQ_KEY) or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def apply_event(task: dict, event: dict) -> None:
+    kind = event["type"]
+    body = {key: value for key, value in event.items() if key != "type"}
+    if kind in LIST_EVENTS:
+        if not isinstance(task.get(LIST_EVENTS[kind]), list):
+            task[LIST_EVENTS[kind]] = []
+        task[LIST_EVENTS[kind]].append(body)
+    elif kind == "status":
+        task["status"] = body["status"]
+    else:
+        if not isinstance(task.get("approvals"), dict):
+            task["approvals"] = {}
+        approvals = task["approvals"]
+        if kind in GATE_EVENTS:
+            approvals[kind] = body
+        else:
+            if not isinstance(approvals.get("team_leader_gates"), list):
+                approvals["team_leader_gates"] = []
+            approvals["team_leader_gates"].append(body)
+    at = str(event.get("at") or "")
+    if TIMESTAMP_PATTERN.fullmatch(at) and at > str(task.get("updated_at") or ""):
+        task["updated_at"] = at
+    task[SEQ_KEY] = snapshot_seq(task) + 1
+
+
+def materialize(task: dict, log: Path | None) -> tuple[dict, int]:
+    """``(task with pending events folded in, number of events folded)``; ``task`` is not modified."""
+    if log is None:
+        return task, 0
+    pending = read_events(log, snapshot_seq(task))
+    if not pending:
+        return task, 0
+    merged = copy.deepcopy(task)
+    for event in pending:
+        apply_event(merged, event)
+    return merged, len(pending)
@@ -0,0 +1,210 @@
+"""Archive old declaration / handoff / gate history out of task files.
+
+``task archive`` moves ``declarations``, ``handoffs`` and
+``approvals.team_leader_gates`` entries timestamped before a cutoff into a
+sidecar ``<id>.history.jsonl`` next to the task and leaves a ``history``
+digest in the task:
+
+    history:
+      archive: T-00100.history.jsonl
+      cutoff: '2026-01-01T00:00:00Z'
+      counts: {declarations: 40, handoffs: 12, team_leader_gates: 9}
+      head: <sha256 of the last archive line>
+      teams: [backend, coordinator, ...]        # declared / handed-off teams
+      controls: ['rule:qa-required', ...]       # declaration / gate controlled_by
+      team_leader_gates:                        # last state per team gate
+        backend: {status: approved, at: '2025-12-30T10:00:00Z'}
+      last_rework_at: '2025-12-29T09:00:00Z'
+
+Archive lines form a hash chain, each ``{"seq", "kind", "entry", "prev",
+"hash"}`` with ``hash = sha256(prev + canonical JSON of kind and entry)``, so
+``verify`` detects edited, dropped or reordered history. The digest is all
+the validators need from the archived part: ``approvals.task_events`` replays
+the last gate states and rework time before the recent entries, and the
+evidence and audit checks add the archived teams and controls. Checking a
+task therefore costs its recent entries, not its age; only ``verify`` reads
+archives.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from agentteams_lib.approvals import ApprovalChain, history_events, parse_at, task_events
+
+HISTORY_KEY = "history"
+HISTORY_SUFFIX = ".history.jsonl"
+SECTIONS = ("declarations", "handoffs", "team_leader_gates")
+KINDS = {"declarations": "declaration", "handoffs": "handoff", "team_leader_gates": "team_leader_gate"}
+
+
+class HistoryError(ValueError):
+    pass
+
+
+def history_path(task_dir: Path, task_id: str) -> Path:
+    return task_dir / f"{task_id}{HISTORY_SUFFIX}"
+
+
+def digest_of(task: dict) -> dict:
+    history = task.get(HISTORY_KEY)
+    return history if isinstance(history, dict) else {}
+
+
+def archived_count(task: dict, section: str) -> int:
+    counts = digest_of(task).get("counts")
+    value = counts.get(section) if isinstance(counts, dict) else 0
+    return value if isinstance(value, int) else 0
+
+
+def archived_teams(task: dict) -> list[str]:
+    teams = digest_of(task).get("teams")
+    return [str(team) for team in teams] if isinstance(teams, list) else []
+
+
+def archived_controls(task: dict) -> list[str]:
+    controls = digest_of(task).get("controls")
+    return [str(control) for control in controls] if isinstance(controls, list) else []
+
+
+def _team(ref: object) -> str:
+    return str(ref or "").strip().split("/", 1)[0].strip()
+
+
+def _line_hash(prev: str, kind: str, entry: dict) -> str:
+    body = json.dumps(
+        {"kind": kind, "entry": entry}, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256((prev + body).encode("utf-8")).hexdigest()
+
+
+def read_chain(path: Path, limit: int | None = None) -> tuple[list[str], str]:
+    """The first ``limit`` archive lines (all when ``None``) after checking their chain; and the head hash."""
+    lines: list[str] = []
+    head = ""
+    if not path.exists():
+        return lines, head
+    with path.open("r", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if limit is not None and len(lines) >= limit:
+                break
+            if not line.endswith("\n"):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise HistoryError(f"{path.as_posix()}:{number}: invalid JSON: {exc.msg}") from exc
+            if not isinstance(record, dict) or record.get("prev") != head or record.get("seq") != number:
+                raise HistoryError(f"{path.as_posix()}:{number}: hash chain broken")
+            if record.get("hash") != _line_hash(head, str(record.get("kind") or ""), record.get("entry")):
+                raise HistoryError(f"{path.as_posix()}:{number}: entry does not match its hash")
+            head = str(record["hash"])
+            lines.append(line)
+    return lines, head
+
+
+def verify(task_dir: Path, task: dict) -> list[str]:
+    """Problems between a task's digest and its archive (empty when they agree)."""
+    digest = digest_of(task)
+    if not digest:
+        return []
+    path = task_dir / str(digest.get("archive") or "")
+    if not digest.get("archive") or not path.is_file():
+        return [f"history archive missing: {path.as_posix()}"]
+    try:
+        lines, head = read_chain(path)
+    except HistoryError as exc:
+        return [str(exc)]
+    expected = sum(archived_count(task, section) for section in SECTIONS)
+    problems: list[str] = []
+    if len(lines) != expected:
+        problems.append(f"{path.as_posix()}: {len(lines)} archived entries, digest counts {expected}")
+    if head != str(digest.get("head") or ""):
+        problems.append(f"{path.as_posix()}: chain head does not match history.head")
+    return problems
+
+
+def split_task(task: dict, cutoff: str) -> tuple[dict, dict[str, list[dict]]]:
+    """``task`` without entries timestamped before ``cutoff``, and those entries per section."""
+    limit = parse_at(cutoff)
+    if limit is None:
+        raise HistoryError(f"cutoff must match YYYY-MM-DDTHH:MM:SSZ: {cutoff}")
+    moved: dict[str, list[dict]] = {section: [] for section in SECTIONS}
+    remaining = dict(task)
+    approvals = dict(task["approvals"]) if isinstance(task.get("approvals"), dict) else None
+    for section in SECTIONS:
+        container = approvals if section == "team_leader_gates" else remaining
+        if container is None or not isinstance(container.get(section), list):
+            continue
+        keep: list = []
+        for entry in container[section]:
+            at = parse_at(entry.get("at")) if isinstance(entry, dict) else None
+            (moved[section] if at is not None and at < limit else keep).append(entry)
+        container[section] = keep
+    if approvals is not None:
+        remaining["approvals"] = approvals
+    return remaining, moved
+
+
+def archive(task_dir: Path, task: dict, cutoff: str) -> tuple[dict, int, list[str]]:
+    """Move entries before ``cutoff`` to the archive; return the new task, the count moved and the archive lines.
+
+    The caller writes the archive lines (the whole file) before the task, so a crash in between leaves
+    lines past the digest's counts, which the next ``archive`` drops again.
+    """
+    task_id = str(task.get("id") or "").strip()
+    if not task_id:
+        raise HistoryError("task has no id")
+    remaining, moved = split_task(task, cutoff)
+    total = sum(len(entries) for entries in moved.values())
+    digest = digest_of(task)
+    path = history_path(task_dir, task_id)
+    kept = sum(archived_count(task, section) for section in SECTIONS)
+    lines, head = read_chain(path, kept)
+    if len(lines) != kept or head != str(digest.get("head") or ""):
+        raise HistoryError(f"{path.as_posix()}: archive does not match history digest; run task archive --verify")
+    if total == 0:
+        return task, 0, lines
+
+    # The digest's gate states and rework time seed the chain, then the moved entries fold on top.
+    chain = ApprovalChain([])
+    moved_task = {"declarations": moved["declarations"], "approvals": {"team_leader_gates": moved["team_leader_gates"]}}
+    for event in history_events(digest) + task_events(moved_task):
+        chain.apply(event)
+    teams = set(archived_teams(task))
+    controls = set(archived_controls(task))
+    for section in SECTIONS:
+        for entry in moved[section]:
+            kind = KINDS[section]
+            prev = head
+            head = _line_hash(prev, kind, entry)
+            record = {"seq": len(lines) + 1, "kind": kind, "entry": entry, "prev": prev, "hash": head}
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+            if not isinstance(entry, dict):
+                continue
+            if kind == "declaration":
+                teams.add(_team(entry.get("team")))
+            elif kind == "handoff":
+                teams.update((_team(entry.get("from")), _team(entry.get("to"))))
+            # Handoff controls are not evidence for the rule / skill checks, so they stay out of the digest too.
+            if kind != "handoff" and isinstance(entry.get("controlled_by"), list):
+                controls.update(str(value).strip() for value in entry["controlled_by"] if str(value or "").strip())
+
+    counts = {section: archived_count(task, section) + len(moved[section]) for section in SECTIONS}
+    previous_cutoff = str(digest.get("cutoff") or "")
+    remaining[HISTORY_KEY] = {
+        "archive": path.name,
+        "cutoff": max(previous_cutoff, cutoff),
+        "counts": counts,
+        "head": head,
+        "teams": sorted(teams - {""}),
+        "controls": sorted(controls),
+        "team_leader_gates": {
+            team: {"status": state.status, "at": state.at.strftime("%Y-%m-%dT%H:%M:%SZ")}
+            for team, state in sorted(chain.teams.items())
+            if state.at is not None
+        },
+        "last_rework_at": chain.last_rework_at.strftime("%Y-%m-%dT%H:%M:%SZ") if chain.last_rework_at else "",
+    }
+    return remaining, total, lines
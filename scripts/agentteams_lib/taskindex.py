@@ -0,0 +1,373 @@
+"""SQLite index over tasks, evidence and intake snapshots.
+
+``.takt/cache/index.sqlite`` holds one normalized copy of what the validators
+otherwise re-parse from YAML on every question:
+
+- ``tasks``: one row per task file (event logs folded in), with the approval
+  chain's ``next_gate``
+- ``routing``: required teams, capability tags and incident fingerprints
+- ``declarations``, ``handoffs``, ``gates`` and ``controls`` (every
+  ``controlled_by`` entry with the evidence it came from)
+- ``leader_state``: the current status of every leader gate the task needs,
+  taken from its routed teams (declared plus those routing rules add)
+- ``intake``: one row per intake snapshot, loose or archived
+
+``sources`` remembers each input's ``(mtime_ns, size)`` stamp and content hash.
+``sync`` only re-reads inputs whose stamp changed and only rewrites rows when
+the hash changed too, so refreshing an index over tens of thousands of tasks
+costs a ``stat`` per file. A task's stamp covers its event log and the rule
+and skill catalogs as well, so a catalog change re-indexes every task.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+import sqlite3
+from typing import Callable
+
+from agentteams_lib.approvals import ApprovalChain, leader_teams
+from agentteams_lib.intake import archive_files, loose_files, read_archive
+from agentteams_lib.routing import RULES_CATALOG, SKILLS_CATALOG, RoutingTable
+from agentteams_lib.taskevents import event_log_index, materialize, snapshot_seq
+from agentteams_lib.tasklayout import task_files
+
+DEFAULT_DB = ".takt/cache/index.sqlite"
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE sources (path TEXT PRIMARY KEY, kind TEXT NOT NULL, stamp TEXT NOT NULL, sha256 TEXT NOT NULL);
+CREATE TABLE tasks (
+    path TEXT PRIMARY KEY, task_id TEXT, title TEXT, status TEXT, updated_at TEXT,
+    event_seq INTEGER, next_gate TEXT
+);
+CREATE INDEX tasks_task_id ON tasks (task_id);
+CREATE INDEX tasks_status ON tasks (status);
+CREATE TABLE routing (path TEXT NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL);
+CREATE INDEX routing_value ON routing (kind, value);
+CREATE INDEX routing_path ON routing (path);
+CREATE TABLE declarations (
+    path TEXT NOT NULL, seq INTEGER NOT NULL, at TEXT, team TEXT, role TEXT, action TEXT, what TEXT
+);
+CREATE INDEX declarations_team ON declarations (team);
+CREATE INDEX declarations_path ON declarations (path);
+CREATE TABLE handoffs (
+    path TEXT NOT NULL, seq INTEGER NOT NULL, at TEXT, from_ref TEXT, to_ref TEXT,
+    from_team TEXT, to_team TEXT, memo TEXT
+);
+CREATE INDEX handoffs_path ON handoffs (path);
+CREATE TABLE gates (
+    path TEXT NOT NULL, seq INTEGER NOT NULL, kind TEXT NOT NULL, team TEXT, actor TEXT,
+    status TEXT, at TEXT, note TEXT
+);
+CREATE INDEX gates_team ON gates (kind, team);
+CREATE INDEX gates_path ON gates (path);
+CREATE TABLE controls (path TEXT NOT NULL, source TEXT NOT NULL, seq INTEGER NOT NULL, control TEXT NOT NULL);
+CREATE INDEX controls_control ON controls (control);
+CREATE INDEX controls_path ON controls (path);
+CREATE TABLE leader_state (path TEXT NOT NULL, team TEXT NOT NULL, status TEXT NOT NULL);
+CREATE INDEX leader_state_team ON leader_state (team, status);
+CREATE INDEX leader_state_path ON leader_state (path);
+CREATE TABLE intake (
+    source TEXT NOT NULL, origin TEXT NOT NULL, project_id TEXT, captured_at TEXT, window_days INTEGER,
+    todo INTEGER, in_progress INTEGER, in_review INTEGER, blocked INTEGER, done INTEGER,
+    lead_time_p50_hours REAL, queue_p95_hours REAL, rework_rate REAL, blocked_ratio REAL
+);
+CREATE INDEX intake_project ON intake (project_id, captured_at);
+CREATE INDEX intake_source ON intake (source);
+"""
+TASK_TABLES = ("tasks", "routing", "declarations", "handoffs", "gates", "controls", "leader_state")
+
+# name -> (description, parameters, SQL). Parameters bind as :name.
+QUERIES: dict[str, tuple[str, tuple[str, ...], str]] = {
+    "status-counts": (
+        "tasks per status",
+        (),
+        "SELECT status, COUNT(*) AS tasks FROM tasks GROUP BY status ORDER BY tasks DESC, status",
+    ),
+    "next-gate": (
+        "open tasks per approval gate they are waiting on",
+        (),
+        "SELECT next_gate, COUNT(*) AS tasks FROM tasks WHERE status != 'done' "
+        "GROUP BY next_gate ORDER BY tasks DESC, next_gate",
+    ),
+    "waiting-on-team": (
+        "open tasks waiting on a team leader gate",
+        ("team",),
+        "SELECT t.task_id, t.status, s.status AS gate_status, t.path FROM tasks t "
+        "JOIN leader_state s ON s.path = t.path "
+        "WHERE s.team = :team AND s.status != 'approved' AND t.status != 'done' ORDER BY t.task_id",
+    ),
+    "control-usage": (
+        "evidence entries citing a control (e.g. rule:qa-required), per evidence kind",
+        ("control",),
+        "SELECT source, COUNT(*) AS entries, COUNT(DISTINCT path) AS tasks FROM controls "
+        "WHERE control = :control GROUP BY source ORDER BY source",
+    ),
+    "team-declarations": (
+        "declarations per team",
+        (),
+        "SELECT team, COUNT(*) AS declarations, COUNT(DISTINCT path) AS tasks FROM declarations "
+        "GROUP BY team ORDER BY declarations DESC, team",
+    ),
+    "tasks-with-tag": (
+        "tasks routed with a capability tag",
+        ("tag",),
+        "SELECT t.task_id, t.status, t.next_gate, t.path FROM tasks t JOIN routing r ON r.path = t.path "
+        "WHERE r.kind = 'capability_tag' AND r.value = :tag ORDER BY t.task_id",
+    ),
+    "intake-latest": (
+        "latest intake snapshot per project",
+        (),
+        "SELECT project_id, MAX(captured_at) AS captured_at, lead_time_p50_hours, queue_p95_hours, "
+        "rework_rate, blocked_ratio, blocked FROM intake GROUP BY project_id ORDER BY project_id",
+    ),
+}
+
+
+@dataclass
+class SyncStats:
+    scanned: dict[str, int] = field(default_factory=lambda: {"task": 0, "intake": 0})
+    indexed: dict[str, int] = field(default_factory=lambda: {"task": 0, "intake": 0})
+    unchanged: int = 0
+    removed: int = 0
+
+
+def _text(value: object) -> str:
+    return str(value if value is not None else "").strip()
+
+
+def _team(ref: object) -> str:
+    return _text(ref).split("/", 1)[0].strip()
+
+
+def _number(value: object) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _stamp(*paths: Path) -> str:
+    parts = []
+    for path in paths:
+        stat = path.stat()
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    return ";".join(parts)
+
+
+def _digest(*paths: Path) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def connect(db_path: Path, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def _task_rows(conn: sqlite3.Connection, key: str, task: dict, table: RoutingTable) -> None:
+    routing = task.get("routing") if isinstance(task.get("routing"), dict) else {}
+    chain = ApprovalChain.from_task(task, leader_teams(table.route(task).required_teams))
+    conn.execute(
+        "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            key,
+            _text(task.get("id")),
+            _text(task.get("title")),
+            _text(task.get("status")),
+            _text(task.get("updated_at")),
+            snapshot_seq(task),
+            chain.next_gate(),
+        ),
+    )
+    routing_rows = []
+    for kind, field_name in [
+        ("required_team", "required_teams"),
+        ("capability_tag", "capability_tags"),
+        ("incident_fingerprint", "incident_fingerprints"),
+    ]:
+        values = routing.get(field_name)
+        for value in values if isinstance(values, list) else []:
+            if _text(value):
+                routing_rows.append((key, kind, _text(value)))
+    conn.executemany("INSERT INTO routing VALUES (?, ?, ?)", routing_rows)
+    conn.executemany(
+        "INSERT INTO leader_state VALUES (?, ?, ?)",
+        [(key, team, chain.team_status(team)) for team in chain.required_leaders],
+    )
+
+    controls = []
+
+    def collect(source: str, seq: int, entry: dict) -> None:
+        values = entry.get("controlled_by")
+        for value in values if isinstance(values, list) else []:
+            if _text(value):
+                controls.append((key, source, seq, _text(value)))
+
+    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
+    rows = []
+    for seq, entry in enumerate(declarations):
+        if isinstance(entry, dict):
+            rows.append(
+                (key, seq, _text(entry.get("at")), _text(entry.get("team")), _text(entry.get("role")),
+                 _text(entry.get("action")), _text(entry.get("what")))
+            )
+            collect("declaration", seq, entry)
+    conn.executemany("INSERT INTO declarations VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    handoffs = task.get("handoffs") if isinstance(task.get("handoffs"), list) else []
+    rows = []
+    for seq, entry in enumerate(handoffs):
+        if isinstance(entry, dict):
+            rows.append(
+                (key, seq, _text(entry.get("at")), _text(entry.get("from")), _text(entry.get("to")),
+                 _team(entry.get("from")), _team(entry.get("to")), _text(entry.get("memo")))
+            )
+            collect("handoff", seq, entry)
+    conn.executemany("INSERT INTO handoffs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
+    gates = approvals.get("team_leader_gates") if isinstance(approvals.get("team_leader_gates"), list) else []
+    entries = [("team_leader", gate) for gate in gates if isinstance(gate, dict)]
+    for kind in ("qa", "leader"):
+        gate = approvals.get(f"{kind}_gate")
+        if isinstance(gate, dict):
+            entries.append((kind, gate))
+    rows = []
+    for seq, (kind, gate) in enumerate(entries):
+        actor = gate.get("leader_role") if kind == "team_leader" else gate.get("by")
+        rows.append(
+            (key, seq, kind, _text(gate.get("team")) if kind == "team_leader" else _team(gate.get("by")),
+             _text(actor), _text(gate.get("status")), _text(gate.get("at")), _text(gate.get("note")))
+        )
+        collect(f"{kind}_gate", seq, gate)
+    conn.executemany("INSERT INTO gates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.executemany("INSERT INTO controls VALUES (?, ?, ?, ?)", controls)
+
+
+def _intake_row(source: str, origin: str, data: dict) -> tuple:
+    counts = data.get("task_counts") if isinstance(data.get("task_counts"), dict) else {}
+    window = _number(data.get("window_days"))
+    return (
+        source,
+        origin,
+        _text(data.get("project_id")),
+        _text(data.get("captured_at")),
+        int(window) if window is not None else None,
+        *[int(_number(counts.get(status)) or 0) for status in ("todo", "in_progress", "in_review", "blocked", "done")],
+        _number(data.get("lead_time_p50_hours")),
+        _number(data.get("queue_p95_hours")),
+        _number(data.get("rework_rate")),
+        _number(data.get("blocked_ratio")),
+    )
+
+
+def _forget(conn: sqlite3.Connection, kind: str, key: str) -> None:
+    if kind == "task":
+        for table in TASK_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+    else:
+        conn.execute("DELETE FROM intake WHERE source = ?", (key,))
+
+
+def sync(
+    conn: sqlite3.Connection,
+    repo_root: Path,
+    task_dir: Path,
+    cp_root: Path,
+    loader: Callable[[Path], dict],
+) -> SyncStats:
+    """Bring the index up to date with ``task_dir`` and ``cp_root``'s intake snapshots in one transaction."""
+    stats = SyncStats()
+    intake_root = cp_root / "intake"
+    table = RoutingTable.load(cp_root, loader)
+    catalogs = [path for path in (cp_root / RULES_CATALOG, cp_root / SKILLS_CATALOG) if path.exists()]
+
+    def key_of(path: Path) -> str:
+        try:
+            return path.resolve().relative_to(repo_root.resolve()).as_posix()
+        except ValueError:
+            return path.resolve().as_posix()
+
+    known = {row[0]: (row[1], row[2], row[3]) for row in conn.execute("SELECT path, kind, stamp, sha256 FROM sources")}
+    known_ids = dict(conn.execute("SELECT path, task_id FROM tasks").fetchall())
+    seen: set[str] = set()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        logs = event_log_index(task_dir)
+        inputs: list[tuple[str, str, list[Path]]] = []
+        for path in task_files(task_dir):
+            key = key_of(path)
+            log = logs.get(known_ids.get(key, ""))
+            inputs.append(("task", key, [path, log] if log is not None else [path]))
+        if intake_root.is_dir():
+            for path in loose_files(intake_root) + archive_files(intake_root):
+                inputs.append(("intake", key_of(path), [path]))
+
+        for kind, key, paths in inputs:
+            seen.add(key)
+            stats.scanned[kind] += 1
+            # Routing rules decide which leader gates a task needs, so the catalogs count as task inputs.
+            shared = catalogs if kind == "task" else []
+            stamp = _stamp(*paths, *shared)
+            previous = known.get(key)
+            if previous is not None and previous[1] == stamp:
+                stats.unchanged += 1
+                continue
+            # Same bytes means the same task id too, so the log chosen above is still the right one.
+            digest = _digest(*paths, *shared)
+            if previous is not None and previous[2] == digest:
+                conn.execute("UPDATE sources SET stamp = ? WHERE path = ?", (stamp, key))
+                stats.unchanged += 1
+                continue
+            if kind == "task":
+                task = loader(paths[0])
+                log = logs.get(_text(task.get("id")))
+                if paths[1:] != ([log] if log is not None else []):
+                    paths = [paths[0], log] if log is not None else [paths[0]]
+                    stamp, digest = _stamp(*paths, *shared), _digest(*paths, *shared)
+            if previous is not None:
+                _forget(conn, kind, key)
+            if kind == "task":
+                _task_rows(conn, key, materialize(task, log)[0], table)
+            elif paths[0].suffix == ".yaml":
+                conn.execute(f"INSERT INTO intake VALUES ({','.join('?' * 14)})", _intake_row(key, key, loader(paths[0])))
+            else:
+                conn.executemany(
+                    f"INSERT INTO intake VALUES ({','.join('?' * 14)})",
+                    [_intake_row(key, f"{key}#{record['name']}", record["data"]) for record in read_archive(paths[0])],
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", (key, kind, stamp, digest)
+            )
+            stats.indexed[kind] += 1
+
+        for key, (kind, _stamp_value, _hash) in known.items():
+            if key not in seen:
+                _forget(conn, kind, key)
+                conn.execute("DELETE FROM sources WHERE path = ?", (key,))
+                stats.removed += 1
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return stats
+
+
+def run_query(conn: sqlite3.Connection, sql: str, params: dict[str, str]) -> tuple[list[str], list[tuple]]:
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description or []]
+    return columns, cursor.fetchall()
@@ -0,0 +1,79 @@
+"""Where task files live under ``.takt/tasks``: flat, or partitioned by status.
+
+A task directory may keep every ``TASK-*.yaml`` at its top level (the layout
+new repositories start with) or partition them:
+
+    .takt/tasks/
+      active/TASK-00200-....yaml          # every task that is not done
+      done/2026-01/TASK-00100-....yaml    # done tasks, by the month of updated_at
+
+with each task's ``<id>.events.jsonl`` and ``<id>.history.jsonl`` next to it.
+Discovery walks the whole tree (dot-directories skipped), so the flat layout,
+the partitioned one and a half-rotated mix all work. Top-level files count as
+active until ``task rotate`` moves them. Passing ``include_archive=False``
+prunes ``done/`` before it is listed, so routine commands cost the active
+tasks, not every task ever finished.
+"""
+from __future__ import annotations
+
+from fnmatch import fnmatch
+import os
+from pathlib import Path
+import re
+from typing import Iterator
+
+ACTIVE_DIR = "active"
+DONE_DIR = "done"
+TASK_FILE_PATTERN = "TASK-*.yaml"
+MONTH_PATTERN = re.compile(r"^(\d{4}-\d{2})-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+
+
+def walk(task_dir: Path, include_archive: bool = True) -> Iterator[tuple[Path, list[str]]]:
+    """``(directory, file names)`` for ``task_dir`` and every partition below it."""
+    if not task_dir.is_dir():
+        return
+    for current, dirnames, filenames in os.walk(task_dir):
+        directory = Path(current)
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if not name.startswith(".") and (include_archive or directory != task_dir or name != DONE_DIR)
+        )
+        yield directory, filenames
+
+
+def task_files(task_dir: Path, include_archive: bool = True) -> list[Path]:
+    """Every ``TASK-*.yaml`` below ``task_dir``, ordered by file name (so by task number) across partitions."""
+    files = [
+        directory / name
+        for directory, filenames in walk(task_dir, include_archive)
+        for name in filenames
+        if fnmatch(name, TASK_FILE_PATTERN)
+    ]
+    return sorted(files, key=lambda path: (path.name, path.as_posix()))
+
+
+def in_scope(task_dir: Path, path: Path, include_archive: bool = True) -> bool:
+    """Whether ``walk(task_dir, include_archive)`` would visit ``path``'s directory."""
+    try:
+        parts = path.relative_to(task_dir).parts[:-1]
+    except ValueError:
+        return False
+    if any(part.startswith(".") for part in parts):
+        return False
+    return include_archive or parts[:1] != (DONE_DIR,)
+
+
+def has_archive(task_dir: Path) -> bool:
+    return (task_dir / DONE_DIR).is_dir()
+
+
+def partition_of(task: dict, fallback_month: str) -> Path:
+    """Directory (relative to the task directory) ``task`` belongs in.
+
+    Done tasks go to ``done/<yyyy-mm>`` by ``updated_at``; ``fallback_month`` is used when that is not a timestamp.
+    """
+    if str(task.get("status") or "") != "done":
+        return Path(ACTIVE_DIR)
+    match = MONTH_PATTERN.fullmatch(str(task.get("updated_at") or "").strip())
+    return Path(DONE_DIR) / (match.group(1) if match else fallback_month)
@@ -0,0 +1,272 @@
+"""Typed task model: a task mapping normalized once for every check that reads it.
+
+``Task.from_dict`` walks a loaded (and materialized) task once:
+
+- strings are stripped; team, role, status, action, tag and control values are
+  interned, so a corpus keeps one copy of each distinct name
+- ``at`` timestamps are parsed once (``None`` when missing or malformed), the
+  raw text is kept for output
+- entries that are not mappings are dropped, as every check skipped them
+- the derived sets the evidence checks compare -- required and observed teams,
+  ``rule:`` / ``skill:`` evidence, approval-chain events -- are computed up
+  front, with the ``history`` digest left by ``task archive`` folded in
+
+Routing values follow ``routing``'s reading (a single string counts as a
+one-element list, duplicates dropped, order kept), so ``RoutingTable.route``
+accepts a ``Task`` as well as a mapping. The model answers the evidence
+questions only; shape errors (a section that is not a list, a field of the
+wrong type) stay with the schema validator, which reads the raw mapping. The
+``has_*`` flags keep the few shape facts the checks report on.
+
+Classes declare ``__slots__`` by hand rather than ``dataclass(slots=True)``,
+which needs Python 3.10; that is also why no field has a default.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import sys
+
+from agentteams_lib.approvals import COORDINATOR_TEAM, ApprovalEvent, history_events, parse_at
+from agentteams_lib.taskhistory import SECTIONS, archived_controls, archived_count, archived_teams, digest_of
+
+RULE_PREFIX = "rule:"
+SKILL_PREFIX = "skill:"
+
+# Raw name (or list of names) -> normalized form. Teams, roles, statuses, tags and controls come from small
+# catalogs, so these stay at one entry per distinct spelling however many tasks are loaded.
+_NAMES: dict[str, str] = {}
+_NAME_LISTS: dict[tuple, tuple[str, ...]] = {}
+
+
+def _text(value: object) -> str:
+    return str(value or "").strip()
+
+
+def _name(value: object) -> str:
+    """Stripped, interned ``value``; a name seen before costs one dict lookup."""
+    if value.__class__ is not str:
+        return sys.intern(_text(value))
+    name = _NAMES.get(value)
+    if name is None:
+        name = _NAMES[value] = sys.intern(value.strip())
+    return name
+
+
+def _names(values: object) -> tuple[str, ...]:
+    """Distinct non-empty names of a list (or single string), in order; equal lists share one tuple."""
+    if isinstance(values, str):
+        values = [values]
+    if not isinstance(values, list):
+        return ()
+    try:
+        "".join(values)  # plain strings only: [1] and [True] are equal keys but normalize differently
+        key: tuple | None = tuple(values)
+    except TypeError:
+        key = None
+    names = _NAME_LISTS.get(key) if key is not None else None
+    if names is None:
+        unique = dict.fromkeys(map(_name, values))
+        unique.pop("", None)
+        names = tuple(unique)
+        if key is not None:
+            _NAME_LISTS[key] = names
+    return names
+
+
+def _entries(values: object) -> list[dict]:
+    return [entry for entry in values if isinstance(entry, dict)] if isinstance(values, list) else []
+
+
+def team_of(ref: object) -> str:
+    """Team part of a ``team/role`` reference."""
+    return sys.intern(_text(ref).split("/", 1)[0].strip())
+
+
+@dataclass
+class Routing:
+    __slots__ = ("required_teams", "capability_tags", "incident_fingerprints")
+    required_teams: tuple[str, ...]
+    capability_tags: tuple[str, ...]
+    incident_fingerprints: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, routing: object) -> "Routing":
+        routing = routing if isinstance(routing, dict) else {}
+        return cls(
+            _names(routing.get("required_teams")),
+            _names(routing.get("capability_tags")),
+            _names(routing.get("incident_fingerprints")),
+        )
+
+
+@dataclass
+class Declaration:
+    __slots__ = ("at", "at_raw", "team", "role", "action", "what", "controls")
+    at: datetime | None
+    at_raw: str
+    team: str
+    role: str
+    action: str
+    what: str
+    controls: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "Declaration":
+        at_raw = _text(entry.get("at"))
+        return cls(
+            parse_at(at_raw),
+            at_raw,
+            _name(entry.get("team")),
+            _name(entry.get("role")),
+            _name(entry.get("action")),
+            _text(entry.get("what")),
+            _names(entry.get("controlled_by")),
+        )
+
+
+@dataclass
+class Handoff:
+    __slots__ = ("at", "at_raw", "src", "dst", "memo")
+    at: datetime | None
+    at_raw: str
+    src: str
+    dst: str
+    memo: str
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "Handoff":
+        at_raw = _text(entry.get("at"))
+        return cls(parse_at(at_raw), at_raw, _name(entry.get("from")), _name(entry.get("to")), _text(entry.get("memo")))
+
+
+@dataclass
+class Gate:
+    """A team leader gate (``team`` / ``actor`` = leader_role) or the QA / leader gate (``actor`` = by)."""
+
+    __slots__ = ("kind", "at", "at_raw", "status", "team", "actor", "note", "controls")
+    kind: str  # team_leader | qa | leader
+    at: datetime | None
+    at_raw: str
+    status: str
+    team: str
+    actor: str
+    note: str
+    controls: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, kind: str, gate: dict) -> "Gate":
+        at_raw = _text(gate.get("at"))
+        return cls(
+            kind,
+            parse_at(at_raw),
+            at_raw,
+            _name(gate.get("status")),
+            _name(gate.get("team")) if kind == "team_leader" else "",
+            _name(gate.get("leader_role") if kind == "team_leader" else gate.get("by")),
+            _text(gate.get("note")),
+            _names(gate.get("controlled_by")),
+        )
+
+    def event(self) -> ApprovalEvent:
+        return ApprovalEvent(self.kind, self.at, self.status, self.team)
+
+
+@dataclass
+class Task:
+    __slots__ = (
+        "id",
+        "status",
+        "updated_at",
+        "routing",
+        "declarations",
+        "handoffs",
+        "team_leader_gates",
+        "qa_gate",
+        "leader_gate",
+        "has_approvals",
+        "has_gate_list",
+        "history",
+        "archived",
+        "declaration_count",
+        "handoff_count",
+        "required_teams",
+        "observed_teams",
+        "rules",
+        "skills",
+        "approval_events",
+    )
+    id: str
+    status: str
+    updated_at: str
+    routing: Routing
+    declarations: tuple[Declaration, ...]
+    handoffs: tuple[Handoff, ...]
+    team_leader_gates: tuple[Gate, ...]
+    qa_gate: Gate | None
+    leader_gate: Gate | None
+    has_approvals: bool  # approvals is a map
+    has_gate_list: bool  # approvals.team_leader_gates is a list
+    history: dict  # digest left by task archive, {} when nothing is archived
+    archived: dict[str, int]  # archived entries per section
+    declaration_count: int  # entries in the task (mappings or not) plus archived ones
+    handoff_count: int
+    required_teams: frozenset[str]  # routing.required_teams plus coordinator
+    observed_teams: frozenset[str]  # teams of declarations and handoffs, archived ones included
+    rules: frozenset[str]  # rule: evidence of declarations and gates, archived ones included
+    skills: frozenset[str]
+    approval_events: tuple[ApprovalEvent, ...]  # approvals.task_events order
+
+    @classmethod
+    def from_dict(cls, task: dict) -> "Task":
+        approvals = task.get("approvals")
+        approvals_map = approvals if isinstance(approvals, dict) else {}
+        gate_list = approvals_map.get("team_leader_gates")
+        single = {
+            kind: Gate.from_dict(kind, approvals_map[key]) if isinstance(approvals_map.get(key), dict) else None
+            for kind, key in (("qa", "qa_gate"), ("leader", "leader_gate"))
+        }
+        declarations = tuple(map(Declaration.from_dict, _entries(task.get("declarations"))))
+        handoffs = tuple(map(Handoff.from_dict, _entries(task.get("handoffs"))))
+        team_leader_gates = tuple(Gate.from_dict("team_leader", gate) for gate in _entries(gate_list))
+        gates = team_leader_gates + tuple(gate for gate in single.values() if gate is not None)
+        routing = Routing.from_dict(task.get("routing"))
+        archived = {section: archived_count(task, section) for section in SECTIONS}
+
+        refs = {*archived_teams(task), *(entry.team for entry in declarations)}
+        refs.update(ref for entry in handoffs for ref in (entry.src, entry.dst))
+        observed = {team_of(ref) for ref in refs}
+        observed.discard("")
+        controls = set(_names(archived_controls(task))).union(*(item.controls for item in (*declarations, *gates)))
+        rules = frozenset(sys.intern(c[len(RULE_PREFIX):]) for c in controls if c.startswith(RULE_PREFIX))
+        skills = frozenset(sys.intern(c[len(SKILL_PREFIX):]) for c in controls if c.startswith(SKILL_PREFIX))
+
+        events = history_events(task.get("history"))
+        events.extend(gate.event() for gate in gates)
+        events.extend(ApprovalEvent("declaration", entry.at, action=entry.action) for entry in declarations)
+
+        raw_declarations = task.get("declarations")
+        raw_handoffs = task.get("handoffs")
+        return cls(
+            id=_text(task.get("id")),
+            status=_name(task.get("status")),
+            updated_at=_text(task.get("updated_at")),
+            routing=routing,
+            declarations=declarations,
+            handoffs=handoffs,
+            team_leader_gates=team_leader_gates,
+            qa_gate=single["qa"],
+            leader_gate=single["leader"],
+            has_approvals=isinstance(approvals, dict),
+            has_gate_list=isinstance(gate_list, list),
+            history=digest_of(task),
+            archived=archived,
+            declaration_count=(len(raw_declarations) if isinstance(raw_declarations, list) else 0)
+            + archived["declarations"],
+            handoff_count=(len(raw_handoffs) if isinstance(raw_handoffs, list) else 0) + archived["handoffs"],
+            required_teams=frozenset(routing.required_teams) | {COORDINATOR_TEAM},
+            observed_teams=frozenset(observed),
+            rules=rules,
+            skills=skills,
+            approval_events=tuple(events),
+        )
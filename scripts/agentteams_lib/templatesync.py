@@ -0,0 +1,241 @@
+"""Manifest-driven template sync used by ``agentteams init``.
+
+The template side keeps a content-hash manifest of every bootstrap file
+(``.agentteams/template-manifest.json`` under the template root, refreshed by
+size/mtime so unchanged files are not rehashed). The target records what it
+last synced in ``.agentteams/sync-state.json``. A sync only writes files whose
+template hash differs from what the target last received, leaves files the
+target edited since then alone (reported as locally modified), and never
+deletes anything.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import errno
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Iterator
+
+from agentteams_lib.fsio import write_atomic
+
+BOOTSTRAP_PATHS = [
+    "at",
+    "at.cmd",
+    "at.ps1",
+    "agentteams",
+    "agentteams.cmd",
+    "agentteams.ps1",
+    "AGENTS.md",
+    "README.md",
+    ".gitleaks.toml",
+    ".github",
+    ".takt",
+    "docs",
+    "shared",
+    "scripts",
+]
+SKIP_NAMES = {"__pycache__", ".locks"}
+SKIP_TAKT_CHILDREN = {"logs", "reports", "cache"}  # per-checkout output, e.g. the task index
+SKIP_SUFFIXES = (".pyc", ".lock")  # bytecode and advisory lock files such as .takt/tasks/.snapshot.lock
+MANIFEST_VERSION = 1
+TEMPLATE_MANIFEST = Path(".agentteams") / "template-manifest.json"
+SYNC_STATE = Path(".agentteams") / "sync-state.json"
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+FICLONE = 0x40049409  # linux/fs.h
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_template_files(template_root: Path) -> Iterator[tuple[str, Path]]:
+    for entry in BOOTSTRAP_PATHS:
+        source = template_root / entry
+        if source.is_file():
+            yield entry, source
+            continue
+        if not source.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(source):
+            current = Path(dirpath)
+            dirnames[:] = sorted(
+                name
+                for name in dirnames
+                if name not in SKIP_NAMES and not (current.name == ".takt" and name in SKIP_TAKT_CHILDREN)
+            )
+            for name in sorted(filenames):
+                if name.endswith(SKIP_SUFFIXES):
+                    continue
+                path = current / name
+                yield path.relative_to(template_root).as_posix(), path
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def build_manifest(template_root: Path, cache: bool = True) -> dict:
+    """Return ``{"template_version", "files": {rel: {sha256, size, mode}}}`` for the template."""
+    cache_path = template_root / TEMPLATE_MANIFEST
+    previous = _load_json(cache_path).get("files", {}) if cache else {}
+    files: dict[str, dict] = {}
+    for rel, path in iter_template_files(template_root):
+        stat = path.stat()
+        cached = previous.get(rel) if isinstance(previous, dict) else None
+        if isinstance(cached, dict) and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+            sha = str(cached.get("sha256") or "")
+        else:
+            sha = file_sha256(path)
+        files[rel] = {
+            "sha256": sha,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "mode": stat.st_mode & 0o777,
+        }
+    version = hashlib.sha256(
+        "\n".join(f"{rel}\0{meta['sha256']}\0{meta['mode']:o}" for rel, meta in sorted(files.items())).encode("utf-8")
+    ).hexdigest()
+    manifest = {"version": MANIFEST_VERSION, "template_version": version, "files": files}
+    if cache:
+        try:
+            write_atomic(cache_path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        except OSError:
+            pass  # read-only template checkout; the manifest is still usable in memory
+    return manifest
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        return False
+    try:
+        with source.open("rb") as src, destination.open("wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError as exc:
+        if destination.exists():
+            destination.unlink()
+        if exc.errno in {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS, errno.EPERM}:
+            return False
+        raise
+
+
+def place_file(source: Path, destination: Path, mode: int, link_mode: str) -> str:
+    """Materialize ``source`` at ``destination``; returns the method used."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_name(f".{destination.name}.agentteams-sync.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    method = "copy"
+    try:
+        if link_mode == "hardlink":
+            try:
+                os.link(source, tmp)
+                method = "hardlink"
+            except OSError:
+                method = "copy"
+        elif link_mode in {"auto", "reflink"} and _reflink(source, tmp):
+            method = "reflink"
+        if method == "copy":
+            shutil.copyfile(source, tmp)
+        if method != "hardlink":
+            os.chmod(tmp, mode)
+        os.replace(tmp, destination)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return method
+
+
+@dataclass
+class SyncResult:
+    template_version: str = ""
+    previous_version: str = ""
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+    local_modified: list[str] = field(default_factory=list)
+    overwritten: list[str] = field(default_factory=list)
+    removed_upstream: list[str] = field(default_factory=list)
+    methods: dict[str, int] = field(default_factory=dict)
+
+
+def sync_template(
+    template_root: Path,
+    target_root: Path,
+    force: bool = False,
+    link_mode: str = "auto",
+    dry_run: bool = False,
+) -> SyncResult:
+    manifest = build_manifest(template_root, cache=not dry_run)
+    state_path = target_root / SYNC_STATE
+    state = _load_json(state_path)
+    recorded: dict = state.get("files") if isinstance(state.get("files"), dict) else {}
+    result = SyncResult(template_version=manifest["template_version"], previous_version=str(state.get("template_version") or ""))
+    new_records: dict[str, dict] = {}
+
+    for rel, meta in manifest["files"].items():
+        source = template_root / rel
+        destination = target_root / rel
+        record = recorded.get(rel) if isinstance(recorded.get(rel), dict) else None
+
+        if not destination.exists():
+            action = "add"
+        else:
+            stat = destination.stat()
+            if record and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+                current = str(record.get("sha256") or "")
+            else:
+                current = file_sha256(destination)
+            if current == meta["sha256"]:
+                result.unchanged.append(rel)
+                new_records[rel] = {"sha256": current, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                continue
+            if record is None:
+                action = "overwrite" if force else "keep"
+            elif current != record.get("sha256"):
+                action = "overwrite" if force else "local"
+            else:
+                action = "update"
+
+        if action == "keep":
+            result.kept.append(rel)
+            continue
+        if action == "local":
+            result.local_modified.append(rel)
+            new_records[rel] = record  # keep the last synced hash so the edit stays detectable
+            continue
+
+        {"add": result.added, "update": result.updated, "overwrite": result.overwritten}[action].append(rel)
+        if dry_run:
+            continue
+        method = place_file(source, destination, int(meta["mode"]), link_mode)
+        result.methods[method] = result.methods.get(method, 0) + 1
+        stat = destination.stat()
+        new_records[rel] = {"sha256": meta["sha256"], "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    result.removed_upstream = sorted(rel for rel in recorded if rel not in manifest["files"])
+
+    if not dry_run:
+        new_state = {
+            "version": MANIFEST_VERSION,
+            "template_version": manifest["template_version"],
+            "synced_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "files": dict(sorted(new_records.items())),
+        }
+        write_atomic(state_path, json.dumps(new_state, indent=2) + "\n")
+    return result
@@ -0,0 +1,109 @@
+"""Streaming multi-token scanner for repository text checks.
+
+Files are sniffed for binary content (a NUL byte in the first block, the same
+heuristic git uses), small files are read in one call and large files are
+memory-mapped, and every token is matched in a single pass per file. Scans are
+spread across a thread pool so file I/O overlaps.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import mmap
+import os
+from pathlib import Path
+import re
+from typing import Iterable, Iterator
+
+SNIFF_BYTES = 8192
+MMAP_THRESHOLD = 1 << 20
+SKIP_DIR_NAMES = {".git", "__pycache__"}
+
+
+def is_binary(sample: bytes) -> bool:
+    return b"\x00" in sample[:SNIFF_BYTES]
+
+
+class TokenMatcher:
+    """Find which of a fixed set of literal tokens occur in a byte buffer.
+
+    All tokens are compiled into one alternation probed at every offset, so a
+    buffer is walked once no matter how many tokens are registered. Tokens that
+    are substrings of a matched token are credited with it, which keeps
+    overlapping tokens (``agentteams audit`` / ``agentteams audit --scope
+    fleet``) from hiding each other.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self.tokens: list[str] = sorted({token for token in tokens if token}, key=lambda t: (-len(t), t))
+        self._encoded = {token: token.encode("utf-8") for token in self.tokens}
+        self._implied: dict[bytes, set[str]] = {}
+        for token, raw in self._encoded.items():
+            self._implied[raw] = {other for other, other_raw in self._encoded.items() if other_raw in raw}
+        alternation = b"|".join(re.escape(self._encoded[token]) for token in self.tokens)
+        self._pattern = re.compile(b"(?=(" + alternation + b"))") if self.tokens else None
+
+    def find(self, data: bytes | mmap.mmap) -> set[str]:
+        found: set[str] = set()
+        if self._pattern is None:
+            return found
+        wanted = len(self.tokens)
+        for match in self._pattern.finditer(data):
+            found |= self._implied[match.group(1)]
+            if len(found) == wanted:
+                break
+        return found
+
+
+@dataclass
+class FileScan:
+    path: Path
+    binary: bool = False
+    found: set[str] = field(default_factory=set)
+    error: str = ""
+
+
+def scan_file(path: Path, matcher: TokenMatcher) -> FileScan:
+    result = FileScan(path=path)
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(SNIFF_BYTES)
+            if is_binary(head):
+                result.binary = True
+                return result
+            size = os.fstat(handle.fileno()).st_size
+            if size <= len(head):
+                result.found = matcher.find(head)
+            elif size < MMAP_THRESHOLD:
+                result.found = matcher.find(head + handle.read())
+            else:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    result.found = matcher.find(mapped)
+    except OSError as exc:
+        result.error = str(exc)
+    return result
+
+
+def iter_files(paths: Iterable[Path]) -> Iterator[Path]:
+    for root in paths:
+        if root.is_file():
+            yield root
+            continue
+        if not root.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIR_NAMES)
+            for name in sorted(filenames):
+                yield Path(dirpath) / name
+
+
+def default_workers() -> int:
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def scan_files(files: Iterable[Path], matcher: TokenMatcher, workers: int = 0) -> list[FileScan]:
+    items = list(files)
+    if workers == 1 or len(items) < 2:
+        return [scan_file(path, matcher) for path in items]
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+        return list(pool.map(lambda path: scan_file(path, matcher), items))
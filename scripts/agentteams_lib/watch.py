@@ -0,0 +1,268 @@
+"""File watching for the validators' ``--watch`` mode.
+
+``Watcher`` yields debounced batches of changed file paths under a set of
+roots. On Linux it uses inotify (through ``ctypes``, no extra dependency) on
+every directory below the roots; elsewhere, or when inotify is unavailable or
+``poll`` is requested, it compares ``(mtime_ns, size)`` snapshots of the roots
+at a fixed interval. A batch closes once no further change arrived for the
+debounce window, so an editor's burst of saves (or a temp-file-and-rename)
+is revalidated once. Paths in a batch may no longer exist.
+
+``ErrorSet`` keeps the current ``ERROR``/``WARN`` lines per source and
+``watch_loop`` prints only the lines a batch added, ``OK [WATCH_RESOLVED]``
+for the ones it cleared and one ``INFO [WATCH_UPDATE]`` summary; a batch that
+changes no line prints nothing.
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import re
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterator
+
+from agentteams_lib.metrics import RunMetrics
+
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 0.25
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+_LEVEL_PREFIX = re.compile(r"^(?:ERROR|WARN) \[[A-Z0-9_]+\] ")
+
+
+def _directories(roots: list[Path]) -> Iterator[Path]:
+    for root in roots:
+        if not root.is_dir():
+            continue
+        yield root
+        for current, dirnames, _ in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            for name in dirnames:
+                yield Path(current) / name
+
+
+def scan(roots: list[Path]) -> dict[Path, tuple[int, int]]:
+    """``(mtime_ns, size)`` of every regular file below ``roots`` (dot-directories skipped)."""
+    snapshot: dict[Path, tuple[int, int]] = {}
+    for directory in _directories(roots):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+    return snapshot
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux-only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+
+    def add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def read(self) -> tuple[set[Path], bool]:
+        """Changed files and whether the kernel queue overflowed."""
+        changed: set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / name
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and not name.startswith("."):
+                        for sub in _directories([path]):
+                            self.add(sub)
+                        changed.update(scan([path]))
+                    continue
+                changed.add(path)
+        return changed, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Watcher:
+    def __init__(
+        self,
+        roots: list[Path],
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.roots = [root.resolve() for root in roots]
+        self.debounce = max(debounce, 0.0)
+        self.poll_interval = max(poll_interval, 0.01)
+        self._inotify: _Inotify | None = None
+        self._snapshot: dict[Path, tuple[int, int]] = {}
+        if not poll:
+            try:
+                self._inotify = _Inotify()
+                for directory in _directories(self.roots):
+                    self._inotify.add(directory)
+            except OSError:
+                self.close()
+        if self._inotify is None:
+            self._snapshot = scan(self.roots)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "poll"
+
+    def batches(self) -> Iterator[set[Path]]:
+        """Block until files change; yield each debounced batch of changed paths."""
+        while True:
+            batch = self._next_batch()
+            if batch:
+                yield batch
+
+    def _next_batch(self) -> set[Path]:
+        if self._inotify is None:
+            return self._poll_batch()
+        fd = self._inotify.fd
+        select.select([fd], [], [])
+        batch: set[Path] = set()
+        while True:
+            changed, overflow = self._inotify.read()
+            if overflow:
+                changed.update(scan(self.roots))
+            batch.update(changed)
+            ready, _, _ = select.select([fd], [], [], self.debounce)
+            if not ready:
+                return batch
+
+    def _poll_batch(self) -> set[Path]:
+        time.sleep(self.poll_interval)
+        batch: set[Path] = set()
+        while True:
+            current = scan(self.roots)
+            changed = {
+                path for path in current.keys() | self._snapshot.keys() if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if not changed:
+                return batch
+            batch.update(changed)
+            time.sleep(max(self.debounce, 0.01))
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+class ErrorSet:
+    """Current ``ERROR [...]`` / ``WARN [...]`` output lines per source (a file path, ``catalogs``, ...)."""
+
+    def __init__(self) -> None:
+        self._lines: dict[str, list[str]] = {}
+
+    def update(self, source: str, lines: list[str]) -> tuple[list[str], list[str]]:
+        """Replace ``source``'s lines; return ``(added, resolved)``."""
+        before = self._lines.get(source, [])
+        if lines:
+            self._lines[source] = list(lines)
+        else:
+            self._lines.pop(source, None)
+        previous, current = set(before), set(lines)
+        return [line for line in lines if line not in previous], [line for line in before if line not in current]
+
+    @property
+    def errors(self) -> int:
+        return sum(line.startswith("ERROR ") for lines in self._lines.values() for line in lines)
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--watch", action="store_true", help="keep running and revalidate files as they change")
+    parser.add_argument("--poll", action="store_true", help="with --watch, poll for changes instead of using inotify")
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=int(DEFAULT_DEBOUNCE * 1000),
+        help="with --watch, quiet period that closes a burst of saves",
+    )
+
+
+def watch_loop(
+    watcher: Watcher,
+    findings: ErrorSet,
+    revalidate: Callable[[set[Path]], dict[str, list[str]]],
+    metrics: RunMetrics,
+) -> int:
+    """Run ``revalidate`` (``{source: output lines}`` for what it rechecked) per batch until interrupted."""
+    try:
+        for batch in watcher.batches():
+            started = time.perf_counter()
+            updates = revalidate(batch)
+            metrics.inc("watch_batches")
+            metrics.inc("watch_revalidated", len(updates))
+            if report(findings, updates):
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(
+                    f"INFO [WATCH_UPDATE] changed={len(batch)} revalidated={len(updates)} "
+                    f"errors={findings.errors} elapsed_ms={elapsed_ms:.1f}",
+                    flush=True,
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 1 if findings.errors else 0
+
+
+def report(findings: ErrorSet, updates: dict[str, list[str]]) -> bool:
+    """Apply ``updates`` and print new lines and ``OK [WATCH_RESOLVED]`` for gone ones; ``True`` when any changed."""
+    changed = False
+    for source, lines in updates.items():
+        added, resolved = findings.update(source, lines)
+        for line in resolved:
+            print(f"OK [WATCH_RESOLVED] {_LEVEL_PREFIX.sub('', line, count=1)}")
+        for line in added:
+            print(line)
+        changed = changed or bool(added or resolved)
+    return changed
@@ -0,0 +1,196 @@
+"""Fast paths for machine-written control-plane documents.
+
+Generated files (signals, detection outputs, refresh-queue items) can be
+emitted as JSON, which is valid YAML 1.2, so every YAML consumer still reads
+them while our own readers take the much faster ``json`` path. Readers sniff
+the first non-blank character: ``{``/``[`` goes to ``json.loads``, anything
+else (or JSON that fails to parse) goes to the libyaml ``CSafeLoader`` when
+PyYAML was built with it, then to the pure-Python ``SafeLoader``.
+
+Human-edited files (catalogs, registry, tasks) keep being written as YAML;
+``rewrite`` updates such a file in place of a full dump, so unchanged sections,
+comments and CRLF line endings survive and a diff shows only what changed.
+Set ``AGENTTEAMS_OUTPUT_FORMAT=json`` (or pass ``--output-format json``) on a
+hub to switch the generated files over.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+try:
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover - callers report PYTHON_DEP_MISSING themselves
+    yaml = None
+
+OUTPUT_FORMATS = ("yaml", "json")
+OUTPUT_FORMAT_ENV = "AGENTTEAMS_OUTPUT_FORMAT"
+
+
+def default_output_format() -> str:
+    value = os.environ.get(OUTPUT_FORMAT_ENV, "").strip().lower()
+    return value if value in OUTPUT_FORMATS else "yaml"
+
+
+def add_output_format_argument(parser) -> None:
+    parser.add_argument(
+        "--output-format",
+        choices=list(OUTPUT_FORMATS),
+        default=default_output_format(),
+        help=f"format for generated files: yaml, or json (YAML 1.2 compatible, faster; default: ${OUTPUT_FORMAT_ENV} or yaml)",
+    )
+
+
+def _safe_loader():
+    return getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+
+
+def _safe_dumper():
+    return getattr(yaml, "CSafeDumper", None) or yaml.SafeDumper
+
+
+def text_format(text: str) -> str:
+    """``json`` when ``text`` looks like a JSON document, else ``yaml`` (used to rewrite files in kind)."""
+    return "json" if text.lstrip("\ufeff \t\r\n")[:1] in ("{", "[") else "yaml"
+
+
+def loads(text: str) -> object:
+    stripped = text.lstrip("\ufeff \t\r\n")
+    if stripped[:1] in ("{", "["):
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass  # flow-style YAML that is not strict JSON
+    if yaml is None:
+        raise RuntimeError("PyYAML is required to read non-JSON YAML documents")
+    return yaml.load(text, Loader=_safe_loader())
+
+
+def load_path(path: Path) -> dict:
+    data = loads(path.read_text(encoding="utf-8"))
+    return data if isinstance(data, dict) else {}
+
+
+def read_document(path: Path) -> tuple[str, dict]:
+    """The file's text with its line endings as stored (the input ``rewrite`` needs), and the map loaded from it."""
+    # Bytes, not read_text(): universal newlines would hide the CRLF endings rewrite() keeps.
+    text = path.read_bytes().decode("utf-8")
+    data = loads(text)
+    return text, data if isinstance(data, dict) else {}
+
+
+def dumps(data: object, output_format: str = "yaml") -> str:
+    if output_format == "json":
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str) + "\n"
+    if yaml is None:
+        raise RuntimeError("PyYAML is required to write YAML documents")
+    return yaml.dump(data, Dumper=_safe_dumper(), allow_unicode=True, sort_keys=False)
+
+
+def newline_of(text: str) -> str:
+    """The line ending most of ``text`` uses."""
+    return "\r\n" if text.count("\r\n") * 2 > text.count("\n") else "\n"
+
+
+def _line_start(text: str, index: int) -> int:
+    return text.rfind("\n", 0, index) + 1
+
+
+def _render(data: object, indent: str, newline: str) -> str:
+    return "".join(indent + line + newline for line in dumps(data).splitlines())
+
+
+def _splice_sequence(text: str, node, start: int, end: int, old: list, new: list, newline: str) -> str | None:
+    """``text[start:end]`` (a block sequence) with ``new``'s items, copying items equal to ``old`` ones verbatim."""
+    starts = []
+    for item in node.value:
+        line_start = _line_start(text, item.start_mark.index)
+        if text[line_start : item.start_mark.index].strip() != "-":
+            return None
+        starts.append(line_start)
+    if not starts or len(starts) != len(old):
+        return None
+    spans = [(first, starts[pos + 1] if pos + 1 < len(starts) else end) for pos, first in enumerate(starts)]
+    indent = " " * (text.index("-", starts[0]) - starts[0])
+    parts = [text[start : starts[0]]]
+    cursor = 0
+    for item in new:
+        # Greedy in-order match: appended, trimmed and edited entries leave the others untouched.
+        match = next((pos for pos in range(cursor, len(old)) if old[pos] == item), None)
+        if parts[-1] and not parts[-1].endswith("\n"):
+            parts.append(newline)
+        if match is None:
+            parts.append(_render([item], indent, newline))
+            continue
+        parts.append(text[spans[match][0] : spans[match][1]])
+        cursor = match + 1
+    return "".join(parts)
+
+
+def _splice_mapping(text: str, node, start: int, end: int, old: dict, new: dict, newline: str) -> str | None:
+    """``text[start:end]`` (a block mapping) with ``new``'s values; entries equal to ``old`` are copied verbatim."""
+    if yaml is None or not isinstance(node, yaml.MappingNode) or node.flow_style:
+        return None
+    keys: list[str] = []
+    starts: list[int] = []
+    for key, _ in node.value:
+        line_start = _line_start(text, key.start_mark.index)
+        if not isinstance(key, yaml.ScalarNode) or text[line_start : key.start_mark.index].strip(" "):
+            return None
+        keys.append(key.value)
+        starts.append(line_start)
+    if not starts or keys != list(old):
+        return None
+    indent = text[starts[0] : node.value[0][0].start_mark.index]
+    ends = starts[1:] + [end]
+    spans = {key: (first, last) for key, first, last in zip(keys, starts, ends)}
+    values = {key: value for key, (_, value) in zip(keys, node.value)}
+    parts = [text[start : starts[0]]]
+    for key, value in new.items():
+        if parts[-1] and not parts[-1].endswith("\n"):
+            parts.append(newline)
+        if key not in spans:
+            parts.append(_render({key: value}, indent, newline))
+            continue
+        span_start, span_end = spans[key]
+        if old[key] == value:
+            parts.append(text[span_start:span_end])
+            continue
+        child = values[key]
+        body = _line_start(text, child.start_mark.index)
+        spliced = None
+        if body > span_start and not getattr(child, "flow_style", True):
+            if isinstance(old[key], dict) and isinstance(value, dict):
+                spliced = _splice_mapping(text, child, body, span_end, old[key], value, newline)
+            elif isinstance(old[key], list) and isinstance(value, list) and isinstance(child, yaml.SequenceNode):
+                spliced = _splice_sequence(text, child, body, span_end, old[key], value, newline)
+        if spliced is None:
+            parts.append(_render({key: value}, indent, newline))
+        else:
+            parts.append(text[span_start:body] + spliced)
+    return "".join(parts)
+
+
+def rewrite(text: str, old: dict, new: dict) -> str:
+    """YAML text for ``new``, written over ``text`` (the document ``old`` was loaded from).
+
+    Top-level keys whose value did not change are copied verbatim; changed
+    block mappings are updated key by key and block sequences item by item,
+    so an appended or removed entry touches only its own lines. The file's
+    line endings are kept. Anything the splice cannot handle (JSON, flow
+    style, anchors, a result that does not load back to ``new``) falls back
+    to a full dump in the file's format and line endings.
+    """
+    newline = newline_of(text)
+    output_format = text_format(text)
+    if output_format == "yaml" and yaml is not None:
+        try:
+            root = yaml.compose(text, Loader=_safe_loader())
+            spliced = _splice_mapping(text, root, 0, len(text), old, new, newline) if root is not None else None
+            if spliced is not None and loads(spliced) == new:
+                return spliced
+        except (yaml.YAMLError, ValueError):
+            pass
+    rendered = dumps(new, output_format)
+    return rendered.replace("\n", newline) if newline != "\n" else rendered
@@ -12,6 +12,12 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.fsio import LockTimeout, control_plane_lock, write_atomic
+from agentteams_lib.intake import iter_snapshots
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.signals import LEGACY_NAME, write_signals
+from agentteams_lib.yamlio import add_output_format_argument, dumps, load_path
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Aggregate fleet intake metadata into control-plane signals")
@@ -19,12 +25,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--window-days", type=int, default=14, help="window days for overload aggregation")
     parser.add_argument("--incident-window-days", type=int, default=7, help="window days for incident aggregation")
     parser.add_argument("--write-history", action="store_true", help="write signals history snapshot")
+    parser.add_argument(
+        "--write-latest",
+        action="store_true",
+        help="also write the monolithic signals/latest.yaml for consumers that have not moved to the manifest",
+    )
+    add_output_format_argument(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
 def parse_utc(value: object) -> datetime | None:
@@ -71,28 +83,28 @@ def threshold_hits(item: dict) -> list[str]:
     return hits
 
 
-def main() -> int:
-    args = parse_args()
-    cp_root = Path(args.control_plane).resolve()
+def aggregate(args: argparse.Namespace, metrics: RunMetrics, cp_root: Path) -> int:
     intake_root = cp_root / "intake"
     signals_root = cp_root / "signals"
-    latest_file = signals_root / "latest.yaml"
     history_root = signals_root / "history"
 
-    if not intake_root.exists():
-        print(f"ERROR [FLEET_AGGREGATE_INTAKE_MISSING] {intake_root.as_posix()}")
-        return 1
-
     now = datetime.now(timezone.utc)
     overload_cutoff = now - timedelta(days=max(args.window_days, 1))
     incident_cutoff = now - timedelta(days=max(args.incident_window_days, 1))
 
     latest_by_project: dict[str, dict] = {}
     fingerprint_projects: dict[str, set[str]] = {}
-    intake_files = sorted(intake_root.glob("*/*.yaml"))
+    snapshot_count = 0
+
+    def parse(path: Path) -> dict:
+        with metrics.phase("parse"):
+            return load_yaml(path)
 
-    for intake_file in intake_files:
-        data = load_yaml(intake_file)
+    # Archived months are opened only when a window reaches back into them.
+    for snapshot in iter_snapshots(intake_root, parse, since=min(overload_cutoff, incident_cutoff)):
+        data = snapshot.data
+        snapshot_count += 1
+        metrics.inc("files_processed")
         project_id = str(data.get("project_id") or "").strip()
         captured_at = parse_utc(data.get("captured_at"))
         if not project_id or captured_at is None:
@@ -169,21 +181,55 @@ def main() -> int:
         "notes": ["event-driven refresh: no periodic schedule required"],
     }
 
-    signals_root.mkdir(parents=True, exist_ok=True)
-    latest_file.write_text(yaml.safe_dump(signals, allow_unicode=True, sort_keys=False), encoding="utf-8")
-
-    if args.write_history:
-        history_root.mkdir(parents=True, exist_ok=True)
-        stamp = now.strftime("%Y%m%dT%H%M%SZ")
-        history_file = history_root / f"{stamp}.yaml"
-        history_file.write_text(yaml.safe_dump(signals, allow_unicode=True, sort_keys=False), encoding="utf-8")
-
+    def dump_yaml(data: dict) -> str:
+        return dumps(data, args.output_format)
+
+    with metrics.phase("write"):
+        signals_root.mkdir(parents=True, exist_ok=True)
+        shards = write_signals(signals_root, signals, dump_yaml, load_yaml)
+
+        if args.write_latest:
+            write_atomic(signals_root / LEGACY_NAME, dump_yaml(signals))
+        if args.write_history:
+            history_root.mkdir(parents=True, exist_ok=True)
+            stamp = now.strftime("%Y%m%dT%H%M%SZ")
+            history_file = history_root / f"{stamp}.yaml"
+            write_atomic(history_file, dump_yaml(signals))
+
+    metrics.gauge("intake_files", snapshot_count)
+    metrics.gauge("projects", len(projects))
+    metrics.gauge("fingerprints", len(fingerprint_project_counts))
+    metrics.gauge("overload_candidates", len(overload_candidates))
+    for key, value in shards.items():
+        metrics.gauge(f"shards_{key}", value)
     print(
         "OK [FLEET_SIGNALS_AGGREGATED] "
-        f"projects={len(projects)} fingerprints={len(fingerprint_project_counts)} overload_candidates={len(overload_candidates)}"
+        f"projects={len(projects)} fingerprints={len(fingerprint_project_counts)} overload_candidates={len(overload_candidates)} "
+        f"shards_written={shards['written']} shards_unchanged={shards['unchanged']}"
     )
     return 0
 
 
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    cp_root = Path(args.control_plane).resolve()
+    intake_root = cp_root / "intake"
+    if not intake_root.exists():
+        print(f"ERROR [FLEET_AGGREGATE_INTAKE_MISSING] {intake_root.as_posix()}")
+        return 1
+
+    # Serialize whole runs so a later run never overwrites signals with an older intake view;
+    # the shared intake lock keeps fleet compact from moving files mid-scan.
+    try:
+        with control_plane_lock(cp_root, "intake", shared=True), control_plane_lock(cp_root, "signals"):
+            return aggregate(args, metrics, cp_root)
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+
+def main() -> int:
+    return run_with_metrics("aggregate-fleet-signals", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.flowstats import LEAD_TIME_P50_SLO_HOURS, METRICS, QUEUE_P95_SLO_HOURS, FlowStats
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import EventLogError, event_log_index, materialize
+from agentteams_lib.tasklayout import task_files
+from agentteams_lib.yamlio import load_path
+
+TASK_STATUSES = ("todo", "in_progress", "in_review", "blocked", "done")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Per-team queue wait, service time, gate latency and critical-path ranking across tasks"
+    )
+    parser.add_argument("--path", default=".takt/tasks", help="task directory path")
+    parser.add_argument(
+        "--status", action="append", choices=TASK_STATUSES, default=[], help="only tasks in this status (repeatable)"
+    )
+    parser.add_argument("--top", type=int, default=5, help="critical-path teams to list (0 = all)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="output format")
+    parser.add_argument("--verbose", action="store_true", help="print each task's critical path")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def load_task(path: Path, event_logs: dict[str, Path]) -> dict:
+    task = load_yaml(path)
+    return materialize(task, event_logs.get(str(task.get("id") or "")))[0]
+
+
+def fields(summary: dict) -> str:
+    return " ".join(f"{key}={value}" for key, value in summary.items())
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    if args.top < 0:
+        print("ERROR [FLOW_CONFIG_INVALID] --top must be >= 0")
+        return 1
+    task_dir = Path(args.path).resolve()
+    if not task_dir.is_dir():
+        print(f"ERROR [FLOW_TASK_DIR_MISSING] {task_dir.as_posix()}")
+        return 1
+
+    with metrics.phase("discovery"):
+        files = task_files(task_dir)
+        event_logs = event_log_index(task_dir)
+    if not files:
+        print(f"ERROR [FLOW_TASKS_EMPTY] no TASK-*.yaml under {task_dir.as_posix()}")
+        return 1
+
+    stats = FlowStats()
+    warnings: list[str] = []
+    for task_file in files:
+        with metrics.phase("parse"):
+            try:
+                task = load_task(task_file, event_logs)
+            except (EventLogError, yaml.YAMLError) as exc:
+                warnings.append(f"WARN [FLOW_TASK_INVALID] task={task_file.stem} detail={exc}")
+                continue
+        if args.status and str(task.get("status") or "") not in args.status:
+            continue
+        with metrics.phase("analyze"):
+            path = stats.add(task)
+        if args.verbose and args.format == "text":
+            steps = ">".join(f"{team}:{hours:.3f}" for team, hours in path.segments) or "-"
+            print(
+                f"INFO [FLOW_TASK] task={path.task or task_file.stem} lead_time_hours={path.lead_time:.3f} "
+                f"bottleneck={path.bottleneck or '-'} path={steps}"
+            )
+    metrics.gauge("tasks_analyzed", stats.tasks)
+
+    reports = {team: stats.team_report(team) for team in stats.teams()}
+    ranking = stats.ranking()
+    shown = ranking[: args.top] if args.top else ranking
+    lead_time = stats.lead_time()
+    queue_slo = {
+        team: report["queue_wait"]["p95_hours"]
+        for team, report in reports.items()
+        if report["queue_wait"]["p95_hours"] > QUEUE_P95_SLO_HOURS
+    }
+
+    if args.format == "json":
+        payload = {
+            "tasks": stats.tasks,
+            "lead_time": lead_time,
+            "teams": reports,
+            "gates": stats.gate_report(),
+            "critical_path": shown,
+            "queue_p95_over_slo": queue_slo,
+            "warnings": warnings,
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+
+    for warning in warnings:
+        print(warning)
+    for team, report in reports.items():
+        for metric in METRICS:
+            extra = f" unclaimed={report['unclaimed_handoffs']}" if metric == "queue_wait" else ""
+            print(f"OK [FLOW_TEAM] team={team} metric={metric} {fields(report[metric])}{extra}")
+    for stage, summary in stats.gate_report().items():
+        print(f"OK [FLOW_GATE] gate={stage} {fields(summary)}")
+    for entry in shown:
+        print("OK [FLOW_CRITICAL_PATH] " + fields(entry))
+    for team, p95 in queue_slo.items():
+        print(f"WARN [FLOW_QUEUE_SLO] team={team} queue_p95_hours={p95} threshold={QUEUE_P95_SLO_HOURS:g}")
+    if lead_time["p50_hours"] > LEAD_TIME_P50_SLO_HOURS:
+        print(
+            f"WARN [FLOW_LEAD_TIME_SLO] lead_time_p50_hours={lead_time['p50_hours']} "
+            f"threshold={LEAD_TIME_P50_SLO_HOURS:g}"
+        )
+    print(
+        f"OK [FLOW_DONE] tasks={stats.tasks} teams={len(reports)} lead_time_p50_hours={lead_time['p50_hours']} "
+        f"top_bottleneck={ranking[0]['team'] if ranking else '-'}"
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("analyze-flow", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,16 +12,35 @@ try:
 except Exception:
     yaml = None
 
+from agentteams_lib.approvals import ApprovalChain, leader_teams
+from agentteams_lib.gitops import CloneOptions, GitError, clone
+from agentteams_lib.routing import RoutingTable
+from agentteams_lib.taskevents import EventLogError, events_path, materialize
+from agentteams_lib.taskhistory import SECTIONS, archived_count, digest_of
+from agentteams_lib.tasklayout import has_archive, task_files
+
 
 PRIMARY_CLI = "agentteams"
 WINDOWS_COMPAT_CLI = r".\at.cmd"
 UNIX_COMPAT_CLI = "./at"
-TASK_FILE_PATTERN = "TASK-*.yaml"
 TASK_STATUSES = {"todo", "in_progress", "in_review", "blocked", "done"}
 REMOVED_COMMANDS = {"sync", "report-incident", "guard-chat"}
 CONTROL_PLANE_ROOT = Path(".takt") / "control-plane"
 TEAMS_CATALOG = CONTROL_PLANE_ROOT / "team-catalog" / "teams.yaml"
 SKILLS_CATALOG = CONTROL_PLANE_ROOT / "skill-catalog" / "skills.yaml"
+FLEET_SCRIPTS = {"init": "fleet-init.py", "compact": "fleet-compact.py", "apply-queue": "fleet-apply-queue.py"}
+AUDIT_USAGE = (
+    "Usage: agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose] [--trace <path>] "
+    "[--include-archive]"
+)
+TASK_SCRIPTS = {
+    "record": "task-record.py",
+    "snapshot": "task-snapshot.py",
+    "archive": "task-archive.py",
+    "rotate": "task-rotate.py",
+}
+INDEX_SCRIPTS = {"build": "build-task-index.py"}
+ANALYZE_SCRIPTS = {"flow": "analyze-flow.py"}
 
 
 def cli_command(command: str, include_compat: bool = False) -> str:
@@ -35,14 +54,57 @@ def cli_command(command: str, include_compat: bool = False) -> str:
 
 def usage() -> None:
     print("Usage:")
-    print("  agentteams init [<git-url>] [-w|--workspace <path>] [--verbose]")
+    print(
+        "  agentteams init [<git-url>] [-w|--workspace <path>] [--depth <n>] [--filter <spec>] "
+        "[--no-cache] [--cache-dir <path>] [--verbose]"
+    )
     print("  agentteams init --here [--verbose]")
-    print("  agentteams doctor [--verbose]")
+    print("  agentteams doctor [--include-archive] [--verbose]")
     print(
         "  agentteams orchestrate --task-file <.takt/tasks/TASK-*.yaml> "
-        "[--provider codex|claude|mock] [--no-post-validate] [--verbose]"
+        "[--provider codex|claude|mock] [--no-post-validate] [--include-archive] [--verbose]"
+    )
+    print("  agentteams route --task-file <path> [--task-file <path> ...] [--path <dir>] [--format text|json]")
+    print(
+        "  agentteams task record (--task-file <path> | --id <T-00000>) "
+        "--type declaration|handoff|team_leader_gate|qa_gate|leader_gate|status --data <json>"
+    )
+    print("  agentteams task snapshot [--path <dir>] [--task-file <path>] [--check]")
+    print(
+        "  agentteams task archive [--path <dir>] [--task-file <path>] "
+        "[--before <YYYY-MM-DDTHH:MM:SSZ> | --older-than-days <n>] [--dry-run] [--verify]"
+    )
+    print("  agentteams task rotate [--path <dir>] [--dry-run]")
+    print("  agentteams index build [--tasks <dir>] [--control-plane <path>] [--db <path>] [--rebuild]")
+    print(
+        "  agentteams query <name> [--param <name=value> ...] | --sql <select> | --list "
+        "[--db <path>] [--format text|json]"
+    )
+    print(
+        "  agentteams analyze flow [--path <dir>] [--status <status> ...] [--top <n>] "
+        "[--format text|json] [--verbose]"
+    )
+    print(
+        "  agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose] [--trace <path>] "
+        "[--include-archive]"
+    )
+    print(
+        "  agentteams validate [--fail-fast] [--jobs <n>] [--only <step>] [--skip <step>] [--report <path>] "
+        "[--active-only] [--verbose]"
+    )
+    print(
+        "  agentteams fleet init [--registry <path>] [--workspace <path>] [--jobs <n>] [--project <id>] "
+        "[--url-template <tpl>] [--report <path>] [--force]"
+    )
+    print(
+        "  agentteams fleet compact [--control-plane <path>] [--keep-days <n>] [--keep-latest <n>] "
+        "[--project <id>] [--dry-run]"
+    )
+    print("  agentteams fleet apply-queue [--control-plane <path>] [--refresh-id <id>] [--dry-run]")
+    print(
+        "  agentteams bench [--tasks <n>] [--projects <n>] [--snapshots <n>] [--catalog-size <n>] "
+        "[--seed <n>] [--repeat <n>] [--baseline <path>] [--update-baseline]"
     )
-    print("  agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose]")
     print("Compatibility aliases:")
     print("  at <same-subcommand> ...")
 
@@ -134,42 +196,29 @@ def invoke_bootstrap(template_root: Path, target_root: Path, verbose: bool) -> i
         info(verbose, "target root equals template root; bootstrap copy skipped.")
         return 0
 
-    ps_script = template_root / "scripts" / "bootstrap-agent-teams.ps1"
-    sh_script = template_root / "scripts" / "bootstrap-agent-teams.sh"
-
-    if os.name == "nt":
-        if not ps_script.exists():
-            return fail("BOOTSTRAP_FAILED", f"missing script: {ps_script.as_posix()}")
-        code, _ = run_cmd(
-            [
-                "powershell",
-                "-NoProfile",
-                "-ExecutionPolicy",
-                "Bypass",
-                "-File",
-                str(ps_script),
-                "--target",
-                str(target_root),
-            ]
-        )
-        if code != 0:
-            return fail("BOOTSTRAP_FAILED", f"bootstrap failed: {target_root.as_posix()}")
-        return 0
-
-    if not sh_script.exists():
-        return fail("BOOTSTRAP_FAILED", f"missing script: {sh_script.as_posix()}")
+    sync_script = template_root / "scripts" / "sync-template.py"
+    if not sync_script.exists():
+        return fail("BOOTSTRAP_FAILED", f"missing script: {sync_script.as_posix()}")
 
-    code, _ = run_cmd(["bash", str(sh_script), "--target", str(target_root)])
+    cmd = [sys.executable, str(sync_script), "--target", str(target_root)]
+    if verbose:
+        cmd.append("--verbose")
+    code, _ = run_cmd(cmd)
     if code != 0:
         return fail("BOOTSTRAP_FAILED", f"bootstrap failed: {target_root.as_posix()}")
     return 0
 
 
-def parse_init_args(args: list[str]) -> tuple[str, bool, str, bool, int]:
+def parse_init_args(args: list[str]) -> tuple[str, bool, str, bool, CloneOptions, int]:
     repo_url = ""
     use_here = False
     workspace = str(Path.cwd())
     verbose = False
+    clone_options = CloneOptions()
+    usage_hint = (
+        "Usage: agentteams init [<git-url>] [-w|--workspace <path>] [--depth <n>] [--filter <spec>] "
+        "[--no-cache] [--cache-dir <path>]"
+    )
 
     idx = 0
     while idx < len(args):
@@ -181,7 +230,7 @@ def parse_init_args(args: list[str]) -> tuple[str, bool, str, bool, int]:
             continue
         if token in ("--workspace", "-w"):
             if idx + 1 >= len(args):
-                return "", False, workspace, verbose, fail(
+                return "", False, workspace, verbose, clone_options, fail(
                     "PATH_LAYOUT_INVALID",
                     "--workspace requires a path value.",
                     "Usage: agentteams init [<git-url>] [-w|--workspace <path>]",
@@ -193,15 +242,41 @@ def parse_init_args(args: list[str]) -> tuple[str, bool, str, bool, int]:
             verbose = True
             idx += 1
             continue
+        if token == "--no-cache":
+            clone_options.use_cache = False
+            idx += 1
+            continue
+        if token in ("--depth", "--filter", "--cache-dir"):
+            if idx + 1 >= len(args):
+                return "", False, workspace, verbose, clone_options, fail(
+                    "PATH_LAYOUT_INVALID",
+                    f"{token} requires a value.",
+                    usage_hint,
+                )
+            value = args[idx + 1]
+            if token == "--depth":
+                if not value.isdigit() or int(value) < 1:
+                    return "", False, workspace, verbose, clone_options, fail(
+                        "PATH_LAYOUT_INVALID",
+                        f"--depth must be a positive integer: {value}",
+                        usage_hint,
+                    )
+                clone_options.depth = int(value)
+            elif token == "--filter":
+                clone_options.filter_spec = value
+            else:
+                clone_options.cache_dir = value
+            idx += 2
+            continue
         if token.startswith("-"):
-            return "", False, workspace, verbose, fail(
+            return "", False, workspace, verbose, clone_options, fail(
                 "PATH_LAYOUT_INVALID",
                 f"unknown option for init: {token}",
-                "Usage: agentteams init [<git-url>] [-w|--workspace <path>] [--here] [--verbose]",
+                usage_hint,
             )
 
         if repo_url:
-            return "", False, workspace, verbose, fail(
+            return "", False, workspace, verbose, clone_options, fail(
                 "PATH_LAYOUT_INVALID",
                 f"unexpected extra positional argument: {token}",
                 "Usage: agentteams init [<git-url>] [-w|--workspace <path>]",
@@ -211,13 +286,13 @@ def parse_init_args(args: list[str]) -> tuple[str, bool, str, bool, int]:
         idx += 1
 
     if use_here and repo_url:
-        return "", False, workspace, verbose, fail(
+        return "", False, workspace, verbose, clone_options, fail(
             "PATH_LAYOUT_INVALID",
             "cannot use --here with repository URL.",
             "Usage: agentteams init --here",
         )
 
-    return repo_url, use_here, workspace, verbose, 0
+    return repo_url, use_here, workspace, verbose, clone_options, 0
 
 
 def init_here(template_root: Path, verbose: bool) -> int:
@@ -238,7 +313,13 @@ def init_here(template_root: Path, verbose: bool) -> int:
     return 0
 
 
-def init_with_clone(template_root: Path, repo_url: str, workspace: str, verbose: bool) -> int:
+def init_with_clone(
+    template_root: Path,
+    repo_url: str,
+    workspace: str,
+    verbose: bool,
+    clone_options: CloneOptions | None = None,
+) -> int:
     workspace_root = Path(workspace).expanduser().resolve()
     workspace_root.mkdir(parents=True, exist_ok=True)
 
@@ -259,9 +340,11 @@ def init_with_clone(template_root: Path, repo_url: str, workspace: str, verbose:
         )
 
     info(verbose, f"cloning {repo_url} -> {target_root.as_posix()}")
-    code, _ = run_cmd(["git", "clone", repo_url, str(target_root)])
-    if code != 0:
-        return fail("GIT_CLONE_FAILED", f"git clone failed: {repo_url}")
+    try:
+        method = clone(repo_url, target_root, sys.stdout if verbose else None, clone_options)
+    except GitError as exc:
+        return fail("GIT_CLONE_FAILED", f"git clone failed: {repo_url} ({exc})")
+    info(verbose, f"clone method: {method}")
 
     code = invoke_bootstrap(template_root, target_root, verbose)
     if code != 0:
@@ -282,7 +365,7 @@ def run_python_script(repo_root: Path, script_rel: str, args: list[str]) -> int:
     return 0
 
 
-def doctor(verbose: bool) -> int:
+def doctor(verbose: bool, include_archive: bool = False) -> int:
     repo_root = resolve_repo_root()
     if repo_root is None:
         return fail(
@@ -321,21 +404,22 @@ def doctor(verbose: bool) -> int:
     if not tasks_dir.exists():
         return fail("TAKT_TASK_DIR_MISSING", f"missing tasks dir: {tasks_dir.as_posix()}")
 
-    task_files = sorted(tasks_dir.glob(TASK_FILE_PATTERN))
-    if not task_files:
+    # Routine checks skip the done/ partition; --include-archive lists and validates it too.
+    found = task_files(tasks_dir, include_archive=include_archive)
+    if not found and (include_archive or not has_archive(tasks_dir)):
         return fail("TAKT_TASKS_EMPTY", f"no task files under: {tasks_dir.as_posix()}")
-    print(f"OK [TAKT_TASKS_FOUND] count={len(task_files)}")
-
-    code = run_python_script(repo_root, "scripts/validate-takt-task.py", ["--path", ".takt/tasks"])
-    if code != 0:
-        return code
+    print(f"OK [TAKT_TASKS_FOUND] count={len(found)} scope={'all' if include_archive else 'active'}")
 
     control_plane = repo_root / CONTROL_PLANE_ROOT
     if not control_plane.exists():
         return fail("CONTROL_PLANE_MISSING", f"missing control-plane root: {control_plane.as_posix()}")
     print(f"OK [CONTROL_PLANE_FOUND] {control_plane.as_posix()}")
 
-    code = run_python_script(repo_root, "scripts/validate-control-plane-schema.py", ["--path", ".takt/control-plane"])
+    code = run_python_script(
+        repo_root,
+        "scripts/run-validators.py",
+        ["--only", "task-schema", "--only", "control-plane", *([] if include_archive else ["--active-only"])],
+    )
     if code != 0:
         return code
 
@@ -429,35 +513,8 @@ def resolve_active_team_descriptions(repo_root: Path, required_teams: list[str])
     return descriptions
 
 
-def resolve_active_skills(repo_root: Path, required_teams: list[str], capability_tags: list[str]) -> list[dict]:
-    catalog_path = repo_root / SKILLS_CATALOG
-    catalog = load_yaml_map(catalog_path)
-    skills = catalog.get("skills") if isinstance(catalog.get("skills"), list) else []
-
-    teams_set = set(required_teams)
-    tags_set = set(capability_tags)
-    selected: list[dict] = []
-    seen: set[str] = set()
-
-    for skill in skills:
-        if not isinstance(skill, dict):
-            continue
-        skill_id = str(skill.get("skill_id") or "").strip()
-        if not skill_id or skill_id in seen:
-            continue
-        if not bool(skill.get("enabled", False)):
-            continue
-
-        applies = skill.get("applies_to_teams")
-        applies_set = {str(v).strip() for v in applies} if isinstance(applies, list) else set()
-        trigger = skill.get("trigger") if isinstance(skill.get("trigger"), dict) else {}
-        trigger_tags = trigger.get("capability_tags")
-        trigger_set = {str(v).strip() for v in trigger_tags} if isinstance(trigger_tags, list) else set()
-
-        if teams_set.intersection(applies_set) or tags_set.intersection(trigger_set):
-            selected.append(skill)
-            seen.add(skill_id)
-    return selected
+def load_routing_table(repo_root: Path) -> RoutingTable:
+    return RoutingTable.load(repo_root / CONTROL_PLANE_ROOT, load_yaml_map)
 
 
 def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -> str:
@@ -475,10 +532,12 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
                 out.append(item)
         return out
 
-    required_teams = resolve_required_teams(task)
-    capability_tags = resolve_capability_tags(task)
+    routing_table = load_routing_table(repo_root)
+    decision = routing_table.route(task)
+    required_teams = decision.required_teams
+    capability_tags = decision.capability_tags
     active_team_descriptions = resolve_active_team_descriptions(repo_root, required_teams)
-    active_skills = resolve_active_skills(repo_root, required_teams, capability_tags)
+    skill_descriptions = {skill.skill_id: skill.description for skill in routing_table.skills}
     lines = [
         "You are executing an AgentTeams v5 governance task.",
         f"Task file: {task_file.as_posix()}",
@@ -512,7 +571,8 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
     lines.append("- required_teams:")
     if required_teams:
         for team in required_teams:
-            lines.append(f"  - {team}")
+            suffix = " (required by routing rules)" if team in decision.derived_teams else ""
+            lines.append(f"  - {team}{suffix}")
     else:
         lines.append("  - (none)")
     lines.append("- capability_tags:")
@@ -522,6 +582,14 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
     else:
         lines.append("  - (none)")
 
+    lines.append("")
+    lines.append("Matched Routing Rules (cite as rule:<rule_id> in controlled_by):")
+    if decision.rules:
+        for rule in decision.rules:
+            lines.append(f"- {rule.rule_id} (priority {rule.priority})")
+    else:
+        lines.append("- (none)")
+
     lines.append("")
     lines.append("Active Teams:")
     if active_team_descriptions:
@@ -532,10 +600,9 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
 
     lines.append("")
     lines.append("Active Skills:")
-    if active_skills:
-        for skill in active_skills:
-            skill_id = str(skill.get("skill_id") or "").strip()
-            description = str(skill.get("description") or "").strip()
+    if decision.required_skills:
+        for skill_id in decision.required_skills:
+            description = skill_descriptions.get(skill_id) or "(not an enabled catalog skill)"
             lines.append(f"- {skill_id}: {description}")
     else:
         lines.append("- (none)")
@@ -586,6 +653,17 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
         f"status={str(leader_gate.get('status', '')).strip()} note={str(leader_gate.get('note', '')).strip()} "
         f"controlled_by={leader_controlled_by}"
     )
+    chain = ApprovalChain.from_task(task, leader_teams(required_teams))
+    pending_leaders = [team for team in chain.required_leaders if chain.team_status(team) != "approved"]
+    lines.append(f"- next_gate: {chain.next_gate()}")
+    lines.append(f"- pending_team_leaders: {', '.join(pending_leaders) or '(none)'}")
+    history = digest_of(task)
+    if history:
+        counts = " ".join(f"{section}={archived_count(task, section)}" for section in SECTIONS)
+        lines.append(
+            f"- archived_history: before={history.get('cutoff', '')} {counts} "
+            f"(entries below are the recent ones; older evidence is in {history.get('archive', '')})"
+        )
 
     lines.append("")
     lines.append("Declarations (who does what):")
@@ -631,18 +709,19 @@ def compile_orchestration_prompt(task_file: Path, task: dict, repo_root: Path) -
     return "\n".join(lines).strip()
 
 
-def parse_orchestrate_args(args: list[str]) -> tuple[str, str, bool, bool, int]:
+def parse_orchestrate_args(args: list[str]) -> tuple[str, str, bool, bool, bool, int]:
     task_file = ""
     provider = "codex"
     no_post_validate = False
     verbose = False
+    include_archive = False
 
     idx = 0
     while idx < len(args):
         token = args[idx]
         if token == "--task-file":
             if idx + 1 >= len(args):
-                return "", provider, no_post_validate, verbose, fail(
+                return "", provider, no_post_validate, verbose, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     "--task-file requires a value.",
                     "Usage: agentteams orchestrate --task-file .takt/tasks/TASK-xxxxx-slug.yaml",
@@ -653,7 +732,7 @@ def parse_orchestrate_args(args: list[str]) -> tuple[str, str, bool, bool, int]:
 
         if token == "--provider":
             if idx + 1 >= len(args):
-                return "", provider, no_post_validate, verbose, fail(
+                return "", provider, no_post_validate, verbose, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     "--provider requires a value.",
                     "Allowed values: codex | claude | mock",
@@ -672,30 +751,40 @@ def parse_orchestrate_args(args: list[str]) -> tuple[str, str, bool, bool, int]:
             idx += 1
             continue
 
-        return "", provider, no_post_validate, verbose, fail(
+        if token == "--include-archive":
+            include_archive = True
+            idx += 1
+            continue
+
+        return "", provider, no_post_validate, verbose, include_archive, fail(
             "PATH_LAYOUT_INVALID",
             f"unknown option for orchestrate: {token}",
-            "Usage: agentteams orchestrate --task-file <path> [--provider codex|claude|mock] [--no-post-validate] [--verbose]",
+            (
+                "Usage: agentteams orchestrate --task-file <path> [--provider codex|claude|mock] "
+                "[--no-post-validate] [--include-archive] [--verbose]"
+            ),
         )
 
     if not task_file:
-        return "", provider, no_post_validate, verbose, fail(
+        return "", provider, no_post_validate, verbose, include_archive, fail(
             "PATH_LAYOUT_INVALID",
             "--task-file is required.",
             "Usage: agentteams orchestrate --task-file .takt/tasks/TASK-xxxxx-slug.yaml",
         )
 
     if provider not in {"codex", "claude", "mock"}:
-        return "", provider, no_post_validate, verbose, fail(
+        return "", provider, no_post_validate, verbose, include_archive, fail(
             "PATH_LAYOUT_INVALID",
             f"unsupported provider: {provider}",
             "Allowed values: codex | claude | mock",
         )
 
-    return task_file, provider, no_post_validate, verbose, 0
+    return task_file, provider, no_post_validate, verbose, include_archive, 0
 
 
-def orchestrate(task_file: str, provider: str, no_post_validate: bool, verbose: bool) -> int:
+def orchestrate(
+    task_file: str, provider: str, no_post_validate: bool, verbose: bool, include_archive: bool = False
+) -> int:
     repo_root = resolve_repo_root()
     if repo_root is None:
         return fail(
@@ -731,6 +820,10 @@ def orchestrate(task_file: str, provider: str, no_post_validate: bool, verbose:
     raw = yaml.safe_load(task_path.read_text(encoding="utf-8")) if yaml is not None else None
     if not isinstance(raw, dict):
         return fail("TAKT_TASK_INVALID", f"failed to parse YAML object: {task_path.as_posix()}")
+    try:
+        raw, _ = materialize(raw, events_path(task_path.parent, str(raw.get("id") or "")))
+    except EventLogError as exc:
+        return fail("TAKT_TASK_INVALID", f"invalid task event log: {exc}")
 
     status = str(raw.get("status", ""))
     if status not in TASK_STATUSES:
@@ -793,7 +886,9 @@ def orchestrate(task_file: str, provider: str, no_post_validate: bool, verbose:
         code = run_python_script(repo_root, "scripts/validate-takt-task.py", ["--file", str(task_path)])
         if code != 0:
             return code
-        code = run_python_script(repo_root, "scripts/validate-takt-evidence.py", [])
+        # The evidence pass covers every task; done/ only joins it with --include-archive.
+        scope = [] if include_archive else ["--active-only"]
+        code = run_python_script(repo_root, "scripts/validate-takt-evidence.py", scope)
         if code != 0:
             return code
 
@@ -801,25 +896,27 @@ def orchestrate(task_file: str, provider: str, no_post_validate: bool, verbose:
     return 0
 
 
-def parse_audit_args(args: list[str]) -> tuple[str, int, bool, bool, int]:
+def parse_audit_args(args: list[str]) -> tuple[str, int, bool, bool, str, bool, int]:
     scope = "local"
     min_teams = 3
     strict = False
     verbose = False
+    trace = ""
+    include_archive = False
 
     idx = 0
     while idx < len(args):
         token = args[idx]
         if token == "--scope":
             if idx + 1 >= len(args):
-                return scope, min_teams, strict, verbose, fail(
+                return scope, min_teams, strict, verbose, trace, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     "--scope requires a value.",
-                    "Usage: agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose]",
+                    AUDIT_USAGE,
                 )
             value = args[idx + 1].strip().lower()
             if value not in {"local", "fleet"}:
-                return scope, min_teams, strict, verbose, fail(
+                return scope, min_teams, strict, verbose, trace, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     f"invalid --scope value: {value}",
                     "Allowed values: local | fleet",
@@ -830,17 +927,17 @@ def parse_audit_args(args: list[str]) -> tuple[str, int, bool, bool, int]:
 
         if token == "--min-teams":
             if idx + 1 >= len(args):
-                return scope, min_teams, strict, verbose, fail(
+                return scope, min_teams, strict, verbose, trace, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     "--min-teams requires a numeric value.",
-                    "Usage: agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose]",
+                    AUDIT_USAGE,
                 )
             try:
                 min_teams = int(args[idx + 1])
                 if min_teams <= 0:
                     raise ValueError
             except ValueError:
-                return scope, min_teams, strict, verbose, fail(
+                return scope, min_teams, strict, verbose, trace, include_archive, fail(
                     "PATH_LAYOUT_INVALID",
                     f"invalid --min-teams value: {args[idx + 1]}",
                     "--min-teams must be an integer >= 1",
@@ -855,17 +952,46 @@ def parse_audit_args(args: list[str]) -> tuple[str, int, bool, bool, int]:
             verbose = True
             idx += 1
             continue
+        if token == "--trace":
+            if idx + 1 >= len(args):
+                return scope, min_teams, strict, verbose, trace, include_archive, fail(
+                    "PATH_LAYOUT_INVALID",
+                    "--trace requires an output path.",
+                    AUDIT_USAGE,
+                )
+            trace = args[idx + 1]
+            idx += 2
+            continue
+        if token == "--include-archive":
+            include_archive = True
+            idx += 1
+            continue
 
-        return scope, min_teams, strict, verbose, fail(
+        return scope, min_teams, strict, verbose, trace, include_archive, fail(
             "PATH_LAYOUT_INVALID",
             f"unknown option for audit: {token}",
-            "Usage: agentteams audit [--scope local|fleet] [--min-teams <n>] [--strict] [--verbose]",
+            AUDIT_USAGE,
         )
 
-    return scope, min_teams, strict, verbose, 0
+    if trace and scope != "local":
+        return scope, min_teams, strict, verbose, trace, include_archive, fail(
+            "PATH_LAYOUT_INVALID",
+            "--trace is only available with --scope local.",
+            AUDIT_USAGE,
+        )
+    if include_archive and scope != "local":
+        return scope, min_teams, strict, verbose, trace, include_archive, fail(
+            "PATH_LAYOUT_INVALID",
+            "--include-archive is only available with --scope local.",
+            AUDIT_USAGE,
+        )
+
+    return scope, min_teams, strict, verbose, trace, include_archive, 0
 
 
-def audit(scope: str, min_teams: int, strict: bool, verbose: bool) -> int:
+def audit(
+    scope: str, min_teams: int, strict: bool, verbose: bool, trace: str = "", include_archive: bool = False
+) -> int:
     repo_root = resolve_repo_root()
     if repo_root is None:
         return fail(
@@ -888,13 +1014,119 @@ def audit(scope: str, min_teams: int, strict: bool, verbose: bool) -> int:
         cmd.append("--strict")
     if verbose:
         cmd.append("--verbose")
+    if trace:
+        cmd.extend(["--trace", str(Path(trace).resolve())])
+    if include_archive:
+        cmd.append("--include-archive")
 
     code, _ = run_cmd(cmd, cwd=repo_root)
     return code
 
 
+def validate(args: list[str]) -> int:
+    repo_root = resolve_repo_root()
+    if repo_root is None:
+        return fail(
+            "AGENT_CONTEXT_MISSING",
+            "agentteams validate must run inside a git repository.",
+            f"Next: {cli_command('init --here', include_compat=True)}",
+        )
+
+    script = repo_root / "scripts" / "run-validators.py"
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args], cwd=repo_root)
+    return code
+
+
+def route(args: list[str]) -> int:
+    repo_root = resolve_repo_root()
+    if repo_root is None:
+        return fail(
+            "AGENT_CONTEXT_MISSING",
+            "agentteams route must run inside a git repository.",
+            f"Next: {cli_command('init --here', include_compat=True)}",
+        )
+
+    script = repo_root / "scripts" / "route-task.py"
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args], cwd=repo_root)
+    return code
+
+
+def query(args: list[str]) -> int:
+    repo_root = resolve_repo_root()
+    if repo_root is None:
+        return fail(
+            "AGENT_CONTEXT_MISSING",
+            "agentteams query must run inside a git repository.",
+            f"Next: {cli_command('init --here', include_compat=True)}",
+        )
+
+    script = repo_root / "scripts" / "query-task-index.py"
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args], cwd=repo_root)
+    return code
+
+
+def repo_subcommand(command: str, scripts: dict[str, str], args: list[str]) -> int:
+    repo_root = resolve_repo_root()
+    if repo_root is None:
+        return fail(
+            "AGENT_CONTEXT_MISSING",
+            f"agentteams {command} must run inside a git repository.",
+            f"Next: {cli_command('init --here', include_compat=True)}",
+        )
+
+    if not args or args[0] not in scripts:
+        given = args[0] if args else "(none)"
+        return fail(
+            "PATH_LAYOUT_INVALID",
+            f"unknown {command} subcommand: {given}",
+            f"Usage: agentteams {command} {'|'.join(scripts)} ...",
+        )
+
+    script = repo_root / "scripts" / scripts[args[0]]
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args[1:]], cwd=repo_root)
+    return code
+
+
+def fleet(template_root: Path, args: list[str]) -> int:
+    if not args or args[0] not in FLEET_SCRIPTS:
+        given = args[0] if args else "(none)"
+        return fail(
+            "PATH_LAYOUT_INVALID",
+            f"unknown fleet subcommand: {given}",
+            f"Usage: agentteams fleet {'|'.join(FLEET_SCRIPTS)} ...",
+        )
+
+    script = template_root / "scripts" / FLEET_SCRIPTS[args[0]]
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args[1:]])
+    return code
+
+
+def bench(template_root: Path, args: list[str]) -> int:
+    script = template_root / "scripts" / "run-benchmarks.py"
+    if not script.exists():
+        return fail("PATH_LAYOUT_INVALID", f"missing script: {script.as_posix()}")
+
+    code, _ = run_cmd([sys.executable, str(script), *args])
+    return code
+
+
 def init_command(template_root: Path, args: list[str]) -> int:
-    repo_url, use_here, workspace, verbose, parse_code = parse_init_args(args)
+    repo_url, use_here, workspace, verbose, clone_options, parse_code = parse_init_args(args)
     if parse_code != 0:
         return parse_code
 
@@ -912,7 +1144,7 @@ def init_command(template_root: Path, args: list[str]) -> int:
             "Usage: agentteams init <git-url> or agentteams init --here",
         )
 
-    return init_with_clone(template_root, repo_url, workspace, verbose)
+    return init_with_clone(template_root, repo_url, workspace, verbose, clone_options)
 
 
 def main(argv: list[str]) -> int:
@@ -930,15 +1162,18 @@ def main(argv: list[str]) -> int:
         return fail(
             "LEGACY_COMMAND_REMOVED",
             f"`{PRIMARY_CLI} {command}` is discontinued in v5.",
-            "Available commands: agentteams init | doctor | orchestrate | audit",
+            "Available commands: agentteams init | doctor | orchestrate | route | task | index | query | analyze | audit | validate | fleet | bench",
         )
 
-    if command not in {"init", "doctor", "orchestrate", "audit"}:
+    if command not in {
+        "init", "doctor", "orchestrate", "route", "task", "index", "query", "analyze", "audit", "validate", "fleet",
+        "bench",
+    }:
         usage()
         return fail(
             "PATH_LAYOUT_INVALID",
             f"unknown subcommand: {command}",
-            "Usage: agentteams init|doctor|orchestrate|audit",
+            "Usage: agentteams init|doctor|orchestrate|route|task|index|query|analyze|audit|validate|fleet|bench",
         )
 
     code = ensure_git_available()
@@ -950,29 +1185,58 @@ def main(argv: list[str]) -> int:
 
     if command == "doctor":
         verbose = False
+        include_archive = False
         for token in command_args:
             if token == "--verbose":
                 verbose = True
                 continue
+            if token == "--include-archive":
+                include_archive = True
+                continue
             return fail(
                 "PATH_LAYOUT_INVALID",
                 f"unknown option for doctor: {token}",
-                "Usage: agentteams doctor [--verbose]",
+                "Usage: agentteams doctor [--include-archive] [--verbose]",
             )
-        return doctor(verbose)
+        return doctor(verbose, include_archive)
 
     if command == "orchestrate":
-        task_file, provider, no_post_validate, verbose, parse_code = parse_orchestrate_args(command_args)
+        parsed = parse_orchestrate_args(command_args)
+        task_file, provider, no_post_validate, verbose, include_archive, parse_code = parsed
         if parse_code != 0:
             return parse_code
-        return orchestrate(task_file, provider, no_post_validate, verbose)
+        return orchestrate(task_file, provider, no_post_validate, verbose, include_archive)
 
-    scope, min_teams, strict, verbose, parse_code = parse_audit_args(command_args)
+    if command == "route":
+        return route(command_args)
+
+    if command == "task":
+        return repo_subcommand("task", TASK_SCRIPTS, command_args)
+
+    if command == "index":
+        return repo_subcommand("index", INDEX_SCRIPTS, command_args)
+
+    if command == "query":
+        return query(command_args)
+
+    if command == "analyze":
+        return repo_subcommand("analyze", ANALYZE_SCRIPTS, command_args)
+
+    if command == "validate":
+        return validate(command_args)
+
+    if command == "fleet":
+        return fleet(template_root, command_args)
+
+    if command == "bench":
+        return bench(template_root, command_args)
+
+    scope, min_teams, strict, verbose, trace, include_archive, parse_code = parse_audit_args(command_args)
     if parse_code != 0:
         return parse_code
-    return audit(scope, min_teams, strict, verbose)
+    return audit(scope, min_teams, strict, verbose, trace, include_archive)
 
 
 if __name__ == "__main__":
-    raise SystemExit(main(sys.argv[1:]))
-
+    raise SystemExit(main(sys.argv[1:]))
+
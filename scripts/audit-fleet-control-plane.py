@@ -12,18 +12,23 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.fsio import LockTimeout, control_plane_lock
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.signals import SignalsReader
+from agentteams_lib.yamlio import load_path
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Audit fleet-level control-plane health")
     parser.add_argument("--control-plane", default=".takt/control-plane", help="control-plane root")
     parser.add_argument("--strict", action="store_true", help="fail when warnings exist")
     parser.add_argument("--verbose", action="store_true", help="verbose output")
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
 def parse_utc(value: object) -> datetime | None:
@@ -39,13 +44,12 @@ def parse_utc(value: object) -> datetime | None:
         return None
 
 
-def main() -> int:
-    args = parse_args()
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
     cp_root = Path(args.control_plane).resolve()
     warnings: list[str] = []
 
     registry_path = cp_root / "registry" / "projects.yaml"
-    signals_path = cp_root / "signals" / "latest.yaml"
+    signals_root = cp_root / "signals"
 
     if not cp_root.exists():
         print(f"ERROR [FLEET_AUDIT_MISSING] {cp_root.as_posix()}")
@@ -53,22 +57,25 @@ def main() -> int:
     if not registry_path.exists():
         print(f"ERROR [FLEET_AUDIT_MISSING] {registry_path.as_posix()}")
         return 1
-    if not signals_path.exists():
-        print(f"ERROR [FLEET_AUDIT_MISSING] {signals_path.as_posix()}")
+    try:
+        with control_plane_lock(cp_root, "signals", shared=True):
+            signals = SignalsReader(signals_root, load_yaml)
+            if not signals.exists:
+                print(f"ERROR [FLEET_AUDIT_MISSING] {signals.source.as_posix()}")
+                return 1
+            # Staleness only needs captured_at, which the manifest carries; shards are opened for --verbose only.
+            signal_projects = [{"project_id": key, **value} for key, value in signals.project_index().items()]
+            fp_counts = signals.section("fingerprint_project_counts")
+            overload_candidates = signals.section("overload_candidates")
+            verbose_projects = signals.projects() if args.verbose else []
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
         return 1
 
     registry = load_yaml(registry_path)
-    signals = load_yaml(signals_path)
     projects = registry.get("projects") if isinstance(registry.get("projects"), list) else []
-    signal_projects = signals.get("projects") if isinstance(signals.get("projects"), list) else []
-    fp_counts = (
-        signals.get("fingerprint_project_counts")
-        if isinstance(signals.get("fingerprint_project_counts"), dict)
-        else {}
-    )
-    overload_candidates = (
-        signals.get("overload_candidates") if isinstance(signals.get("overload_candidates"), list) else []
-    )
+    fp_counts = fp_counts if isinstance(fp_counts, dict) else {}
+    overload_candidates = overload_candidates if isinstance(overload_candidates, list) else []
 
     if not projects:
         warnings.append("WARN [FLEET_AUDIT_PROJECTS_EMPTY] no registered projects")
@@ -104,9 +111,7 @@ def main() -> int:
             f"registered_projects={len(projects)} signal_projects={len(signal_projects)} "
             f"fingerprints={len(fp_counts)} overload_candidates={len(overload_candidates)}"
         )
-        for item in signal_projects:
-            if not isinstance(item, dict):
-                continue
+        for item in verbose_projects:
             print(
                 "INFO [FLEET_AUDIT_PROJECT] "
                 f"project={item.get('project_id')} queue_p95={item.get('queue_p95_hours')} "
@@ -114,6 +119,10 @@ def main() -> int:
                 f"blocked_ratio={item.get('blocked_ratio')}"
             )
 
+    metrics.gauge("registered_projects", len(projects))
+    metrics.gauge("signal_projects", len(signal_projects))
+    metrics.gauge("fingerprints", len(fp_counts))
+    metrics.gauge("overload_candidates", len(overload_candidates))
     if warnings:
         for warning in warnings:
             print(warning)
@@ -130,5 +139,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run_with_metrics("audit-fleet-control-plane", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -4,7 +4,6 @@ from __future__ import annotations
 import argparse
 from datetime import datetime, timezone
 from pathlib import Path
-import re
 import sys
 
 try:
@@ -13,8 +12,30 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
-TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
-APPROVAL_STATUS = {"pending", "approved", "rejected"}
+from agentteams_lib.approvals import APPROVAL_STATUS, COORDINATOR_TEAM, ApprovalChain, leader_teams
+from agentteams_lib.flowtrace import TraceWriter
+from agentteams_lib.fsio import atomic_writer
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.routing import RoutingTable
+from agentteams_lib.taskevents import EventLogError, event_log_index, materialize
+from agentteams_lib.taskhistory import SECTIONS
+from agentteams_lib.tasklayout import TASK_FILE_PATTERN, has_archive, task_files
+from agentteams_lib.taskmodel import Task
+
+CATALOG_CACHE: dict[str, dict] = {}
+CATALOG_CACHE_STATS = {"hits": 0, "misses": 0}
+ROUTING_TABLES: dict[str, RoutingTable] = {}
+APPROVAL_WARNINGS = {
+    "team_leaders_missing": ("AUDIT_TEAM_LEADER_GATE_MISSING", "missing={teams}"),
+    "team_leaders_not_approved": ("AUDIT_TEAM_LEADER_GATE_NOT_APPROVED", "teams={teams}"),
+    "qa_not_approved": ("AUDIT_QA_GATE_NOT_APPROVED", "qa_status={status}"),
+    "leader_not_approved": ("AUDIT_LEADER_GATE_NOT_APPROVED", "leader_status={status}"),
+    "team_after_qa": ("AUDIT_APPROVAL_ORDER_INVALID", "team={team} approved_after_qa=true"),
+    "leader_before_qa": ("AUDIT_APPROVAL_ORDER_INVALID", "leader_before_qa=true"),
+    "leader_at_before_qa_at": ("AUDIT_APPROVAL_ORDER_INVALID", "leader_gate_before_qa_gate=true"),
+    "rejected_done": ("AUDIT_REJECTED_DONE_INVALID", "rejected_gate_present=true"),
+    "rework_missing": ("AUDIT_REWORK_EVIDENCE_MISSING", "rejected_gate_requires_rework=true"),
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,6 +45,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--min-teams", type=int, default=3, help="minimum distinct teams expected")
     parser.add_argument("--strict", action="store_true", help="fail when warnings are found")
     parser.add_argument("--verbose", action="store_true", help="verbose output")
+    parser.add_argument(
+        "--include-archive",
+        action="store_true",
+        help="also audit done tasks under <path>/done/ (default: the active partition only)",
+    )
+    parser.add_argument(
+        "--trace",
+        default="",
+        help="write a Chrome Trace Event / Perfetto timeline of every task (one track per team) to this path",
+    )
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
@@ -32,21 +64,31 @@ def load_yaml(path: Path) -> dict:
     return data if isinstance(data, dict) else {}
 
 
+def load_task(path: Path, event_logs: dict[str, Path]) -> dict:
+    """Task snapshot with any events appended to its ``<id>.events.jsonl`` since the snapshot."""
+    task = load_yaml(path)
+    return materialize(task, event_logs.get(str(task.get("id") or "")))[0]
+
+
 def load_yaml_if_exists(path: Path) -> dict:
     if not path.exists():
         return {}
     return load_yaml(path)
 
 
-def as_list(value: object) -> list:
-    return value if isinstance(value, list) else []
+def load_catalog(path: Path) -> dict:
+    key = path.as_posix()
+    if key in CATALOG_CACHE:
+        CATALOG_CACHE_STATS["hits"] += 1
+        return CATALOG_CACHE[key]
+    CATALOG_CACHE_STATS["misses"] += 1
+    data = load_yaml_if_exists(path)
+    CATALOG_CACHE[key] = data
+    return data
 
 
-def team_of(role_ref: object) -> str:
-    value = str(role_ref or "").strip()
-    if "/" in value:
-        return value.split("/", 1)[0].strip()
-    return value
+def as_list(value: object) -> list:
+    return value if isinstance(value, list) else []
 
 
 def to_sortable_iso(value: object) -> str:
@@ -62,367 +104,110 @@ def to_sortable_iso(value: object) -> str:
         return raw
 
 
-def parse_iso_utc(value: object) -> datetime | None:
-    raw = str(value or "").strip()
-    if not TIMESTAMP_PATTERN.fullmatch(raw):
-        return None
-    try:
-        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed.astimezone(timezone.utc)
-    except ValueError:
-        return None
-
-
-def required_teams(task: dict) -> set[str]:
-    routing = task.get("routing")
-    if isinstance(routing, dict) and isinstance(routing.get("required_teams"), list):
-        teams = {str(v).strip() for v in routing.get("required_teams") if str(v).strip()}
-        if teams:
-            teams.add("coordinator")
-            return teams
-    return {"coordinator"}
-
-
-def capability_tags(task: dict) -> set[str]:
-    routing = task.get("routing")
-    if not isinstance(routing, dict):
-        return set()
-    tags = routing.get("capability_tags")
-    if not isinstance(tags, list):
-        return set()
-    return {str(v).strip() for v in tags if str(v).strip()}
-
-
-def observed_teams(task: dict) -> set[str]:
-    observed: set[str] = {"coordinator"}
-    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-    for entry in declarations:
-        if not isinstance(entry, dict):
-            continue
-        team = team_of(entry.get("team"))
-        if team:
-            observed.add(team)
-
-    handoffs = task.get("handoffs") if isinstance(task.get("handoffs"), list) else []
-    for entry in handoffs:
-        if not isinstance(entry, dict):
-            continue
-        src = team_of(entry.get("from"))
-        dst = team_of(entry.get("to"))
-        if src:
-            observed.add(src)
-        if dst:
-            observed.add(dst)
-    return observed
-
-
-def extract_rule_skill_evidence(task: dict) -> tuple[set[str], set[str]]:
-    rules: set[str] = set()
-    skills: set[str] = set()
-
-    def collect_controls(controls: object) -> None:
-        if not isinstance(controls, list):
-            return
-        for value in controls:
-            text = str(value or "").strip()
-            if text.startswith("rule:"):
-                rules.add(text.removeprefix("rule:"))
-            if text.startswith("skill:"):
-                skills.add(text.removeprefix("skill:"))
-
-    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-    for entry in declarations:
-        if not isinstance(entry, dict):
-            continue
-        collect_controls(entry.get("controlled_by"))
-
-    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
-    team_leader_gates = approvals.get("team_leader_gates")
-    if isinstance(team_leader_gates, list):
-        for gate in team_leader_gates:
-            if isinstance(gate, dict):
-                collect_controls(gate.get("controlled_by"))
-
-    qa_gate = approvals.get("qa_gate")
-    if isinstance(qa_gate, dict):
-        collect_controls(qa_gate.get("controlled_by"))
-    leader_gate = approvals.get("leader_gate")
-    if isinstance(leader_gate, dict):
-        collect_controls(leader_gate.get("controlled_by"))
-
-    return rules, skills
-
-
-def rule_matches_task(rule: dict, task: dict) -> bool:
-    when = rule.get("when") if isinstance(rule.get("when"), dict) else {}
-    status = str(task.get("status") or "")
-    tags = capability_tags(task)
-
-    if isinstance(when.get("any_status"), list):
-        statuses = {str(v).strip() for v in when.get("any_status") if str(v).strip()}
-        if statuses and status not in statuses:
-            return False
-
-    trigger_tags = when.get("capability_tags")
-    if isinstance(trigger_tags, list):
-        required_tags = {str(v).strip() for v in trigger_tags if str(v).strip()}
-        if required_tags and not tags.intersection(required_tags):
-            return False
-
-    return True
-
-
-def expected_rule_and_skill_ids(task: dict, root: Path) -> tuple[set[str], set[str]]:
-    expected_rules: set[str] = set()
-    expected_skills: set[str] = set()
-    required = required_teams(task)
-    tags = capability_tags(task)
-
-    rules_data = load_yaml_if_exists(root / ".takt" / "control-plane" / "rule-catalog" / "routing-rules.yaml")
-    rules = rules_data.get("rules") if isinstance(rules_data.get("rules"), list) else []
-    for rule in rules:
-        if not isinstance(rule, dict):
-            continue
-        if not bool(rule.get("enabled", False)):
-            continue
-        rule_id = str(rule.get("rule_id") or "").strip()
-        if not rule_id:
-            continue
-        if not rule_matches_task(rule, task):
-            continue
-        expected_rules.add(rule_id)
-        for skill in as_list(rule.get("require_skills")):
-            skill_text = str(skill).strip()
-            if skill_text:
-                expected_skills.add(skill_text)
-
-    skills_data = load_yaml_if_exists(root / ".takt" / "control-plane" / "skill-catalog" / "skills.yaml")
-    skills = skills_data.get("skills") if isinstance(skills_data.get("skills"), list) else []
-    for skill in skills:
-        if not isinstance(skill, dict):
-            continue
-        if not bool(skill.get("enabled", False)):
-            continue
-        skill_id = str(skill.get("skill_id") or "").strip()
-        if not skill_id:
-            continue
-        applies = {str(v).strip() for v in as_list(skill.get("applies_to_teams")) if str(v).strip()}
-        if applies and not required.intersection(applies):
-            continue
-        trigger = skill.get("trigger") if isinstance(skill.get("trigger"), dict) else {}
-        trigger_tags = {str(v).strip() for v in as_list(trigger.get("capability_tags")) if str(v).strip()}
-        if trigger_tags and tags and not tags.intersection(trigger_tags):
-            continue
-        expected_skills.add(skill_id)
-
-    return expected_rules, expected_skills
-
-
-def timeline_entries(task: dict) -> list[tuple[str, str]]:
+def routing_table(root: Path) -> RoutingTable:
+    key = root.as_posix()
+    if key not in ROUTING_TABLES:
+        cp_root = root / ".takt" / "control-plane"
+        ROUTING_TABLES[key] = RoutingTable.compile(
+            as_list(load_catalog(cp_root / "rule-catalog" / "routing-rules.yaml").get("rules")),
+            as_list(load_catalog(cp_root / "skill-catalog" / "skills.yaml").get("skills")),
+        )
+    return ROUTING_TABLES[key]
+
+
+def sortable_at(at: datetime | None, at_raw: str) -> str:
+    return at.strftime("%Y-%m-%dT%H:%M:%SZ") if at is not None else to_sortable_iso(at_raw)
+
+
+def timeline_entries(task: Task) -> list[tuple[str, str]]:
     entries: list[tuple[str, str]] = []
 
-    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-    for entry in declarations:
-        if not isinstance(entry, dict):
-            continue
-        at = str(entry.get("at") or "")
-        team = str(entry.get("team") or "").strip()
-        role = str(entry.get("role") or "").strip()
-        action = str(entry.get("action") or "").strip()
-        what = str(entry.get("what") or "").strip()
-        controls = entry.get("controlled_by") if isinstance(entry.get("controlled_by"), list) else []
-        controls_text = ",".join(str(v) for v in controls) if controls else "-"
+    if task.history:
+        counts = " ".join(f"{section}={task.archived[section]}" for section in SECTIONS)
+        cutoff = to_sortable_iso(task.history.get("cutoff"))
+        entries.append((cutoff, f"HISTORY archived_before={cutoff} {counts} file={task.history.get('archive', '')}"))
+
+    for entry in task.declarations:
+        controls_text = ",".join(entry.controls) or "-"
         entries.append(
             (
-                to_sortable_iso(at),
-                f"DECLARE team={team} role={role} action={action} what={what} controlled_by={controls_text}",
+                sortable_at(entry.at, entry.at_raw),
+                f"DECLARE team={entry.team} role={entry.role} action={entry.action} what={entry.what} "
+                f"controlled_by={controls_text}",
             )
         )
 
-    handoffs = task.get("handoffs") if isinstance(task.get("handoffs"), list) else []
-    for entry in handoffs:
-        if not isinstance(entry, dict):
-            continue
-        at = str(entry.get("at") or "")
-        src = str(entry.get("from") or "").strip()
-        dst = str(entry.get("to") or "").strip()
-        memo = str(entry.get("memo") or "").strip()
-        entries.append((to_sortable_iso(at), f"HANDOFF from={src} to={dst} memo={memo}"))
-
-    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
-    team_leader_gates = approvals.get("team_leader_gates")
-    if isinstance(team_leader_gates, list):
-        for gate in team_leader_gates:
-            if not isinstance(gate, dict):
-                continue
-            at = str(gate.get("at") or "")
-            team = str(gate.get("team") or "").strip()
-            role = str(gate.get("leader_role") or "").strip()
-            status = str(gate.get("status") or "").strip()
-            note = str(gate.get("note") or "").strip()
-            entries.append(
-                (to_sortable_iso(at), f"TEAM_LEADER_GATE team={team} role={role} status={status} note={note}")
+    for entry in task.handoffs:
+        entries.append(
+            (sortable_at(entry.at, entry.at_raw), f"HANDOFF from={entry.src} to={entry.dst} memo={entry.memo}")
+        )
+
+    for gate in task.team_leader_gates:
+        entries.append(
+            (
+                sortable_at(gate.at, gate.at_raw),
+                f"TEAM_LEADER_GATE team={gate.team} role={gate.actor} status={gate.status} note={gate.note}",
             )
+        )
 
-    qa_gate = approvals.get("qa_gate")
-    if isinstance(qa_gate, dict):
-        at = str(qa_gate.get("at") or "")
-        by = str(qa_gate.get("by") or "").strip()
-        status = str(qa_gate.get("status") or "").strip()
-        note = str(qa_gate.get("note") or "").strip()
-        entries.append((to_sortable_iso(at), f"QA_GATE by={by} status={status} note={note}"))
-
-    leader_gate = approvals.get("leader_gate")
-    if isinstance(leader_gate, dict):
-        at = str(leader_gate.get("at") or "")
-        by = str(leader_gate.get("by") or "").strip()
-        status = str(leader_gate.get("status") or "").strip()
-        note = str(leader_gate.get("note") or "").strip()
-        entries.append((to_sortable_iso(at), f"LEADER_GATE by={by} status={status} note={note}"))
+    for label, gate in (("QA_GATE", task.qa_gate), ("LEADER_GATE", task.leader_gate)):
+        if gate is not None:
+            entries.append(
+                (sortable_at(gate.at, gate.at_raw), f"{label} by={gate.actor} status={gate.status} note={gate.note}")
+            )
 
     return sorted(entries, key=lambda item: item[0])
 
 
-def approval_chain_warnings(task_id: str, task: dict, status: str) -> list[str]:
+def approval_chain_warnings(task_id: str, task: Task, required_teams: list[str]) -> list[str]:
     warnings: list[str] = []
-    approvals = task.get("approvals")
-    if not isinstance(approvals, dict):
+    if not task.has_approvals:
         warnings.append(f"WARN [AUDIT_APPROVALS_MISSING] task={task_id} approvals map is missing")
         return warnings
 
-    required_team_leaders = sorted(team for team in required_teams(task) if team != "qa-review-guild")
-    team_leader_gates = approvals.get("team_leader_gates")
-    if not isinstance(team_leader_gates, list):
+    if not task.has_gate_list:
         warnings.append(
             f"WARN [AUDIT_TEAM_LEADER_GATE_INVALID] task={task_id} approvals.team_leader_gates must be a list"
         )
-        team_leader_gates = []
-
-    latest_team_state: dict[str, tuple[datetime, str]] = {}
-    latest_team_state_any: dict[str, str] = {}
-    for gate in team_leader_gates:
-        if not isinstance(gate, dict):
-            continue
-        team = str(gate.get("team") or "").strip()
-        gate_status = str(gate.get("status") or "").strip()
-        gate_at = parse_iso_utc(gate.get("at"))
-        if gate_status not in APPROVAL_STATUS:
+    for gate in task.team_leader_gates:
+        if gate.status not in APPROVAL_STATUS:
             warnings.append(
-                f"WARN [AUDIT_TEAM_LEADER_GATE_STATUS_INVALID] task={task_id} team={team or '-'} status={gate_status or '-'}"
+                f"WARN [AUDIT_TEAM_LEADER_GATE_STATUS_INVALID] task={task_id} "
+                f"team={gate.team or '-'} status={gate.status or '-'}"
             )
-        if team:
-            latest_team_state_any[team] = gate_status
-        if team and gate_at is not None:
-            existing = latest_team_state.get(team)
-            if existing is None or gate_at >= existing[0]:
-                latest_team_state[team] = (gate_at, gate_status)
-
-    qa_gate = approvals.get("qa_gate")
-    qa_status = ""
-    qa_at: datetime | None = None
-    if isinstance(qa_gate, dict):
-        qa_status = str(qa_gate.get("status") or "").strip()
-        qa_at = parse_iso_utc(qa_gate.get("at"))
-    else:
-        warnings.append(f"WARN [AUDIT_QA_GATE_MISSING] task={task_id} approvals.qa_gate is missing")
 
-    leader_gate = approvals.get("leader_gate")
-    leader_status = ""
-    leader_at: datetime | None = None
-    if isinstance(leader_gate, dict):
-        leader_status = str(leader_gate.get("status") or "").strip()
-        leader_at = parse_iso_utc(leader_gate.get("at"))
-    else:
+    if task.qa_gate is None:
+        warnings.append(f"WARN [AUDIT_QA_GATE_MISSING] task={task_id} approvals.qa_gate is missing")
+    if task.leader_gate is None:
         warnings.append(f"WARN [AUDIT_LEADER_GATE_MISSING] task={task_id} approvals.leader_gate is missing")
 
-    if qa_status and qa_status not in APPROVAL_STATUS:
-        warnings.append(f"WARN [AUDIT_QA_GATE_STATUS_INVALID] task={task_id} status={qa_status}")
-    if leader_status and leader_status not in APPROVAL_STATUS:
-        warnings.append(f"WARN [AUDIT_LEADER_GATE_STATUS_INVALID] task={task_id} status={leader_status}")
-
-    if status in {"in_review", "done"}:
-        missing = sorted(team for team in required_team_leaders if team not in latest_team_state_any)
-        if missing:
-            warnings.append(
-                f"WARN [AUDIT_TEAM_LEADER_GATE_MISSING] task={task_id} missing={','.join(missing)}"
-            )
+    chain = ApprovalChain.from_task(task, leader_teams(required_teams))
+    if chain.qa.status and chain.qa.status not in APPROVAL_STATUS:
+        warnings.append(f"WARN [AUDIT_QA_GATE_STATUS_INVALID] task={task_id} status={chain.qa.status}")
+    if chain.leader.status and chain.leader.status not in APPROVAL_STATUS:
+        warnings.append(f"WARN [AUDIT_LEADER_GATE_STATUS_INVALID] task={task_id} status={chain.leader.status}")
 
-        not_approved = sorted(
-            team
-            for team in required_team_leaders
-            if latest_team_state.get(team, (datetime.min.replace(tzinfo=timezone.utc), "pending"))[1] != "approved"
-        )
-        if not_approved:
-            warnings.append(
-                f"WARN [AUDIT_TEAM_LEADER_GATE_NOT_APPROVED] task={task_id} teams={','.join(not_approved)}"
-            )
-
-        if qa_status != "approved":
-            warnings.append(
-                f"WARN [AUDIT_QA_GATE_NOT_APPROVED] task={task_id} qa_status={qa_status or '-'}"
-            )
-
-    if status == "done" and leader_status != "approved":
-        warnings.append(
-            f"WARN [AUDIT_LEADER_GATE_NOT_APPROVED] task={task_id} leader_status={leader_status or '-'}"
-        )
-
-    if qa_status == "approved" and qa_at is not None:
-        for team in required_team_leaders:
-            state = latest_team_state.get(team)
-            if state is None:
-                continue
-            if state[0] > qa_at:
-                warnings.append(
-                    f"WARN [AUDIT_APPROVAL_ORDER_INVALID] task={task_id} team={team} approved_after_qa=true"
-                )
-
-    if leader_status == "approved":
-        if qa_status != "approved":
-            warnings.append(f"WARN [AUDIT_APPROVAL_ORDER_INVALID] task={task_id} leader_before_qa=true")
-        if leader_at is not None and qa_at is not None and leader_at < qa_at:
-            warnings.append(
-                f"WARN [AUDIT_APPROVAL_ORDER_INVALID] task={task_id} leader_gate_before_qa_gate=true"
-            )
+    for violation in chain.violations(task.status):
+        code, detail = APPROVAL_WARNINGS[violation.code]
+        detail = detail.format(teams=",".join(violation.teams), team=",".join(violation.teams), status=violation.status or "-")
+        warnings.append(f"WARN [{code}] task={task_id} {detail}")
+    return warnings
 
-    rejection_times: list[datetime] = []
-    for team in required_team_leaders:
-        state = latest_team_state.get(team)
-        if state and state[1] == "rejected":
-            rejection_times.append(state[0])
-    if qa_status == "rejected" and qa_at is not None:
-        rejection_times.append(qa_at)
-    if leader_status == "rejected" and leader_at is not None:
-        rejection_times.append(leader_at)
-
-    if rejection_times:
-        if status == "done":
-            warnings.append(f"WARN [AUDIT_REJECTED_DONE_INVALID] task={task_id} rejected_gate_present=true")
-        latest_rejection = max(rejection_times)
-        declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-        has_rework = False
-        for entry in declarations:
-            if not isinstance(entry, dict):
-                continue
-            action = str(entry.get("action") or "").strip().lower()
-            if "rework" not in action and "fix" not in action and "address_rejection" not in action:
-                continue
-            at = parse_iso_utc(entry.get("at"))
-            if at is not None and at >= latest_rejection:
-                has_rework = True
-                break
-        if not has_rework:
-            warnings.append(
-                f"WARN [AUDIT_REWORK_EVIDENCE_MISSING] task={task_id} rejected_gate_requires_rework=true"
-            )
 
-    return warnings
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    if not args.trace:
+        return audit(args, metrics, None)
+    trace_path = Path(args.trace).resolve()
+    with atomic_writer(trace_path) as handle:
+        trace = TraceWriter(handle)
+        code = audit(args, metrics, trace)
+        trace.close()
+    metrics.gauge("trace_events", trace.events)
+    print(f"OK [AUDIT_TRACE_WRITTEN] path={trace_path.as_posix()} events={trace.events} teams={trace.teams}")
+    return code
 
 
-def main() -> int:
-    args = parse_args()
+def audit(args: argparse.Namespace, metrics: RunMetrics, trace: TraceWriter | None) -> int:
     if args.min_teams < 1:
         print("ERROR [AUDIT_CONFIG_INVALID] --min-teams must be >= 1")
         return 1
@@ -435,63 +220,81 @@ def main() -> int:
         print(f"ERROR [AUDIT_TASK_DIR_MISSING] {task_dir.as_posix()}")
         return 1
 
-    files = sorted(task_dir.glob("TASK-*.yaml"))
-    if not files:
-        print(f"ERROR [AUDIT_TASKS_EMPTY] no TASK-*.yaml under {task_dir.as_posix()}")
+    with metrics.phase("discovery"):
+        files = task_files(task_dir, include_archive=args.include_archive)
+        event_logs = event_log_index(task_dir, include_archive=args.include_archive)
+    # With every task rotated into done/ there is nothing active to audit, which is not an error.
+    if not files and (args.include_archive or not has_archive(task_dir)):
+        print(f"ERROR [AUDIT_TASKS_EMPTY] no {TASK_FILE_PATTERN} under {task_dir.as_posix()}")
         return 1
 
     warnings: list[str] = []
     for task_file in files:
-        task = load_yaml(task_file)
-        task_id = str(task.get("id") or task_file.stem)
-        status = str(task.get("status") or "")
-        declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-
-        if len(declarations) == 0:
-            warnings.append(f"WARN [AUDIT_DECLARATION_MISSING] task={task_id} declarations are empty")
-
-        expected_teams = required_teams(task)
-        observed = observed_teams(task)
-        missing_teams = sorted(expected_teams - observed)
-        if missing_teams:
-            warnings.append(
-                f"WARN [AUDIT_TEAM_COVERAGE_MISSING] task={task_id} missing_required_teams={','.join(missing_teams)}"
-            )
-
-        if len(observed) < args.min_teams:
-            warnings.append(
-                f"WARN [AUDIT_DISTRIBUTION_LOW] task={task_id} observed_teams={len(observed)} min={args.min_teams}"
-            )
-
-        observed_rules, observed_skills = extract_rule_skill_evidence(task)
-        expected_rules, expected_skills = expected_rule_and_skill_ids(task, root)
-        if status in {"in_review", "done"}:
-            missing_rules = sorted(expected_rules - observed_rules)
-            if missing_rules:
+        with metrics.phase("parse"):
+            try:
+                raw = load_task(task_file, event_logs)
+            except EventLogError as exc:
+                warnings.append(f"WARN [AUDIT_EVENT_LOG_INVALID] task={task_file.stem} detail={exc}")
+                continue
+            task = Task.from_dict(raw)
+        metrics.inc("files_processed")
+        with metrics.phase("validate"):
+            task_id = task.id or task_file.stem
+            status = task.status
+
+            if task.declaration_count == 0:
+                warnings.append(f"WARN [AUDIT_DECLARATION_MISSING] task={task_id} declarations are empty")
+
+            routing = routing_table(root).route(task)
+            expected_teams = set(routing.required_teams)
+            observed = task.observed_teams | {COORDINATOR_TEAM}
+            missing_teams = sorted(expected_teams - observed)
+            if missing_teams:
                 warnings.append(
-                    f"WARN [AUDIT_RULE_EVIDENCE_MISSING] task={task_id} missing_rules={','.join(missing_rules)}"
+                    f"WARN [AUDIT_TEAM_COVERAGE_MISSING] task={task_id} missing_required_teams={','.join(missing_teams)}"
                 )
-            missing_skills = sorted(expected_skills - observed_skills)
-            if missing_skills:
+
+            if len(observed) < args.min_teams:
                 warnings.append(
-                    f"WARN [AUDIT_SKILL_EVIDENCE_MISSING] task={task_id} missing_skills={','.join(missing_skills)}"
+                    f"WARN [AUDIT_DISTRIBUTION_LOW] task={task_id} observed_teams={len(observed)} min={args.min_teams}"
                 )
 
-        warnings.extend(approval_chain_warnings(task_id, task, status))
+            observed_rules, observed_skills = task.rules, task.skills
+            expected_rules, expected_skills = set(routing.rule_ids), set(routing.required_skills)
+            if status in {"in_review", "done"}:
+                missing_rules = sorted(expected_rules - observed_rules)
+                if missing_rules:
+                    warnings.append(
+                        f"WARN [AUDIT_RULE_EVIDENCE_MISSING] task={task_id} missing_rules={','.join(missing_rules)}"
+                    )
+                missing_skills = sorted(expected_skills - observed_skills)
+                if missing_skills:
+                    warnings.append(
+                        f"WARN [AUDIT_SKILL_EVIDENCE_MISSING] task={task_id} missing_skills={','.join(missing_skills)}"
+                    )
+
+            warnings.extend(approval_chain_warnings(task_id, task, routing.required_teams))
+
+            if args.verbose:
+                print(
+                    f"INFO [AUDIT_TASK] task={task_id} expected={sorted(expected_teams)} observed={sorted(observed)} "
+                    f"expected_rules={sorted(expected_rules)} observed_rules={sorted(observed_rules)} "
+                    f"expected_skills={sorted(expected_skills)} observed_skills={sorted(observed_skills)}"
+                )
+                for at, detail in timeline_entries(task):
+                    print(f"INFO [AUDIT_TIMELINE] task={task_id} at={at} {detail}")
 
-        if args.verbose:
-            print(
-                f"INFO [AUDIT_TASK] task={task_id} expected={sorted(expected_teams)} observed={sorted(observed)} "
-                f"expected_rules={sorted(expected_rules)} observed_rules={sorted(observed_rules)} "
-                f"expected_skills={sorted(expected_skills)} observed_skills={sorted(observed_skills)}"
-            )
-            for at, detail in timeline_entries(task):
-                print(f"INFO [AUDIT_TIMELINE] task={task_id} at={at} {detail}")
+        if trace is not None:
+            with metrics.phase("trace"):
+                trace.add_task(raw)
 
     log_files = [p for p in logs_dir.glob("*") if p.is_file()]
     if not log_files:
         warnings.append(f"WARN [AUDIT_EVIDENCE_LOGS_EMPTY] no log files under {logs_dir.as_posix()}")
 
+    metrics.gauge("log_files", len(log_files))
+    metrics.inc("cache_hits", CATALOG_CACHE_STATS["hits"])
+    metrics.inc("cache_misses", CATALOG_CACHE_STATS["misses"])
     if warnings:
         for warning in warnings:
             print(warning)
@@ -505,5 +308,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run_with_metrics("audit-takt-governance", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -40,6 +40,17 @@ if (-not (Test-Path -LiteralPath $targetRoot)) {
   New-Item -ItemType Directory -Path $targetRoot -Force | Out-Null
 }
 
+# Prefer the manifest-driven sync (writes only files whose template hash
+# changed and reports local edits); plain copy below is the no-Python fallback.
+$syncScript = Join-Path -Path $PSScriptRoot -ChildPath 'sync-template.py'
+$python = Get-Command python -ErrorAction SilentlyContinue
+if ($python -and (Test-Path -LiteralPath $syncScript)) {
+  $syncArgs = @('--target', $targetRoot)
+  if ($force) { $syncArgs += '--force' }
+  & $python.Source $syncScript @syncArgs
+  exit $LASTEXITCODE
+}
+
 $pathsToCopy = @(
   'at',
   'at.cmd',
@@ -33,6 +33,18 @@ template_root="$(cd "$script_dir/.." && pwd)"
 mkdir -p "$target"
 target_root="$(cd "$target" && pwd)"
 
+# Prefer the manifest-driven sync (writes only files whose template hash
+# changed and reports local edits); plain copy below is the no-Python fallback.
+for py_bin in python3 python; do
+  if command -v "$py_bin" >/dev/null 2>&1 && [[ -f "$script_dir/sync-template.py" ]]; then
+    sync_args=(--target "$target_root")
+    if [[ "$force" -eq 1 ]]; then
+      sync_args+=(--force)
+    fi
+    exec "$py_bin" "$script_dir/sync-template.py" "${sync_args[@]}"
+  fi
+done
+
 paths_to_copy=(
   "at"
   "at.cmd"
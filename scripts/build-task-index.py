@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sqlite3
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import EventLogError
+from agentteams_lib.taskindex import DEFAULT_DB, connect, sync
+from agentteams_lib.yamlio import load_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build or incrementally refresh the SQLite index of tasks, evidence and intake snapshots"
+    )
+    parser.add_argument("--tasks", default=".takt/tasks", help="task directory")
+    parser.add_argument(
+        "--control-plane", default=".takt/control-plane", help="control-plane root (catalogs, intake snapshots)"
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help="index database path")
+    parser.add_argument("--rebuild", action="store_true", help="discard the existing index and re-read every file")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    root = Path.cwd()
+    db_path = (root / args.db).resolve()
+    task_dir = (root / args.tasks).resolve()
+    if not task_dir.is_dir():
+        print(f"ERROR [INDEX_TASK_DIR_MISSING] {task_dir.as_posix()}")
+        return 1
+
+    if args.rebuild and db_path.exists():
+        db_path.unlink()
+    try:
+        with metrics.phase("sync"):
+            conn = connect(db_path)
+            try:
+                stats = sync(conn, root, task_dir, (root / args.control_plane).resolve(), load_yaml)
+            finally:
+                conn.close()
+    except (EventLogError, OSError, ValueError, sqlite3.Error, yaml.YAMLError) as exc:
+        print(f"ERROR [INDEX_BUILD_FAILED] detail={exc}")
+        return 1
+
+    for kind in ("task", "intake"):
+        metrics.gauge(f"{kind}_files", stats.scanned[kind])
+        metrics.gauge(f"{kind}_files_indexed", stats.indexed[kind])
+    metrics.gauge("files_unchanged", stats.unchanged)
+    metrics.gauge("files_removed", stats.removed)
+    print(
+        f"OK [INDEX_BUILD_DONE] db={db_path.as_posix()} tasks={stats.scanned['task']} "
+        f"intake_files={stats.scanned['intake']} indexed={stats.indexed['task'] + stats.indexed['intake']} "
+        f"unchanged={stats.unchanged} removed={stats.removed}"
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("build-task-index", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
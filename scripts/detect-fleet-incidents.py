@@ -12,10 +12,19 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.fsio import LockTimeout, control_plane_lock, write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.signals import SignalsReader
+from agentteams_lib.yamlio import add_output_format_argument, dumps, load_path
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Detect recurring incidents across projects")
-    parser.add_argument("--signals", default=".takt/control-plane/signals/latest.yaml", help="signals file")
+    parser.add_argument(
+        "--signals",
+        default=".takt/control-plane/signals",
+        help="signals directory (manifest.yaml), or a legacy latest.yaml file",
+    )
     parser.add_argument(
         "--min-projects",
         type=int,
@@ -27,33 +36,41 @@ def parse_args() -> argparse.Namespace:
         default=".takt/control-plane/signals/incidents-detected.yaml",
         help="output path",
     )
+    add_output_format_argument(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def main() -> int:
-    args = parse_args()
-    signals_path = Path(args.signals).resolve()
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    signals_arg = Path(args.signals).resolve()
     output_path = Path(args.output).resolve()
 
-    if not signals_path.exists():
-        print(f"ERROR [FLEET_INCIDENTS_SIGNALS_MISSING] {signals_path.as_posix()}")
-        return 1
-
     if args.min_projects < 1:
         print("ERROR [FLEET_INCIDENTS_CONFIG_INVALID] --min-projects must be >= 1")
         return 1
 
-    signals = load_yaml(signals_path)
-    counts = signals.get("fingerprint_project_counts")
+    cp_root = (signals_arg if signals_arg.is_dir() else signals_arg.parent).parent
+    try:
+        with control_plane_lock(cp_root, "signals", shared=True):
+            signals = SignalsReader(signals_arg, load_yaml)
+            counts = signals.section("fingerprint_project_counts")
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+    signals_path = signals.source
+
+    if not signals.exists:
+        print(f"ERROR [FLEET_INCIDENTS_SIGNALS_MISSING] {signals_path.as_posix()}")
+        return 1
+
     if not isinstance(counts, dict):
         print(f"ERROR [FLEET_INCIDENTS_SIGNALS_INVALID] missing fingerprint_project_counts in {signals_path.as_posix()}")
         return 1
@@ -78,9 +95,10 @@ def main() -> int:
         "recurring_incidents": recurring,
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(yaml.safe_dump(result, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    write_atomic(output_path, dumps(result, args.output_format))
 
+    metrics.gauge("fingerprints", len(counts))
+    metrics.gauge("recurring_incidents", len(recurring))
     if recurring:
         print(f"OK [FLEET_INCIDENTS_DETECTED] recurring={len(recurring)} output={output_path.as_posix()}")
     else:
@@ -88,5 +106,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run_with_metrics("detect-fleet-incidents", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
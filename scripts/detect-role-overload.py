@@ -12,18 +12,24 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.fsio import LockTimeout, control_plane_lock, write_atomic
+from agentteams_lib.intake import iter_snapshots
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.yamlio import add_output_format_argument, dumps, load_path
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Detect role overload candidates from intake metadata")
     parser.add_argument("--intake", default=".takt/control-plane/intake", help="intake root")
     parser.add_argument("--window-days", type=int, default=14, help="analysis window days")
     parser.add_argument("--output", default=".takt/control-plane/signals/overload-detected.yaml", help="output path")
+    add_output_format_argument(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
 def parse_utc(value: object) -> datetime | None:
@@ -80,8 +86,7 @@ def now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def main() -> int:
-    args = parse_args()
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
     intake_root = Path(args.intake).resolve()
     output_path = Path(args.output).resolve()
 
@@ -95,8 +100,20 @@ def main() -> int:
     cutoff = datetime.now(timezone.utc) - timedelta(days=args.window_days)
     latest_by_project: dict[str, dict] = {}
 
-    for intake_file in sorted(intake_root.glob("*/*.yaml")):
-        data = load_yaml(intake_file)
+    def parse(path: Path) -> dict:
+        with metrics.phase("parse"):
+            return load_yaml(path)
+
+    try:
+        with control_plane_lock(intake_root.parent, "intake", shared=True):
+            snapshots = list(iter_snapshots(intake_root, parse, since=cutoff))
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+    for snapshot in snapshots:
+        data = snapshot.data
+        metrics.inc("files_processed")
         project_id = str(data.get("project_id") or "").strip()
         captured_at = parse_utc(data.get("captured_at"))
         if not project_id or captured_at is None or captured_at < cutoff:
@@ -145,9 +162,11 @@ def main() -> int:
         "split_candidates": split_candidates,
     }
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(yaml.safe_dump(result, allow_unicode=True, sort_keys=False), encoding="utf-8")
+    write_atomic(output_path, dumps(result, args.output_format))
 
+    metrics.gauge("projects", len(latest_by_project))
+    metrics.gauge("overload_candidates", len(overload_candidates))
+    metrics.gauge("split_candidates", len(split_candidates))
     print(
         "OK [ROLE_OVERLOAD_ANALYZED] "
         f"overload_candidates={len(overload_candidates)} split_candidates={len(split_candidates)} "
@@ -156,5 +175,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run_with_metrics("detect-role-overload", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.catalog import CatalogConflict
+from agentteams_lib.fsio import LockTimeout, control_plane_lock
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.refreshqueue import PENDING_STATUSES, apply_actions, mark_applied, merge_actions, read_queue
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply every pending refresh-queue item to the catalogs in one batch"
+    )
+    parser.add_argument("--control-plane", default=".takt/control-plane", help="control-plane root path")
+    parser.add_argument(
+        "--refresh-id",
+        action="append",
+        default=[],
+        help="apply only this pending refresh (repeatable; default: all pending items)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report what would be applied without writing")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def apply_queue(args: argparse.Namespace, metrics: RunMetrics, cp_root: Path) -> int:
+    with metrics.phase("read_queue"):
+        try:
+            queue = read_queue(cp_root / "refresh-queue")
+        except (OSError, ValueError, yaml.YAMLError) as exc:
+            print(f"ERROR [FLEET_APPLY_QUEUE_FAILED] detail={exc}")
+            return 1
+    pending = [item for item in queue if item.status in PENDING_STATUSES]
+    if args.refresh_id:
+        unknown = sorted(set(args.refresh_id) - {item.refresh_id for item in pending})
+        if unknown:
+            print(f"ERROR [FLEET_APPLY_QUEUE_CONFIG_INVALID] not a pending refresh: {','.join(unknown)}")
+            return 1
+        pending = [item for item in pending if item.refresh_id in args.refresh_id]
+
+    metrics.gauge("queue_items", len(queue))
+    metrics.gauge("pending_items", len(pending))
+    if not pending:
+        print(f"OK [FLEET_APPLY_QUEUE_EMPTY] queue_items={len(queue)}")
+        return 0
+
+    merged = merge_actions([item.data for item in pending])
+    with metrics.phase("apply"), control_plane_lock(cp_root, "catalogs"):
+        try:
+            result = apply_actions(cp_root, merged, dry_run=args.dry_run)
+        except CatalogConflict as exc:
+            print(f"ERROR [CATALOG_CONFLICT] {exc}; queue items left pending, re-run to apply")
+            return 1
+        if not args.dry_run:
+            applied_at = now_iso()
+            for item in pending:
+                mark_applied(item, applied_at)
+
+    added = {kind: len(ids) for kind, ids in result.added.items()}
+    for kind, count in added.items():
+        metrics.gauge(f"{kind}_added", count)
+    metrics.gauge("catalog_updates", len(result.updated_files))
+    code = "FLEET_APPLY_QUEUE_PLANNED" if args.dry_run else "FLEET_APPLY_QUEUE_DONE"
+    print(
+        f"OK [{code}] refreshes={len(pending)} teams_added={added.get('team', 0)} "
+        f"rules_added={added.get('rule', 0)} skills_added={added.get('skill', 0)} "
+        f"catalog_updates={len(result.updated_files)} refresh_ids={','.join(item.refresh_id for item in pending)}"
+    )
+    return 0
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    cp_root = Path(args.control_plane).resolve()
+    if not cp_root.exists():
+        print(f"ERROR [FLEET_APPLY_QUEUE_CONTROL_PLANE_MISSING] {cp_root.as_posix()}")
+        return 1
+
+    # Same order as generate-refresh-pr: refresh-queue, then catalogs.
+    try:
+        with control_plane_lock(cp_root, "refresh-queue"):
+            return apply_queue(args, metrics, cp_root)
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+
+def main() -> int:
+    return run_with_metrics("fleet-apply-queue", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.fsio import LockTimeout, control_plane_lock
+from agentteams_lib.intake import ARCHIVE_DIR, content_hash, read_archive, stamp_of, write_archive
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.yamlio import load_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Roll old intake snapshots into per-project monthly archives")
+    parser.add_argument("--control-plane", default=".takt/control-plane", help="control-plane root path")
+    parser.add_argument("--keep-days", type=int, default=30, help="keep snapshots captured within this many days loose")
+    parser.add_argument("--keep-latest", type=int, default=1, help="always keep this many newest snapshots per project loose")
+    parser.add_argument("--project", action="append", default=[], help="limit to this project directory (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be archived without writing")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def compact_project(project_dir: Path, cutoff: datetime, keep_latest: int, dry_run: bool) -> dict:
+    result: dict = {key: 0 for key in ["compacted", "archives", "records", "stored", "bytes_before", "bytes_after"]}
+    result["skipped"] = []
+    stamped = []
+    for path in sorted(project_dir.glob("*.yaml")):
+        stamp = stamp_of(path.name)
+        if stamp is None:
+            result["skipped"].append(path.name)
+            continue
+        stamped.append((stamp, path))
+    stamped.sort()
+    candidates = [(stamp, path) for stamp, path in stamped[: max(len(stamped) - keep_latest, 0)] if stamp < cutoff]
+
+    by_month: dict[str, list[Path]] = {}
+    for stamp, path in candidates:
+        by_month.setdefault(stamp.strftime("%Y-%m"), []).append(path)
+
+    for month, paths in sorted(by_month.items()):
+        archive = project_dir / ARCHIVE_DIR / f"{month}.jsonl.gz"
+        records = {record["name"]: record for record in read_archive(archive)} if archive.exists() else {}
+        if archive.exists():
+            result["bytes_before"] += archive.stat().st_size
+        for path in paths:
+            data = load_yaml(path)
+            existing = records.get(path.name)
+            if existing is not None and content_hash(existing["data"]) != content_hash(data):
+                print(
+                    f"WARN [FLEET_COMPACT_REPLACED] {project_dir.name}/{path.name} "
+                    "(differs from the archived copy; archiving the loose file)"
+                )
+            records[path.name] = {"name": path.name, "data": data}
+            result["bytes_before"] += path.stat().st_size
+        result["compacted"] += len(paths)
+        result["archives"] += 1
+        if dry_run:
+            continue
+        result["stored"] += write_archive(archive, list(records.values()))
+        result["records"] += len(records)
+        result["bytes_after"] += archive.stat().st_size
+        if len(read_archive(archive)) != len(records):
+            raise OSError(f"archive verification failed: {archive.as_posix()}")
+        for path in paths:
+            path.unlink()
+    return result
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    intake_root = Path(args.control_plane).resolve() / "intake"
+    if not intake_root.exists():
+        print(f"ERROR [FLEET_COMPACT_INTAKE_MISSING] {intake_root.as_posix()}")
+        return 1
+    if args.keep_days < 0 or args.keep_latest < 0:
+        print("ERROR [FLEET_COMPACT_CONFIG_INVALID] --keep-days and --keep-latest must be >= 0")
+        return 1
+
+    project_dirs = sorted(path for path in intake_root.iterdir() if path.is_dir())
+    unknown = sorted(set(args.project) - {path.name for path in project_dirs})
+    if unknown:
+        print(f"ERROR [FLEET_COMPACT_CONFIG_INVALID] unknown intake project: {','.join(unknown)}")
+        return 1
+    if args.project:
+        project_dirs = [path for path in project_dirs if path.name in args.project]
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.keep_days)
+    totals = {"compacted": 0, "archives": 0, "records": 0, "stored": 0, "bytes_before": 0, "bytes_after": 0}
+    try:
+        with metrics.phase("compact"), control_plane_lock(intake_root.parent, "intake"):
+            for project_dir in project_dirs:
+                try:
+                    result = compact_project(project_dir, cutoff, args.keep_latest, args.dry_run)
+                except (OSError, ValueError) as exc:
+                    print(f"ERROR [FLEET_COMPACT_FAILED] project={project_dir.name} detail={exc}")
+                    return 1
+                for name in result["skipped"]:
+                    print(
+                        f"WARN [FLEET_COMPACT_SKIPPED] {project_dir.name}/{name} "
+                        "(file name is not a YYYYMMDDTHHMMSSZ stamp)"
+                    )
+                for key in totals:
+                    totals[key] += result[key]
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+    for key, value in totals.items():
+        metrics.gauge(key, value)
+    code = "FLEET_COMPACT_PLANNED" if args.dry_run else "FLEET_COMPACT_DONE"
+    print(
+        f"OK [{code}] projects={len(project_dirs)} compacted={totals['compacted']} archives={totals['archives']} "
+        f"archived_records={totals['records']} stored_bodies={totals['stored']} "
+        f"bytes_before={totals['bytes_before']} bytes_after={totals['bytes_after']}"
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("fleet-compact", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
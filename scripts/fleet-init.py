@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+from typing import TextIO
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.gitops import (
+    DEFAULT_URL_TEMPLATE,
+    CloneOptions,
+    GitError,
+    clone,
+    fast_forward,
+    is_git_worktree,
+    resolve_repo_url,
+)
+from agentteams_lib.fsio import write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bootstrap or upgrade every active project in the fleet registry")
+    parser.add_argument(
+        "--registry",
+        default=".takt/control-plane/registry/projects.yaml",
+        help="fleet registry file",
+    )
+    parser.add_argument("--workspace", default=".", help="directory holding one checkout per project")
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent project jobs")
+    parser.add_argument("--project", action="append", default=[], help="limit to this project_id (repeatable)")
+    parser.add_argument(
+        "--url-template",
+        default=DEFAULT_URL_TEMPLATE,
+        help="how to expand registry repo values without a scheme (default: https://{repo}.git)",
+    )
+    parser.add_argument("--logs", default="", help="per-project log directory (default: .takt/logs/fleet-init/<stamp>)")
+    parser.add_argument("--report", default="", help="write the result matrix as JSON")
+    parser.add_argument("--force", action="store_true", help="pass --force to the template sync")
+    parser.add_argument("--depth", type=int, default=0, help="shallow clone depth for new checkouts")
+    parser.add_argument("--filter", default="", help="partial clone filter for new checkouts (e.g. blob:none)")
+    parser.add_argument("--no-cache", action="store_true", help="clone directly instead of via the mirror cache")
+    parser.add_argument("--cache-dir", default="", help="mirror cache directory (default: $AGENTTEAMS_GIT_CACHE)")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    return data if isinstance(data, dict) else {}
+
+
+def now_stamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def new_run_dir(parent: Path) -> Path:
+    """A fresh ``<stamp>`` directory under ``parent``; runs started in the same second get ``<stamp>-2``, ``-3``, ..."""
+    parent.mkdir(parents=True, exist_ok=True)
+    stamp = now_stamp()
+    attempt = 1
+    while True:
+        path = parent / (stamp if attempt == 1 else f"{stamp}-{attempt}")
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            attempt += 1
+
+
+def plain_segment(value: str) -> bool:
+    """True when ``value`` names one entry inside a directory (no separators, not ``.`` or ``..``)."""
+    return value not in {".", ".."} and "/" not in value and "\\" not in value and Path(value).name == value
+
+
+def sync_project(
+    project: dict, args: argparse.Namespace, target: Path, log: TextIO, registry_dir: Path, result: dict
+) -> None:
+    """Clone or fast-forward ``target``, then run the template sync into it; fills in ``result``."""
+    project_id = project["project_id"]
+    result["action"] = "update" if is_git_worktree(target) else "clone"
+    try:
+        url = resolve_repo_url(project["repo"], args.url_template, registry_dir)
+        log.write(f"project={project_id} url={url} target={target.as_posix()} action={result['action']}\n")
+        if result["action"] == "clone":
+            if target.exists() and any(target.iterdir()):
+                raise GitError(f"target exists and is not a git checkout: {target.as_posix()}")
+            options = CloneOptions(not args.no_cache, args.cache_dir, args.depth, args.filter)
+            result["clone_method"] = clone(url, target, log, options)
+        else:
+            fast_forward(target, log)
+        result["git"] = "ok"
+    except GitError as exc:
+        result["git"] = "failed"
+        result["bootstrap"] = "skipped"
+        result["detail"] = str(exc)
+        return
+
+    template_root = Path(__file__).resolve().parent.parent
+    cmd = [sys.executable, str(template_root / "scripts" / "sync-template.py"), "--target", str(target)]
+    if args.force:
+        cmd.append("--force")
+    log.write(f"$ {' '.join(cmd)}\n")
+    log.flush()
+    proc = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    output = proc.stdout.strip()
+    if output:
+        log.write(output + "\n")
+    log.write(f"exit={proc.returncode}\n")
+    lines = output.splitlines()
+    if proc.returncode == 0:
+        result["bootstrap"] = "ok"
+        result["status"] = "ok"
+        result["detail"] = lines[-1] if lines else ""
+    else:
+        result["bootstrap"] = "failed"
+        result["detail"] = lines[-1] if lines else "sync-template failed"
+
+
+def run_project(project: dict, args: argparse.Namespace, workspace: Path, logs_dir: Path, registry_dir: Path) -> dict:
+    project_id = project["project_id"]
+    target = workspace / project_id
+    log_path = logs_dir / f"{project_id}.log"
+    result = {
+        "project_id": project_id,
+        "repo": project["repo"],
+        "target": target.as_posix(),
+        "action": "",
+        "git": "pending",
+        "clone_method": "",
+        "bootstrap": "pending",
+        "status": "failed",
+        "seconds": 0.0,
+        "log": log_path.as_posix(),
+        "detail": "",
+    }
+    started = time.perf_counter()
+    try:
+        with log_path.open("w", encoding="utf-8") as log:
+            sync_project(project, args, target, log, registry_dir, result)
+    except Exception as exc:  # one project's failure must not abort the fleet
+        # Whatever step was still pending is the one that failed; later steps never ran.
+        if result["git"] == "pending":
+            result["git"] = "failed"
+            result["bootstrap"] = "skipped"
+        elif result["bootstrap"] == "pending":
+            result["bootstrap"] = "failed"
+        result["status"] = "failed"
+        result["detail"] = f"{type(exc).__name__}: {exc}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def print_matrix(results: list[dict]) -> None:
+    headers = ["project_id", "action", "git", "bootstrap", "seconds", "status"]
+    rows = [[str(item[key]) for key in headers] for item in results]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(widths[i]) for i, h in enumerate(headers)))
+    for row in rows:
+        print("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)))
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    registry_path = Path(args.registry).resolve()
+    if not registry_path.exists():
+        print(f"ERROR [FLEET_INIT_REGISTRY_MISSING] {registry_path.as_posix()}")
+        return 1
+    if args.jobs < 1:
+        print("ERROR [FLEET_INIT_CONFIG_INVALID] --jobs must be >= 1")
+        return 1
+    if args.depth < 0:
+        print("ERROR [FLEET_INIT_CONFIG_INVALID] --depth must be >= 0")
+        return 1
+    try:
+        args.url_template.format(repo="x")
+    except (KeyError, IndexError, ValueError) as exc:
+        print(f"ERROR [FLEET_INIT_CONFIG_INVALID] --url-template must only use {{repo}}: {args.url_template} ({exc!r})")
+        return 1
+
+    registry = load_yaml(registry_path)
+    projects: list[dict] = []
+    for item in registry.get("projects") if isinstance(registry.get("projects"), list) else []:
+        if not isinstance(item, dict) or item.get("active") is not True:
+            continue
+        project_id = str(item.get("project_id") or "").strip()
+        repo = str(item.get("repo") or "").strip()
+        if not project_id or not repo:
+            continue
+        if args.project and project_id not in args.project:
+            continue
+        projects.append({"project_id": project_id, "repo": repo})
+
+    # project_id names the checkout and the log file, so it must not reach outside --workspace / the log directory.
+    unsafe = sorted(item["project_id"] for item in projects if not plain_segment(item["project_id"]))
+    if unsafe:
+        print(f"ERROR [FLEET_INIT_CONFIG_INVALID] project_id must be a plain directory name: {','.join(unsafe)}")
+        return 1
+    unknown = sorted(set(args.project) - {item["project_id"] for item in projects})
+    if unknown:
+        print(f"ERROR [FLEET_INIT_CONFIG_INVALID] unknown or inactive project: {','.join(unknown)}")
+        return 1
+    if not projects:
+        print(f"ERROR [FLEET_INIT_PROJECTS_EMPTY] no active projects in {registry_path.as_posix()}")
+        return 1
+
+    workspace = Path(args.workspace).expanduser().resolve()
+    workspace.mkdir(parents=True, exist_ok=True)
+    if args.logs:
+        logs_dir = Path(args.logs).resolve()
+        logs_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        # Never shared: two runs in the same second would overwrite each other's <project>.log.
+        logs_dir = new_run_dir(Path(".takt/logs/fleet-init").resolve())
+
+    with metrics.phase("projects"):
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(
+                pool.map(
+                    lambda project: run_project(project, args, workspace, logs_dir, registry_path.parent),
+                    projects,
+                )
+            )
+
+    print_matrix(results)
+    failed = [item for item in results if item["status"] != "ok"]
+    for item in failed:
+        print(
+            f"ERROR [FLEET_INIT_PROJECT_FAILED] project={item['project_id']} detail={item['detail']} log={item['log']}"
+        )
+
+    metrics.gauge("projects", len(results))
+    metrics.gauge("projects_failed", len(failed))
+    metrics.gauge("projects_cloned", sum(1 for item in results if item["action"] == "clone" and item["git"] == "ok"))
+
+    if args.report:
+        report = {"generated_at": now_stamp(), "workspace": workspace.as_posix(), "projects": results}
+        write_atomic(Path(args.report), json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+
+    summary = (
+        f"projects={len(results)} succeeded={len(results) - len(failed)} failed={len(failed)} "
+        f"logs={logs_dir.as_posix()}"
+    )
+    if failed:
+        print(f"ERROR [FLEET_INIT_FAILED] {summary}")
+        return 1
+    print(f"OK [FLEET_INIT_DONE] {summary}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("fleet-init", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
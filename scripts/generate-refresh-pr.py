@@ -15,6 +15,12 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.catalog import CatalogConflict
+from agentteams_lib.fsio import LockTimeout, control_plane_lock, write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.refreshqueue import apply_actions, mark_applied, merge_actions, read_item
+from agentteams_lib.yamlio import add_output_format_argument, dumps, load_path
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate control-plane refresh queue/proposal artifacts")
@@ -30,23 +36,34 @@ def parse_args() -> argparse.Namespace:
         help="overload detection output",
     )
     parser.add_argument("--apply-catalog-updates", action="store_true", help="apply generated updates to catalogs")
+    add_output_format_argument(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
     if not path.exists():
         return {}
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
-def dump_yaml(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+def dump_yaml(path: Path, data: dict, output_format: str = "yaml") -> None:
+    write_atomic(path, dumps(data, output_format))
 
 
 def now_stamp() -> str:
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    # Microsecond resolution: several workers can draft proposals within the same second.
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+
+
+def unique_stamp(cp_root: Path) -> str:
+    """A stamp no queue item or proposal uses yet (callers hold the refresh-queue lock)."""
+    while True:
+        stamp = now_stamp()
+        if not (cp_root / "refresh-queue" / f"R-{stamp}.yaml").exists() and not (
+            cp_root / "refresh-proposals" / f"RP-{stamp}.md"
+        ).exists():
+            return stamp
 
 
 def now_iso() -> str:
@@ -64,17 +81,6 @@ def ensure_list_map(data: dict, key: str) -> list[dict]:
     return []
 
 
-def append_unique_by_id(items: list[dict], id_key: str, candidate: dict) -> bool:
-    candidate_id = str(candidate.get(id_key) or "").strip()
-    if not candidate_id:
-        return False
-    for item in items:
-        if str(item.get(id_key) or "").strip() == candidate_id:
-            return False
-    items.append(candidate)
-    return True
-
-
 def canonicalize(value: object) -> object:
     if isinstance(value, dict):
         return {key: canonicalize(value[key]) for key in sorted(value)}
@@ -93,16 +99,10 @@ def findings_signature(findings: dict) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def main() -> int:
-    args = parse_args()
-    cp_root = Path(args.control_plane).resolve()
+def generate(args: argparse.Namespace, metrics: RunMetrics, cp_root: Path) -> int:
     incidents_path = Path(args.incidents).resolve()
     overload_path = Path(args.overload).resolve()
 
-    if not cp_root.exists():
-        print(f"ERROR [REFRESH_CONTROL_PLANE_MISSING] {cp_root.as_posix()}")
-        return 1
-
     incidents_data = load_yaml(incidents_path)
     overload_data = load_yaml(overload_path)
 
@@ -127,7 +127,7 @@ def main() -> int:
             )
             return 0
 
-    stamp = now_stamp()
+    stamp = unique_stamp(cp_root)
     refresh_id = f"R-{stamp}"
 
     team_updates: list[dict] = []
@@ -205,7 +205,7 @@ def main() -> int:
     }
 
     queue_path = cp_root / "refresh-queue" / f"{refresh_id}.yaml"
-    dump_yaml(queue_path, refresh_queue)
+    dump_yaml(queue_path, refresh_queue, args.output_format)
 
     proposal_path = cp_root / "refresh-proposals" / f"RP-{stamp}.md"
     proposal_lines = [
@@ -242,77 +242,26 @@ def main() -> int:
     proposal_lines.append("## Required Gates")
     proposal_lines.append("- qa_review")
     proposal_lines.append("- leader_gate")
-    proposal_path.parent.mkdir(parents=True, exist_ok=True)
-    proposal_path.write_text("\n".join(proposal_lines).strip() + "\n", encoding="utf-8")
+    write_atomic(proposal_path, "\n".join(proposal_lines).strip() + "\n")
 
     updated_files: list[str] = []
     if args.apply_catalog_updates:
-        teams_path = cp_root / "team-catalog" / "teams.yaml"
-        rules_path = cp_root / "rule-catalog" / "routing-rules.yaml"
-        skills_path = cp_root / "skill-catalog" / "skills.yaml"
-
-        teams_data = load_yaml(teams_path) or {"version": 1, "teams": []}
-        rules_data = load_yaml(rules_path) or {"version": 1, "rules": []}
-        skills_data = load_yaml(skills_path) or {"version": 1, "skills": []}
-
-        teams_list = ensure_list_map(teams_data, "teams")
-        rules_list = ensure_list_map(rules_data, "rules")
-        skills_list = ensure_list_map(skills_data, "skills")
-
-        team_changed = False
-        for item in team_updates:
-            if append_unique_by_id(teams_list, "team_id", item):
-                team_changed = True
-
-        rule_changed = False
-        for item in rule_updates:
-            if append_unique_by_id(rules_list, "rule_id", item):
-                rule_changed = True
-
-        skill_changed = False
-        for item in skill_updates:
-            if append_unique_by_id(skills_list, "skill_id", item):
-                skill_changed = True
-
-        if team_changed:
-            teams_data["teams"] = teams_list
-            dump_yaml(teams_path, teams_data)
-            updated_files.append(teams_path.as_posix())
-        if rule_changed:
-            rules_data["rules"] = rules_list
-            dump_yaml(rules_path, rules_data)
-            updated_files.append(rules_path.as_posix())
-        if skill_changed:
-            skills_data["skills"] = skills_list
-            dump_yaml(skills_path, skills_data)
-            updated_files.append(skills_path.as_posix())
-
-        for skill in skill_updates:
-            skill_id = str(skill.get("skill_id") or "").strip()
-            if not skill_id:
-                continue
-            skill_doc = cp_root.parent / "skills" / f"{skill_id}.md"
-            if skill_doc.exists():
-                continue
-            skill_doc.parent.mkdir(parents=True, exist_ok=True)
-            skill_doc.write_text(
-                "\n".join(
-                    [
-                        f"# Skill: {skill_id}",
-                        "",
-                        "Generated by auto refresh proposal.",
-                        "",
-                        "Checklist:",
-                        "- verify proposed scope",
-                        "- validate evidence collection requirements",
-                        f"- include `skill:{skill_id}` in declarations",
-                    ]
-                )
-                + "\n",
-                encoding="utf-8",
-            )
-            updated_files.append(skill_doc.as_posix())
-
+        with control_plane_lock(cp_root, "catalogs"):
+            item = read_item(queue_path)
+            try:
+                result = apply_actions(cp_root, merge_actions([item.data]))
+            except CatalogConflict as exc:
+                print(f"ERROR [CATALOG_CONFLICT] {exc}; {refresh_id} left pending for fleet apply-queue")
+                return 1
+            mark_applied(item, now_iso())
+            updated_files = result.updated_files
+
+    metrics.gauge("recurring_incidents", len(recurring))
+    metrics.gauge("split_candidates", len(split_candidates))
+    metrics.gauge("team_updates", len(team_updates))
+    metrics.gauge("rule_updates", len(rule_updates))
+    metrics.gauge("skill_updates", len(skill_updates))
+    metrics.gauge("catalog_updates", len(updated_files))
     print(
         "OK [REFRESH_PROPOSAL_GENERATED] "
         f"refresh_id={refresh_id} queue={queue_path.as_posix()} proposal={proposal_path.as_posix()} "
@@ -321,5 +270,24 @@ def main() -> int:
     return 0
 
 
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    cp_root = Path(args.control_plane).resolve()
+    if not cp_root.exists():
+        print(f"ERROR [REFRESH_CONTROL_PLANE_MISSING] {cp_root.as_posix()}")
+        return 1
+
+    # The duplicate check, the new queue item and the catalog merge must see one consistent state.
+    try:
+        with control_plane_lock(cp_root, "refresh-queue"):
+            return generate(args, metrics, cp_root)
+    except LockTimeout as exc:
+        print(f"ERROR [CONTROL_PLANE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+
+def main() -> int:
+    return run_with_metrics("generate-refresh-pr", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
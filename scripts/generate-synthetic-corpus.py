@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+import shutil
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.signals import write_signals
+
+STATUSES = ["todo", "in_progress", "in_review", "blocked", "done"]
+DOMAIN_TEAMS = {
+    "backend": ["backend-implementation", "security-review"],
+    "frontend": ["frontend-implementation", "ux-review"],
+    "documentation-guild": ["docs-sync", "api-docs"],
+    "innovation-research-guild": ["research", "exploration"],
+}
+TASK_BASE_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+GATE_CONTROLS = [
+    "piece:agentteams-governance",
+    "rule:team-leader-approval-required",
+    "skill:skill-team-leader-gate",
+]
+QA_CONTROLS = ["piece:agentteams-governance", "rule:qa-required", "skill:skill-qa-regression-trace"]
+LEADER_CONTROLS = ["piece:agentteams-governance", "rule:default-routing", "skill:skill-routing-governance"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic task/fleet corpus for benchmarks")
+    parser.add_argument("--output", required=True, help="corpus root directory")
+    parser.add_argument("--tasks", type=int, default=500, help="number of task files")
+    parser.add_argument("--projects", type=int, default=50, help="number of registered fleet projects")
+    parser.add_argument("--snapshots", type=int, default=20, help="intake snapshots per project")
+    parser.add_argument("--catalog-size", type=int, default=200, help="synthetic entries per team/rule/skill catalog")
+    parser.add_argument("--max-extra-declarations", type=int, default=12, help="upper bound of extra declarations per task")
+    parser.add_argument("--max-gate-history", type=int, default=4, help="upper bound of superseded gates per team")
+    parser.add_argument("--snapshot-interval-hours", type=int, default=6, help="hours between intake snapshots")
+    parser.add_argument("--seed", type=int, default=26, help="random seed")
+    parser.add_argument("--force", action="store_true", help="replace an existing corpus under --output")
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    return data if isinstance(data, dict) else {}
+
+
+def dump_yaml(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
+
+
+def iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def as_list(value: object) -> list:
+    return value if isinstance(value, list) else []
+
+
+def string_set(values: object) -> set[str]:
+    return {str(v).strip() for v in as_list(values) if str(v).strip()}
+
+
+def expected_evidence(status: str, teams: list[str], tags: list[str], rules: list[dict], skills: list[dict]) -> list[str]:
+    team_set = set(teams) | {"coordinator"}
+    tag_set = set(tags)
+    controls: list[str] = []
+
+    for rule in rules:
+        if not bool(rule.get("enabled", False)):
+            continue
+        when = rule.get("when") if isinstance(rule.get("when"), dict) else {}
+        statuses = string_set(when.get("any_status"))
+        if statuses and status not in statuses:
+            continue
+        rule_tags = string_set(when.get("capability_tags"))
+        if rule_tags and not tag_set.intersection(rule_tags):
+            continue
+        controls.append(f"rule:{rule.get('rule_id')}")
+        controls.extend(f"skill:{skill}" for skill in string_set(rule.get("require_skills")))
+
+    for skill in skills:
+        if not bool(skill.get("enabled", False)):
+            continue
+        applies = string_set(skill.get("applies_to_teams"))
+        if applies and not team_set.intersection(applies):
+            continue
+        trigger = skill.get("trigger") if isinstance(skill.get("trigger"), dict) else {}
+        trigger_tags = string_set(trigger.get("capability_tags"))
+        if trigger_tags and tag_set and not tag_set.intersection(trigger_tags):
+            continue
+        controls.append(f"skill:{skill.get('skill_id')}")
+
+    return sorted(set(controls))
+
+
+def build_task(index: int, rng: random.Random, args: argparse.Namespace, rules: list[dict], skills: list[dict]) -> dict:
+    status = STATUSES[index % len(STATUSES)]
+    domains = rng.sample(sorted(DOMAIN_TEAMS), rng.randint(1, 3))
+    required_teams = ["coordinator", *domains, "qa-review-guild"]
+    capability_tags = ["routing", "qa-review"]
+    for team in domains:
+        capability_tags.extend(DOMAIN_TEAMS[team])
+
+    clock = TASK_BASE_AT + timedelta(hours=index)
+
+    def tick(minutes: int = 1) -> str:
+        nonlocal clock
+        clock += timedelta(minutes=minutes)
+        return iso(clock)
+
+    declarations: list[dict] = [
+        {
+            "at": tick(),
+            "team": "coordinator",
+            "role": "coordinator",
+            "action": "triage",
+            "what": "decompose task and assign required teams",
+            "controlled_by": [
+                "piece:agentteams-governance",
+                *expected_evidence(status, required_teams, capability_tags, rules, skills),
+            ],
+        }
+    ]
+    handoffs: list[dict] = []
+    previous = "coordinator/coordinator"
+    for team in required_teams[1:]:
+        handoffs.append(
+            {
+                "from": previous,
+                "to": f"{team}/member",
+                "at": tick(),
+                "memo": f"synthetic handoff to {team}",
+            }
+        )
+        declarations.append(
+            {
+                "at": tick(),
+                "team": team,
+                "role": "member",
+                "action": "execute",
+                "what": f"synthetic execution by {team}",
+                "controlled_by": ["piece:agentteams-governance", "rule:default-routing"],
+            }
+        )
+        previous = f"{team}/member"
+
+    for _ in range(rng.randint(0, max(args.max_extra_declarations, 0))):
+        team = rng.choice(required_teams)
+        declarations.append(
+            {
+                "at": tick(),
+                "team": team,
+                "role": "member",
+                "action": "progress_update",
+                "what": f"synthetic progress note from {team}",
+                "controlled_by": ["piece:agentteams-governance", "rule:default-routing"],
+            }
+        )
+
+    reviewed = status in {"in_review", "done"}
+    team_leader_gates: list[dict] = []
+    for team in required_teams:
+        if team == "qa-review-guild":
+            continue
+        for _ in range(rng.randint(0, max(args.max_gate_history, 0))):
+            team_leader_gates.append(
+                {
+                    "team": team,
+                    "leader_role": "team-lead",
+                    "status": "pending",
+                    "at": tick(),
+                    "note": "synthetic superseded gate",
+                    "controlled_by": list(GATE_CONTROLS),
+                }
+            )
+        final_status = "approved" if reviewed else rng.choice(["pending", "approved"])
+        if status == "in_progress" and rng.random() < 0.2:
+            final_status = "rejected"
+        team_leader_gates.append(
+            {
+                "team": team,
+                "leader_role": "team-lead",
+                "status": final_status,
+                "at": tick(),
+                "note": "synthetic gate decision",
+                "controlled_by": list(GATE_CONTROLS),
+            }
+        )
+        if final_status == "rejected":
+            declarations.append(
+                {
+                    "at": tick(),
+                    "team": team,
+                    "role": "member",
+                    "action": "rework",
+                    "what": "address synthetic rejection",
+                    "controlled_by": ["piece:agentteams-governance", "rule:default-routing"],
+                }
+            )
+
+    qa_gate = {
+        "by": "qa-review-guild/lead-reviewer",
+        "status": "approved" if reviewed else "pending",
+        "at": tick(),
+        "note": "synthetic qa gate",
+        "controlled_by": list(QA_CONTROLS),
+    }
+    leader_gate = {
+        "by": "leader/overall-lead",
+        "status": "approved" if status == "done" else "pending",
+        "at": tick(),
+        "note": "synthetic leader gate",
+        "controlled_by": list(LEADER_CONTROLS),
+    }
+
+    return {
+        "id": f"T-{index:05d}",
+        "title": f"synthetic-task-{index:05d}",
+        "status": status,
+        "task": f"Synthetic benchmark task {index:05d}",
+        "goal": "",
+        "constraints": [],
+        "acceptance": [],
+        "routing": {"required_teams": required_teams, "capability_tags": capability_tags},
+        "warnings": [],
+        "declarations": declarations,
+        "handoffs": handoffs,
+        "approvals": {"team_leader_gates": team_leader_gates, "qa_gate": qa_gate, "leader_gate": leader_gate},
+        "notes": "",
+        "updated_at": iso(clock),
+    }
+
+
+def extend_catalogs(cp_root: Path, skills_dir: Path, template_cp: Path, size: int) -> tuple[list[dict], list[dict]]:
+    teams_data = load_yaml(template_cp / "team-catalog" / "teams.yaml") or {"version": 1, "teams": []}
+    rules_data = load_yaml(template_cp / "rule-catalog" / "routing-rules.yaml") or {"version": 1, "rules": []}
+    skills_data = load_yaml(template_cp / "skill-catalog" / "skills.yaml") or {"version": 1, "skills": []}
+
+    teams = [item for item in as_list(teams_data.get("teams")) if isinstance(item, dict)]
+    rules = [item for item in as_list(rules_data.get("rules")) if isinstance(item, dict)]
+    skills = [item for item in as_list(skills_data.get("skills")) if isinstance(item, dict)]
+
+    for index in range(size):
+        team_id = f"team-synth-{index:05d}"
+        skill_id = f"skill-synth-{index:05d}"
+        tag = f"synth-tag-{index:05d}"
+        teams.append(
+            {
+                "team_id": team_id,
+                "mission": f"synthetic benchmark team {index:05d}",
+                "owned_capabilities": [tag],
+                "slo_targets": {"queue_p95_hours": 24, "lead_time_p50_hours": 48},
+                "persona_ref": ".takt/personas/implementer.md",
+                "policy_refs": [".takt/policies/governance.md"],
+                "skill_refs": [skill_id],
+                "active": index % 2 == 0,
+            }
+        )
+        rules.append(
+            {
+                "rule_id": f"synth-rule-{index:05d}",
+                "when": {"capability_tags": [tag]},
+                "require_teams": [team_id],
+                "require_skills": [skill_id],
+                "priority": 50,
+                "enabled": index % 3 != 0,
+            }
+        )
+        skills.append(
+            {
+                "skill_id": skill_id,
+                "description": f"synthetic benchmark skill {index:05d}",
+                "applies_to_teams": [team_id],
+                "trigger": {"capability_tags": [tag]},
+                "instruction_ref": f".takt/skills/{skill_id}.md",
+                "policy_refs": [".takt/policies/governance.md"],
+                "evidence_requirements": [f"declarations controlled_by must include skill:{skill_id}"],
+                "enabled": index % 3 != 0,
+            }
+        )
+
+    teams_data["teams"] = teams
+    rules_data["rules"] = rules
+    skills_data["skills"] = skills
+    dump_yaml(cp_root / "team-catalog" / "teams.yaml", teams_data)
+    dump_yaml(cp_root / "rule-catalog" / "routing-rules.yaml", rules_data)
+    dump_yaml(cp_root / "skill-catalog" / "skills.yaml", skills_data)
+
+    skills_dir.mkdir(parents=True, exist_ok=True)
+    for skill in skills:
+        skill_id = str(skill.get("skill_id") or "").strip()
+        if skill_id:
+            (skills_dir / f"{skill_id}.md").write_text(f"# Skill: {skill_id}\n", encoding="utf-8")
+    return rules, skills
+
+
+def write_fleet(cp_root: Path, rng: random.Random, args: argparse.Namespace) -> int:
+    anchor = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    fingerprint_pool = [f"fp-synth-{index:04d}" for index in range(max(5, args.projects // 4))]
+    capability_pool = sorted({tag for tags in DOMAIN_TEAMS.values() for tag in tags})
+
+    projects: list[dict] = []
+    written = 0
+    for p_index in range(args.projects):
+        project_id = f"synth-project-{p_index:04d}"
+        repo = f"github.com/synthetic/{project_id}"
+        projects.append({"project_id": project_id, "repo": repo, "active": p_index % 10 != 9, "owner": "synthetic"})
+        for k_index in range(args.snapshots):
+            captured_at = anchor - timedelta(hours=k_index * max(args.snapshot_interval_hours, 1), minutes=p_index % 60)
+            fingerprints = [
+                {
+                    "hash": fp,
+                    "error_class": "synthetic_failure",
+                    "failing_step": "qa_review",
+                    "policy": "quality",
+                    "rule_id": "qa-required",
+                }
+                for fp in rng.sample(fingerprint_pool, rng.randint(0, 2))
+            ]
+            overlaps = [
+                {"capability": capability, "responsibility_overlap_ratio": round(rng.uniform(0.05, 0.6), 2)}
+                for capability in rng.sample(capability_pool, 2)
+            ]
+            intake = {
+                "project_id": project_id,
+                "repo": repo,
+                "captured_at": iso(captured_at),
+                "window_days": 14,
+                "task_counts": {status: rng.randint(0, 20) for status in STATUSES},
+                "lead_time_p50_hours": round(rng.uniform(10, 80), 1),
+                "queue_p95_hours": round(rng.uniform(5, 40), 1),
+                "rework_rate": round(rng.uniform(0, 0.5), 2),
+                "blocked_ratio": round(rng.uniform(0, 0.4), 2),
+                "incident_fingerprints": fingerprints,
+                "policy_failures": [],
+                "top_overlaps": overlaps,
+            }
+            stamp = captured_at.strftime("%Y%m%dT%H%M%SZ")
+            dump_yaml(cp_root / "intake" / project_id / f"{stamp}.yaml", intake)
+            written += 1
+
+    dump_yaml(
+        cp_root / "registry" / "projects.yaml",
+        {
+            "version": 1,
+            "control_plane": {"enabled": True, "fleet_detection_mode": "event_driven", "periodic_schedule": False},
+            "projects": projects,
+        },
+    )
+    write_signals(
+        cp_root / "signals",
+        {
+            "generated_at": iso(anchor),
+            "window_days": 14,
+            "projects": [],
+            "fingerprint_project_counts": {},
+            "overload_candidates": [],
+        },
+        lambda data: yaml.safe_dump(data, allow_unicode=True, sort_keys=False),
+        load_yaml,
+    )
+    (cp_root / "refresh-queue").mkdir(parents=True, exist_ok=True)
+    (cp_root / "refresh-proposals").mkdir(parents=True, exist_ok=True)
+    return written
+
+
+def main() -> int:
+    args = parse_args()
+    if min(args.tasks, args.projects, args.snapshots) < 1 or args.catalog_size < 0:
+        print("ERROR [CORPUS_CONFIG_INVALID] --tasks/--projects/--snapshots must be >= 1 and --catalog-size >= 0")
+        return 1
+
+    template_root = Path(__file__).resolve().parent.parent
+    output_root = Path(args.output).resolve()
+    takt_root = output_root / ".takt"
+    if takt_root.exists():
+        if not args.force:
+            print(f"ERROR [CORPUS_OUTPUT_EXISTS] {takt_root.as_posix()} (use --force to replace)")
+            return 1
+        shutil.rmtree(takt_root)
+
+    rng = random.Random(args.seed)
+    cp_root = takt_root / "control-plane"
+    rules, skills = extend_catalogs(
+        cp_root, takt_root / "skills", template_root / ".takt" / "control-plane", args.catalog_size
+    )
+
+    tasks_dir = takt_root / "tasks"
+    for index in range(1, args.tasks + 1):
+        task = build_task(index, rng, args, rules, skills)
+        dump_yaml(tasks_dir / f"TASK-{index:05d}-synthetic.yaml", task)
+
+    logs_dir = takt_root / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    (logs_dir / "synthetic-corpus.log").write_text(f"seed={args.seed}\n", encoding="utf-8")
+
+    intake_count = write_fleet(cp_root, rng, args)
+
+    print(
+        "OK [CORPUS_GENERATED] "
+        f"output={output_root.as_posix()} tasks={args.tasks} projects={args.projects} "
+        f"intake_files={intake_count} catalog_size={args.catalog_size} seed={args.seed}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sqlite3
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskindex import DEFAULT_DB, QUERIES, connect, run_query
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query the task index built by build-task-index.py",
+        epilog="canned queries: "
+        + "; ".join(
+            f"{name}{''.join(f' --param {param}=<value>' for param in params)} ({description})"
+            for name, (description, params, _) in QUERIES.items()
+        ),
+    )
+    parser.add_argument("query", nargs="?", default="", help=f"canned query: {', '.join(QUERIES)}")
+    parser.add_argument("--param", action="append", default=[], help="query parameter name=value (repeatable)")
+    parser.add_argument("--sql", default="", help="ad-hoc read-only SQL (parameters bind as :name)")
+    parser.add_argument("--db", default=DEFAULT_DB, help="index database path")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="output format")
+    parser.add_argument("--list", action="store_true", help="list canned queries and index tables")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    if args.list:
+        for name, (description, params, _) in QUERIES.items():
+            print(f"OK [QUERY_CANNED] name={name} params={','.join(params) or '-'} description={description}")
+        return 0
+    if bool(args.query) == bool(args.sql):
+        print("ERROR [QUERY_CONFIG_INVALID] pass one canned query name or --sql <statement> (see --list)")
+        return 1
+    if args.query and args.query not in QUERIES:
+        print(f"ERROR [QUERY_CONFIG_INVALID] unknown query: {args.query} (known: {', '.join(QUERIES)})")
+        return 1
+
+    params: dict[str, str] = {}
+    for item in args.param:
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            print(f"ERROR [QUERY_CONFIG_INVALID] --param must be name=value: {item}")
+            return 1
+        params[name.strip()] = value
+    sql = args.sql
+    if args.query:
+        _, required, sql = QUERIES[args.query]
+        missing = [name for name in required if name not in params]
+        if missing:
+            needs = " ".join(f"--param {name}=<value>" for name in missing)
+            print(f"ERROR [QUERY_CONFIG_INVALID] {args.query} needs {needs}")
+            return 1
+
+    db_path = Path(args.db).resolve()
+    if not db_path.exists():
+        print(f"ERROR [INDEX_MISSING] {db_path.as_posix()}")
+        print("Next: agentteams index build")
+        return 1
+    try:
+        with metrics.phase("query"):
+            conn = connect(db_path, read_only=True)
+            try:
+                columns, rows = run_query(conn, sql, params)
+            finally:
+                conn.close()
+    except sqlite3.Error as exc:
+        print(f"ERROR [QUERY_FAILED] detail={exc}")
+        return 1
+    metrics.gauge("rows", len(rows))
+
+    name = args.query or "sql"
+    if args.format == "json":
+        payload = {"query": name, "columns": columns, "rows": [dict(zip(columns, row)) for row in rows]}
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+    for row in rows:
+        print("OK [QUERY_ROW] " + " ".join(f"{column}={'-' if value is None else value}" for column, value in zip(columns, row)))
+    print(f"OK [QUERY_DONE] query={name} rows={len(rows)}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("query-task-index", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
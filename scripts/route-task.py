@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.routing import RoutingTable
+from agentteams_lib.taskevents import EventLogError, events_path, materialize
+from agentteams_lib.tasklayout import task_files
+from agentteams_lib.yamlio import load_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Preview rule-catalog routing (rules, required teams and skills) for task files"
+    )
+    parser.add_argument("--task-file", action="append", default=[], help="task file to route (repeatable)")
+    parser.add_argument("--path", default="", help="route every TASK-*.yaml under this directory (partitions included)")
+    parser.add_argument("--control-plane", default=".takt/control-plane", help="control-plane root")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="output format")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    files = [Path(item).resolve() for item in args.task_file]
+    if args.path:
+        task_dir = Path(args.path).resolve()
+        if not task_dir.is_dir():
+            print(f"ERROR [ROUTE_TASK_DIR_MISSING] {task_dir.as_posix()}")
+            return 1
+        files.extend(task_files(task_dir))
+    if not files:
+        print("ERROR [ROUTE_TASK_MISSING] pass --task-file <path> or --path <dir>")
+        return 1
+    missing = [path.as_posix() for path in files if not path.is_file()]
+    if missing:
+        print(f"ERROR [ROUTE_TASK_MISSING] task file not found: {','.join(missing)}")
+        return 1
+
+    with metrics.phase("compile"):
+        table = RoutingTable.load(Path(args.control_plane).resolve(), load_yaml)
+    metrics.gauge("rules", len(table.rules))
+    metrics.gauge("skills", len(table.skills))
+
+    results = []
+    derived = 0
+    for path in files:
+        with metrics.phase("parse"):
+            task = load_yaml(path)
+            try:
+                task, _ = materialize(task, events_path(path.parent, str(task.get("id") or "")))
+            except EventLogError as exc:
+                print(f"ERROR [ROUTE_TASK_INVALID] {exc}")
+                return 1
+        with metrics.phase("route"):
+            decision = table.route(task)
+        derived += 1 if decision.derived_teams else 0
+        results.append((path, decision))
+    metrics.gauge("tasks", len(results))
+    metrics.gauge("tasks_with_derived_teams", derived)
+
+    if args.format == "json":
+        payload = {"tasks": [dict(task=path.as_posix(), **decision.as_dict()) for path, decision in results]}
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+
+    for path, decision in results:
+        print(
+            f"OK [ROUTE] task={path.as_posix()} status={decision.status or '-'} "
+            f"rules={','.join(decision.rule_ids) or '-'} "
+            f"required_teams={','.join(decision.required_teams) or '-'} "
+            f"derived_teams={','.join(decision.derived_teams) or '-'} "
+            f"required_skills={','.join(decision.required_skills) or '-'}"
+        )
+    print(f"OK [ROUTE_DONE] tasks={len(results)} rules={len(table.rules)} tasks_with_derived_teams={derived}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("route-task", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CONTROL_PLANE = ".takt/control-plane"
+CATALOG_FILES = [
+    "team-catalog/teams.yaml",
+    "rule-catalog/routing-rules.yaml",
+    "skill-catalog/skills.yaml",
+]
+BENCH_CASES: list[tuple[str, str, list[str]]] = [
+    ("validate-takt-task", "validate-takt-task.py", ["--path", ".takt/tasks"]),
+    ("validate-takt-evidence", "validate-takt-evidence.py", ["--allow-empty-logs"]),
+    ("audit-takt-governance", "audit-takt-governance.py", ["--strict"]),
+    ("validate-control-plane-schema", "validate-control-plane-schema.py", ["--path", CONTROL_PLANE]),
+    ("aggregate-fleet-signals", "aggregate-fleet-signals.py", ["--control-plane", CONTROL_PLANE]),
+    ("detect-fleet-incidents", "detect-fleet-incidents.py", []),
+    ("detect-role-overload", "detect-role-overload.py", []),
+    ("generate-refresh-pr", "generate-refresh-pr.py", ["--control-plane", CONTROL_PLANE, "--apply-catalog-updates"]),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark AgentTeams scripts against a synthetic corpus")
+    parser.add_argument("--corpus", default="", help="existing corpus root (generated into a temp dir when empty)")
+    parser.add_argument("--tasks", type=int, default=500, help="synthetic task count")
+    parser.add_argument("--projects", type=int, default=50, help="synthetic project count")
+    parser.add_argument("--snapshots", type=int, default=20, help="intake snapshots per project")
+    parser.add_argument("--catalog-size", type=int, default=200, help="synthetic entries per catalog")
+    parser.add_argument("--seed", type=int, default=26, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (median is reported)")
+    parser.add_argument("--case", action="append", default=[], help="run only the named case (repeatable)")
+    parser.add_argument("--output", default=".takt/logs/bench/latest.json", help="result JSON path")
+    parser.add_argument("--baseline", default=".takt/bench/baseline.json", help="baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio before flagging")
+    parser.add_argument(
+        "--min-delta-seconds",
+        type=float,
+        default=0.05,
+        help="ignore slowdowns smaller than this absolute delta",
+    )
+    parser.add_argument("--keep-corpus", action="store_true", help="keep the generated temp corpus")
+    return parser.parse_args()
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def link_scripts(scripts_dir: Path, corpus_root: Path) -> None:
+    # validate-takt-evidence.py resolves the audit script from the working directory.
+    target = corpus_root / "scripts"
+    if target.exists() or target.is_symlink():
+        return
+    try:
+        target.symlink_to(scripts_dir, target_is_directory=True)
+    except OSError:
+        shutil.copytree(scripts_dir, target, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+
+
+def snapshot_catalogs(corpus_root: Path) -> dict[str, bytes]:
+    cp_root = corpus_root / CONTROL_PLANE
+    saved: dict[str, bytes] = {}
+    for rel in CATALOG_FILES:
+        path = cp_root / rel
+        if path.exists():
+            saved[rel] = path.read_bytes()
+    return saved
+
+
+def reset_refresh_state(corpus_root: Path, catalogs: dict[str, bytes]) -> None:
+    cp_root = corpus_root / CONTROL_PLANE
+    for rel, content in catalogs.items():
+        (cp_root / rel).write_bytes(content)
+    for dirname in ["refresh-queue", "refresh-proposals"]:
+        directory = cp_root / dirname
+        if not directory.exists():
+            continue
+        for item in directory.iterdir():
+            if item.is_file() and item.name != ".gitkeep":
+                item.unlink()
+
+
+def run_case(scripts_dir: Path, corpus_root: Path, script: str, args: list[str]) -> tuple[int, float, str]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(scripts_dir / script), *args],
+        cwd=str(corpus_root),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    elapsed = time.perf_counter() - started
+    return proc.returncode, elapsed, proc.stdout.strip()
+
+
+def load_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def compare_with_baseline(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    regressions: list[str] = []
+    baseline_cases = baseline.get("cases") if isinstance(baseline.get("cases"), dict) else {}
+    for name, current in results.items():
+        previous = baseline_cases.get(name)
+        if not isinstance(previous, dict):
+            continue
+        before = previous.get("median_seconds")
+        after = current.get("median_seconds")
+        if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or before <= 0:
+            continue
+        ratio = after / before
+        current["baseline_median_seconds"] = before
+        current["ratio_to_baseline"] = round(ratio, 4)
+        if ratio > 1 + threshold and (after - before) > min_delta:
+            regressions.append(
+                f"case={name} median={after:.4f}s baseline={before:.4f}s ratio={ratio:.2f} threshold={1 + threshold:.2f}"
+            )
+    return regressions
+
+
+def main() -> int:
+    args = parse_args()
+    if args.repeat < 1:
+        print("ERROR [BENCH_CONFIG_INVALID] --repeat must be >= 1")
+        return 1
+    if args.threshold < 0:
+        print("ERROR [BENCH_CONFIG_INVALID] --threshold must be >= 0")
+        return 1
+
+    known_cases = {name for name, _, _ in BENCH_CASES}
+    unknown = sorted(set(args.case) - known_cases)
+    if unknown:
+        print(f"ERROR [BENCH_CONFIG_INVALID] unknown case: {','.join(unknown)}")
+        print(f"Allowed cases: {','.join(name for name, _, _ in BENCH_CASES)}")
+        return 1
+
+    scripts_dir = Path(__file__).resolve().parent
+    temp_root: Path | None = None
+    corpus_params: dict = {}
+    if args.corpus:
+        corpus_root = Path(args.corpus).resolve()
+        if not (corpus_root / ".takt").exists():
+            print(f"ERROR [BENCH_CORPUS_MISSING] {corpus_root.as_posix()}")
+            return 1
+        corpus_params = {"path": corpus_root.as_posix(), "generated": False}
+    else:
+        temp_root = Path(tempfile.mkdtemp(prefix="agentteams-bench-"))
+        corpus_root = temp_root
+        corpus_params = {
+            "generated": True,
+            "tasks": args.tasks,
+            "projects": args.projects,
+            "snapshots": args.snapshots,
+            "catalog_size": args.catalog_size,
+            "seed": args.seed,
+        }
+        code, elapsed, output = run_case(
+            scripts_dir,
+            corpus_root,
+            "generate-synthetic-corpus.py",
+            [
+                "--output",
+                str(corpus_root),
+                "--tasks",
+                str(args.tasks),
+                "--projects",
+                str(args.projects),
+                "--snapshots",
+                str(args.snapshots),
+                "--catalog-size",
+                str(args.catalog_size),
+                "--seed",
+                str(args.seed),
+            ],
+        )
+        if output:
+            print(output)
+        if code != 0:
+            print("ERROR [BENCH_CORPUS_FAILED] synthetic corpus generation failed")
+            return 1
+        corpus_params["generate_seconds"] = round(elapsed, 4)
+
+    link_scripts(scripts_dir, corpus_root)
+    catalogs = snapshot_catalogs(corpus_root)
+
+    results: dict[str, dict] = {}
+    failures: list[str] = []
+    try:
+        for name, script, script_args in BENCH_CASES:
+            if args.case and name not in args.case:
+                continue
+            runs: list[float] = []
+            exit_code = 0
+            last_output = ""
+            for _ in range(args.repeat):
+                if name == "generate-refresh-pr":
+                    reset_refresh_state(corpus_root, catalogs)
+                exit_code, elapsed, last_output = run_case(scripts_dir, corpus_root, script, script_args)
+                runs.append(elapsed)
+                if exit_code != 0:
+                    break
+            if exit_code != 0:
+                failures.append(name)
+                print(last_output)
+            results[name] = {
+                "script": f"scripts/{script}",
+                "exit_code": exit_code,
+                "runs_seconds": [round(value, 4) for value in runs],
+                "median_seconds": round(statistics.median(runs), 4),
+                "min_seconds": round(min(runs), 4),
+                "max_seconds": round(max(runs), 4),
+            }
+            print(
+                f"OK [BENCH_CASE] case={name} median={results[name]['median_seconds']:.4f}s "
+                f"min={results[name]['min_seconds']:.4f}s runs={len(runs)} exit_code={exit_code}"
+            )
+        reset_refresh_state(corpus_root, catalogs)
+    finally:
+        if temp_root is not None and not args.keep_corpus:
+            shutil.rmtree(temp_root, ignore_errors=True)
+
+    baseline_path = Path(args.baseline).resolve()
+    baseline = load_json(baseline_path)
+    regressions = compare_with_baseline(results, baseline, args.threshold, args.min_delta_seconds)
+
+    report = {
+        "generated_at": now_iso(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "corpus": corpus_params,
+        "cases": results,
+        "baseline": baseline_path.as_posix() if baseline else "",
+        "regressions": regressions,
+    }
+    output_path = Path(args.output).resolve()
+    write_json(output_path, report)
+    if temp_root is not None and args.keep_corpus:
+        print(f"INFO [BENCH_CORPUS_KEPT] {corpus_root.as_posix()}")
+
+    if args.update_baseline:
+        if failures:
+            print("ERROR [BENCH_BASELINE_NOT_UPDATED] failing cases cannot become a baseline")
+        else:
+            write_json(baseline_path, report)
+            print(f"OK [BENCH_BASELINE_UPDATED] {baseline_path.as_posix()}")
+
+    for regression in regressions:
+        print(f"WARN [BENCH_REGRESSION] {regression}")
+
+    if failures:
+        print(f"ERROR [BENCH_CASE_FAILED] cases={','.join(failures)}")
+        return 1
+    if regressions:
+        print(f"ERROR [BENCH_REGRESSION_DETECTED] regressions={len(regressions)} output={output_path.as_posix()}")
+        return 1
+
+    print(f"OK [BENCH_DONE] cases={len(results)} output={output_path.as_posix()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
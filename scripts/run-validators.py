@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+
+from agentteams_lib.fsio import write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+
+
+@dataclass
+class Step:
+    name: str
+    command: list[str]
+    needs: list[str] = field(default_factory=list)
+
+
+def secrets_command() -> list[str]:
+    if os.name == "nt":
+        return [
+            "powershell",
+            "-NoProfile",
+            "-ExecutionPolicy",
+            "Bypass",
+            "-File",
+            str(Path("scripts") / "validate-secrets.ps1"),
+        ]
+    return ["bash", str(Path("scripts") / "validate-secrets.sh")]
+
+
+def build_steps(active_only: bool = False) -> list[Step]:
+    py = sys.executable
+    # Task checks cover .takt/tasks/done/ too unless only the active partition is asked for.
+    scope = ["--active-only"] if active_only else []
+    audit_scope = [] if active_only else ["--include-archive"]
+    return [
+        Step("task-schema", [py, "scripts/validate-takt-task.py", "--path", ".takt/tasks", *scope]),
+        Step(
+            "evidence",
+            [py, "scripts/validate-takt-evidence.py", "--allow-empty-logs", "--skip-governance-audit", *scope],
+            ["task-schema"],
+        ),
+        Step("governance-audit", [py, "scripts/audit-takt-governance.py", "--strict", *audit_scope], ["task-schema"]),
+        Step("control-plane", [py, "scripts/validate-control-plane-schema.py", "--path", ".takt/control-plane"]),
+        Step("doc-consistency", [py, "scripts/validate-doc-consistency.py"]),
+        Step("scenarios", [py, "scripts/validate-scenarios-structure.py"]),
+        Step("secrets", secrets_command()),
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run repository validators as a dependency graph")
+    parser.add_argument("--jobs", type=int, default=0, help="concurrent validators (0 = one per step)")
+    parser.add_argument("--fail-fast", action="store_true", help="stop scheduling and cancel running steps on failure")
+    parser.add_argument("--only", action="append", default=[], help="run only this step and its dependencies")
+    parser.add_argument("--skip", action="append", default=[], help="skip this step (dependents still run)")
+    parser.add_argument("--report", default="", help="write the aggregated report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="print output of passing steps too")
+    parser.add_argument(
+        "--active-only",
+        action="store_true",
+        help="task checks read only the active partition (skip .takt/tasks/done/)",
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def select_steps(steps: list[Step], only: list[str], skip: list[str]) -> list[Step]:
+    by_name = {step.name: step for step in steps}
+    if only:
+        wanted: set[str] = set()
+        pending = list(only)
+        while pending:
+            name = pending.pop()
+            if name in wanted:
+                continue
+            wanted.add(name)
+            pending.extend(by_name[name].needs)
+        steps = [step for step in steps if step.name in wanted]
+    selected = [step for step in steps if step.name not in set(skip)]
+    names = {step.name for step in selected}
+    for step in selected:
+        step.needs = [need for need in step.needs if need in names]
+    return selected
+
+
+class Runner:
+    def __init__(self, root: Path, steps: list[Step], jobs: int, fail_fast: bool) -> None:
+        self.root = root
+        self.steps = steps
+        self.jobs = jobs or len(steps) or 1
+        self.fail_fast = fail_fast
+        self.results: dict[str, dict] = {}
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def _execute(self, step: Step) -> dict:
+        started = time.perf_counter()
+        with self._lock:
+            if self._cancelled:
+                return {"status": "cancelled", "exit_code": None, "seconds": 0.0, "output": ""}
+            proc = subprocess.Popen(
+                step.command,
+                cwd=str(self.root),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+            self._procs[step.name] = proc
+        output, _ = proc.communicate()
+        with self._lock:
+            self._procs.pop(step.name, None)
+            cancelled = self._cancelled and proc.returncode != 0
+        return {
+            "status": "cancelled" if cancelled else ("passed" if proc.returncode == 0 else "failed"),
+            "exit_code": proc.returncode,
+            "seconds": round(time.perf_counter() - started, 4),
+            "output": output.strip(),
+        }
+
+    def _cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            for proc in self._procs.values():
+                proc.terminate()
+
+    def run(self, on_done) -> None:
+        pending = {step.name: step for step in self.steps}
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if self._cancelled:
+                        break
+                    statuses = [self.results.get(need, {}).get("status") for need in step.needs]
+                    if any(status in {"failed", "skipped", "cancelled"} for status in statuses):
+                        del pending[name]
+                        self.results[name] = {"status": "skipped", "exit_code": None, "seconds": 0.0, "output": ""}
+                        on_done(step, self.results[name])
+                        continue
+                    if all(status == "passed" for status in statuses) and len(running) < self.jobs:
+                        del pending[name]
+                        running[pool.submit(self._execute, step)] = name
+                if self._cancelled and not running:
+                    for name, step in pending.items():
+                        self.results[name] = {"status": "cancelled", "exit_code": None, "seconds": 0.0, "output": ""}
+                        on_done(step, self.results[name])
+                    pending.clear()
+                    break
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = future.result()
+                    on_done(next(step for step in self.steps if step.name == name), self.results[name])
+                    if self.results[name]["status"] == "failed" and self.fail_fast:
+                        self._cancel()
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    root = Path.cwd()
+    steps = build_steps(args.active_only)
+    known = {step.name for step in steps}
+    unknown = sorted((set(args.only) | set(args.skip)) - known)
+    if unknown:
+        print(f"ERROR [VALIDATE_CONFIG_INVALID] unknown step: {','.join(unknown)}")
+        print(f"Allowed steps: {','.join(step.name for step in steps)}")
+        return 1
+    if args.jobs < 0:
+        print("ERROR [VALIDATE_CONFIG_INVALID] --jobs must be >= 0")
+        return 1
+
+    steps = select_steps(steps, args.only, args.skip)
+    runner = Runner(root, steps, args.jobs, args.fail_fast)
+
+    def on_done(step: Step, result: dict) -> None:
+        status = result["status"]
+        if status == "failed" or (args.verbose and result["output"]):
+            for line in result["output"].splitlines():
+                print(f"  [{step.name}] {line}")
+        label = "OK" if status == "passed" else ("ERROR" if status == "failed" else "WARN")
+        code = "VALIDATE_STEP" if status == "passed" else f"VALIDATE_STEP_{status.upper()}"
+        print(f"{label} [{code}] step={step.name} seconds={result['seconds']:.3f}", flush=True)
+
+    started = time.perf_counter()
+    runner.run(on_done)
+    wall = time.perf_counter() - started
+
+    results = runner.results
+    for name, result in results.items():
+        metrics.add_phase(name, result["seconds"])
+    serial = sum(result["seconds"] for result in results.values())
+    counts = {status: 0 for status in ["passed", "failed", "skipped", "cancelled"]}
+    for result in results.values():
+        counts[result["status"]] += 1
+    for status, count in counts.items():
+        metrics.gauge(f"steps_{status}", count)
+
+    if args.report:
+        report = {
+            "wall_seconds": round(wall, 4),
+            "serial_seconds": round(serial, 4),
+            "steps": {
+                step.name: {"needs": step.needs, **results.get(step.name, {})} for step in steps
+            },
+        }
+        write_atomic(Path(args.report), json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+
+    summary = (
+        f"steps={len(steps)} passed={counts['passed']} failed={counts['failed']} "
+        f"skipped={counts['skipped']} cancelled={counts['cancelled']} "
+        f"wall={wall:.3f}s serial={serial:.3f}s"
+    )
+    if counts["failed"] or counts["cancelled"] or counts["skipped"]:
+        print(f"ERROR [VALIDATE_FAILED] {summary}")
+        return 1
+    print(f"OK [VALIDATE_DONE] {summary}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("run-validators", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
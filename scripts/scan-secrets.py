@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+from pathlib import Path
+
+from agentteams_lib.fsio import write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.secretscan import (
+    DEFAULT_RULES,
+    Finding,
+    SecretScanConfigError,
+    SecretScanner,
+    config_fingerprint,
+    resolve_config,
+    worker_init,
+    worker_scan,
+)
+from agentteams_lib.textscan import iter_files
+
+PARALLEL_MIN_FILES = 64
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline secret scan driven by .gitleaks.toml")
+    parser.add_argument("--source", default=".", help="directory to scan")
+    parser.add_argument("--config", default=".gitleaks.toml", help="gitleaks config path")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = auto, 1 = serial)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip files whose content hash is unchanged since the last clean run",
+    )
+    parser.add_argument(
+        "--state",
+        default=".takt/logs/secret-scan/state.json",
+        help="incremental state file (relative to --source)",
+    )
+    parser.add_argument("--report", default="", help="write findings as a gitleaks-style JSON report")
+    parser.add_argument("--no-redact", action="store_true", help="print secrets instead of REDACTED")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_state(path: Path, fingerprint: str) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict) or data.get("config_fingerprint") != fingerprint:
+        return {}
+    files = data.get("files")
+    return {str(k): str(v) for k, v in files.items()} if isinstance(files, dict) else {}
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    source = Path(args.source).resolve()
+    config_path = Path(args.config)
+    if not config_path.is_absolute():
+        config_path = source / config_path
+    if not source.is_dir():
+        print(f"ERROR [SECRET_SCAN_SOURCE_MISSING] {source.as_posix()}")
+        return 1
+    if not config_path.exists():
+        print(f"ERROR [SECRET_SCAN_CONFIG_MISSING] {config_path.as_posix()}")
+        return 1
+
+    try:
+        config = resolve_config(config_path)
+        scanner = SecretScanner(config)
+    except SecretScanConfigError as exc:
+        print(f"ERROR [SECRET_SCAN_CONFIG_INVALID] {exc}")
+        return 1
+
+    state_path = Path(args.state)
+    if not state_path.is_absolute():
+        state_path = source / state_path
+    fingerprint = config_fingerprint(config)
+    cached = load_state(state_path, fingerprint) if args.incremental else {}
+
+    with metrics.phase("discovery"):
+        items: list[tuple[str, str, str]] = []
+        for path in iter_files([source]):
+            relpath = path.relative_to(source).as_posix()
+            if path == state_path or scanner.path_allowed(relpath):
+                continue
+            items.append((str(path), relpath, cached.get(relpath, "")))
+
+    workers = args.workers or (os.cpu_count() or 1)
+    findings: list[Finding] = []
+    hashes: dict[str, str] = {}
+    unreadable: list[str] = []
+    skipped = 0
+    with metrics.phase("scan"):
+        if workers > 1 and len(items) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=workers, initializer=worker_init, initargs=(config,)) as pool:
+                results = list(pool.map(worker_scan, items, chunksize=16))
+        else:
+            worker_init(config)
+            results = [worker_scan(item) for item in items]
+
+    for relpath, digest, file_findings, error in results:
+        if error:
+            unreadable.append(f"{relpath}: {error}")
+            continue
+        hashes[relpath] = digest
+        if file_findings is None:
+            skipped += 1
+            continue
+        findings.extend(file_findings)
+
+    metrics.inc("files_processed", len(items))
+    metrics.inc("files_unchanged", skipped)
+    metrics.gauge("rules", len(scanner.rules))
+    metrics.gauge("findings", len(findings))
+
+    redact = not args.no_redact
+    if args.report:
+        report = [finding.as_report(redact) for finding in findings]
+        write_atomic(Path(args.report), json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+
+    if config["bundled_default"]:
+        print(
+            f"WARN [SECRET_SCAN_REDUCED_RULESET] useDefault maps to {len(DEFAULT_RULES)} bundled rules, "
+            "not the full gitleaks default ruleset; run gitleaks for complete coverage"
+        )
+    for item in unreadable:
+        print(f"WARN [SECRET_SCAN_UNREADABLE] {item}")
+    for finding in findings:
+        secret = "REDACTED" if redact else finding.secret
+        print(
+            f"ERROR [SECRET_DETECTED] rule={finding.rule_id} file={finding.file}:{finding.start_line} "
+            f"entropy={finding.entropy:.2f} secret={secret}"
+        )
+    if findings:
+        print(f"ERROR [SECRET_SCAN_FAILED] findings={len(findings)} files={len(items)}")
+        return 1
+
+    if args.incremental:
+        state = {"version": 1, "config_fingerprint": fingerprint, "files": dict(sorted(hashes.items()))}
+        write_atomic(state_path, json.dumps(state, ensure_ascii=False, indent=2) + "\n")
+
+    print(
+        f"OK [SECRET_SCAN_CLEAN] files={len(items)} scanned={len(items) - skipped} "
+        f"unchanged={skipped} rules={len(scanner.rules)}"
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("scan-secrets", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.templatesync import LINK_MODES, SYNC_STATE, sync_template
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync AgentTeams template files into a target repository")
+    parser.add_argument("--target", required=True, help="target repository root")
+    parser.add_argument("--template", default="", help="template root (default: this script's repository)")
+    parser.add_argument("--force", action="store_true", help="overwrite locally modified and pre-existing files")
+    parser.add_argument(
+        "--link-mode",
+        default="auto",
+        choices=list(LINK_MODES),
+        help="auto/reflink: copy-on-write clone when the filesystem supports it, else copy; "
+        "hardlink: share inodes with the template (in-place edits then change the template too)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    parser.add_argument("--verbose", action="store_true", help="list every file action")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    template_root = Path(args.template).resolve() if args.template else Path(__file__).resolve().parent.parent
+    target_root = Path(args.target).resolve()
+    if not template_root.is_dir():
+        print(f"ERROR [TEMPLATE_ROOT_MISSING] {template_root.as_posix()}")
+        return 1
+    if template_root == target_root:
+        print("OK [TEMPLATE_SYNC_SKIPPED] target root equals template root")
+        return 0
+    target_root.mkdir(parents=True, exist_ok=True)
+
+    with metrics.phase("sync"):
+        result = sync_template(template_root, target_root, args.force, args.link_mode, args.dry_run)
+
+    if args.verbose:
+        for label, items in [
+            ("ADD", result.added),
+            ("UPDATE", result.updated),
+            ("OVERWRITE", result.overwritten),
+            ("KEEP", result.kept),
+        ]:
+            for rel in items:
+                print(f"{label} {rel}")
+    for rel in result.local_modified:
+        print(
+            f"WARN [TEMPLATE_LOCAL_MODIFIED] path={rel} "
+            "(edited since the last sync; kept local copy, use --force to replace)"
+        )
+    for rel in result.removed_upstream:
+        print(f"WARN [TEMPLATE_FILE_REMOVED_UPSTREAM] path={rel} (no longer in template; left in place)")
+
+    counts = {
+        "added": len(result.added),
+        "updated": len(result.updated),
+        "overwritten": len(result.overwritten),
+        "unchanged": len(result.unchanged),
+        "kept": len(result.kept),
+        "local_modified": len(result.local_modified),
+    }
+    for name, value in counts.items():
+        metrics.gauge(f"files_{name}", value)
+    for method, value in result.methods.items():
+        metrics.gauge(f"files_written_{method}", value)
+
+    previous = result.previous_version[:12] or "none"
+    methods = ",".join(f"{name}:{value}" for name, value in sorted(result.methods.items())) or "none"
+    code = "TEMPLATE_SYNC_PLANNED" if args.dry_run else "TEMPLATE_SYNCED"
+    print(
+        f"OK [{code}] template_version={result.template_version[:12]} previous={previous} "
+        + " ".join(f"{name}={value}" for name, value in counts.items())
+        + f" write_methods={methods} state={(target_root / SYNC_STATE).as_posix()}"
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("sync-template", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
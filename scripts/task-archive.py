@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.fsio import LockTimeout, advisory_lock, write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import SNAPSHOT_LOCK, EventLogError, event_log_index, materialize
+from agentteams_lib.tasklayout import task_files
+from agentteams_lib.taskhistory import SECTIONS, HistoryError, archive, archived_count, verify
+from agentteams_lib.yamlio import load_path, read_document, rewrite
+
+DEFAULT_AGE_DAYS = 30
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Move old declarations, handoffs and team leader gates into <id>.history.jsonl archives"
+    )
+    parser.add_argument("--path", default=".takt/tasks", help="task directory")
+    parser.add_argument("--task-file", action="append", default=[], help="archive only this task (repeatable)")
+    cutoff = parser.add_mutually_exclusive_group()
+    cutoff.add_argument("--before", help="archive entries timestamped before this time (YYYY-MM-DDTHH:MM:SSZ)")
+    cutoff.add_argument(
+        "--older-than-days",
+        type=int,
+        default=DEFAULT_AGE_DAYS,
+        help=f"archive entries older than this many days (default: {DEFAULT_AGE_DAYS})",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report what would move without writing")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="do not archive; check every archive's hash chain against its task's history digest",
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def cutoff_of(args: argparse.Namespace) -> str:
+    if args.before:
+        return str(args.before).strip()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return (now - timedelta(days=max(args.older_than_days, 0))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def run_verify(files: list[Path], metrics: RunMetrics) -> int:
+    invalid = 0
+    archived = 0
+    for path in files:
+        with metrics.phase("parse"):
+            task = load_yaml(path)
+        with metrics.phase("verify"):
+            problems = verify(path.parent, task)
+        if task.get("history") is not None:
+            archived += 1
+        for problem in problems:
+            print(f"ERROR [TASK_HISTORY_INVALID] task={task.get('id', path.stem)} detail={problem}")
+        invalid += bool(problems)
+    metrics.gauge("tasks_with_history", archived)
+    level = "ERROR" if invalid else "OK"
+    print(f"{level} [TASK_HISTORY_VERIFIED] tasks={len(files)} archived={archived} invalid={invalid}")
+    return 1 if invalid else 0
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    task_dir = Path(args.path).resolve()
+    if not task_dir.is_dir():
+        print(f"ERROR [TASK_DIR_MISSING] {task_dir.as_posix()}")
+        return 1
+
+    with metrics.phase("discovery"):
+        logs = event_log_index(task_dir)
+        if args.task_file:
+            files = [Path(item).resolve() for item in args.task_file]
+        else:
+            files = task_files(task_dir)
+    missing = [path for path in files if not path.is_file()]
+    if missing:
+        print(f"ERROR [TASK_FILE_MISSING] {missing[0].as_posix()}")
+        return 1
+    if args.verify:
+        return run_verify(files, metrics)
+
+    cutoff = cutoff_of(args)
+    changed = 0
+    moved_total = 0
+    try:
+        # Same lock as task snapshot: both rewrite TASK-*.yaml, appenders never take it.
+        with advisory_lock(task_dir / SNAPSHOT_LOCK):
+            for path in files:
+                with metrics.phase("parse"):
+                    text, stored = read_document(path)
+                task_id = str(stored.get("id") or "")
+                try:
+                    with metrics.phase("fold"):
+                        # Pending events are folded first so the archive never runs ahead of the event log.
+                        task, _ = materialize(stored, logs.get(task_id))
+                    with metrics.phase("archive"):
+                        updated, moved, lines = archive(path.parent, task, cutoff)
+                except (EventLogError, HistoryError) as exc:
+                    print(f"ERROR [TASK_ARCHIVE_INVALID] task={task_id or path.stem} detail={exc}")
+                    return 1
+                if moved == 0:
+                    continue
+                changed += 1
+                moved_total += moved
+                counts = " ".join(
+                    f"{section}={archived_count(updated, section) - archived_count(task, section)}"
+                    for section in SECTIONS
+                )
+                if not args.dry_run:
+                    with metrics.phase("write"):
+                        # Archive first: a crash before the task write leaves unreferenced tail lines,
+                        # which the next run drops because the digest counts do not cover them.
+                        write_atomic(path.parent / updated["history"]["archive"], "".join(lines))
+                        write_atomic(path, rewrite(text, stored, updated))
+                print(f"OK [TASK_ARCHIVED] task={task_id} {counts} cutoff={cutoff} file={path.as_posix()}")
+    except LockTimeout as exc:
+        print(f"ERROR [TASK_ARCHIVE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+    metrics.gauge("tasks_archived", changed)
+    metrics.gauge("entries_archived", moved_total)
+    print(
+        f"OK [TASK_ARCHIVE_DONE] tasks={len(files)} archived={changed} entries={moved_total} cutoff={cutoff}"
+        + (" dry_run=true" if args.dry_run else "")
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("task-archive", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
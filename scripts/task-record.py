@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import EVENT_TYPES, EventLogError, append_event, events_path, task_file_for_id, utc_now
+from agentteams_lib.yamlio import load_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Append one declaration, handoff, gate or status event to a task's event log"
+    )
+    parser.add_argument("--task-file", default="", help="task snapshot (TASK-*.yaml)")
+    parser.add_argument("--id", default="", help="task id (T-00000), looked up under --path")
+    parser.add_argument("--path", default=".takt/tasks", help="task directory for --id")
+    parser.add_argument("--type", required=True, choices=list(EVENT_TYPES), help="event type")
+    parser.add_argument(
+        "--data",
+        required=True,
+        help='event fields as a JSON object, e.g. \'{"team": "backend", ...}\' (at defaults to now)',
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    if bool(args.task_file) == bool(args.id):
+        print("ERROR [TASK_EVENT_INVALID] pass exactly one of --task-file <path> or --id <T-00000>")
+        return 1
+    try:
+        data = json.loads(args.data)
+    except ValueError as exc:
+        print(f"ERROR [TASK_EVENT_INVALID] --data is not valid JSON: {exc}")
+        return 1
+    if not isinstance(data, dict):
+        print("ERROR [TASK_EVENT_INVALID] --data must be a JSON object")
+        return 1
+    if "type" in data:
+        print("ERROR [TASK_EVENT_INVALID] --data must not set type; pass it with --type")
+        return 1
+
+    with metrics.phase("discovery"):
+        if args.task_file:
+            task_file = Path(args.task_file).resolve()
+            if not task_file.is_file():
+                print(f"ERROR [TASK_FILE_MISSING] {task_file.as_posix()}")
+                return 1
+            task_id = str(load_yaml(task_file).get("id") or "").strip()
+            if not task_id:
+                print(f"ERROR [TASK_EVENT_INVALID] task has no id: {task_file.as_posix()}")
+                return 1
+        else:
+            task_id = args.id.strip()
+            task_file = task_file_for_id(Path(args.path).resolve(), task_id, load_yaml)
+            if task_file is None:
+                print(
+                    f"ERROR [TASK_FILE_MISSING] no task snapshot with id={task_id} under {Path(args.path).as_posix()}"
+                )
+                return 1
+
+    event = {"type": args.type, "at": utc_now(), **data}
+    log = events_path(task_file.parent, task_id)
+    with metrics.phase("append"):
+        try:
+            append_event(log, event)
+        except EventLogError as exc:
+            print(f"ERROR [TASK_EVENT_INVALID] {exc}")
+            return 1
+    print(f"OK [TASK_EVENT_RECORDED] task={task_id} type={args.type} at={event['at']} log={log.as_posix()}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("task-record", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.fsio import LockTimeout, advisory_lock
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import SNAPSHOT_LOCK, EventLogError, event_log_index, events_path, materialize
+from agentteams_lib.taskhistory import digest_of, history_path
+from agentteams_lib.tasklayout import ACTIVE_DIR, DONE_DIR, partition_of, task_files
+from agentteams_lib.yamlio import load_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Move tasks into their partition: done tasks to done/<yyyy-mm>/, every other task to active/"
+    )
+    parser.add_argument("--path", default=".takt/tasks", help="task directory")
+    parser.add_argument("--dry-run", action="store_true", help="report the moves without making them")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def load_yaml(path: Path) -> dict:
+    return load_path(path)
+
+
+def sidecars(path: Path, task: dict) -> list[Path]:
+    """The task's event log and history archive, where they exist next to it."""
+    task_id = str(task.get("id") or "").strip()
+    if not task_id:
+        return []
+    archive = str(digest_of(task).get("archive") or "").strip()
+    history = path.parent / archive if archive else history_path(path.parent, task_id)
+    found = [events_path(path.parent, task_id), history]
+    return [sidecar for sidecar in found if sidecar.is_file()]
+
+
+def relative(task_dir: Path, path: Path) -> str:
+    return path.relative_to(task_dir).as_posix()
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    task_dir = Path(args.path).resolve()
+    if not task_dir.is_dir():
+        print(f"ERROR [TASK_DIR_MISSING] {task_dir.as_posix()}")
+        return 1
+
+    # Done tasks without a usable updated_at land in the current month.
+    fallback_month = datetime.now(timezone.utc).strftime("%Y-%m")
+    moved = 0
+    counts = {ACTIVE_DIR: 0, DONE_DIR: 0}
+    try:
+        # Same lock as task snapshot / archive, which rewrite the files this moves.
+        with advisory_lock(task_dir / SNAPSHOT_LOCK):
+            with metrics.phase("discovery"):
+                files = task_files(task_dir)
+                logs = event_log_index(task_dir)
+            for path in files:
+                with metrics.phase("parse"):
+                    task = load_yaml(path)
+                task_id = str(task.get("id") or "")
+                try:
+                    # The status may have been changed by an event not yet folded into the snapshot.
+                    current, _ = materialize(task, logs.get(task_id))
+                except EventLogError as exc:
+                    print(f"ERROR [TASK_EVENT_LOG_INVALID] {exc}")
+                    return 1
+                target_dir = task_dir / partition_of(current, fallback_month)
+                counts[target_dir.relative_to(task_dir).parts[0]] += 1
+                if path.parent == target_dir:
+                    continue
+                pending = [(source, target_dir / source.name) for source in [*sidecars(path, task), path]]
+                conflict = next((target for _, target in pending if target.exists()), None)
+                if conflict is not None:
+                    print(f"ERROR [TASK_ROTATE_CONFLICT] task={task_id} target exists: {conflict.as_posix()}")
+                    return 1
+                moved += 1
+                print(
+                    f"OK [TASK_ROTATED] task={task_id} status={current.get('status', '')} "
+                    f"from={relative(task_dir, path.parent)} to={relative(task_dir, target_dir)}"
+                )
+                if args.dry_run:
+                    continue
+                with metrics.phase("move"):
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    # Sidecars first: after a crash the task is still where it was and the next run finishes the
+                    # move, whereas a task moved ahead of its event log would be skipped with the log left behind.
+                    for source, target in pending:
+                        os.replace(source, target)
+    except LockTimeout as exc:
+        print(f"ERROR [TASK_ROTATE_LOCK_TIMEOUT] {exc}")
+        return 1
+
+    metrics.gauge("tasks_moved", moved)
+    metrics.gauge("tasks_active", counts[ACTIVE_DIR])
+    metrics.gauge("tasks_done", counts[DONE_DIR])
+    print(
+        f"OK [TASK_ROTATE_DONE] tasks={len(files)} moved={moved} active={counts[ACTIVE_DIR]} done={counts[DONE_DIR]}"
+        + (" dry_run=true" if args.dry_run else "")
+    )
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("task-rotate", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
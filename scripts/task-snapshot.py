@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+try:
+    import yaml  # type: ignore
+except Exception as exc:  # pragma: no cover
+    print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
+    sys.exit(1)
+
+from agentteams_lib.fsio import LockTimeout, advisory_lock, write_atomic
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.taskevents import SNAPSHOT_LOCK, EventLogError, event_log_index, materialize
+from agentteams_lib.tasklayout import task_files
+from agentteams_lib.yamlio import read_document, rewrite
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fold pending task events (<id>.events.jsonl) into the TASK-*.yaml snapshots"
+    )
+    parser.add_argument("--path", default=".takt/tasks", help="task directory")
+    parser.add_argument("--task-file", action="append", default=[], help="snapshot only this task (repeatable)")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="do not write; exit 1 when any snapshot is behind its event log",
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
+    task_dir = Path(args.path).resolve()
+    if not task_dir.is_dir():
+        print(f"ERROR [TASK_DIR_MISSING] {task_dir.as_posix()}")
+        return 1
+
+    with metrics.phase("discovery"):
+        logs = event_log_index(task_dir)
+        if args.task_file:
+            files = [Path(item).resolve() for item in args.task_file]
+        else:
+            files = task_files(task_dir)
+    metrics.gauge("event_logs", len(logs))
+
+    stale = 0
+    folded = 0
+    try:
+        # One writer at a time per task directory; appenders never take this lock.
+        with advisory_lock(task_dir / SNAPSHOT_LOCK):
+            for path in files:
+                if not path.is_file():
+                    print(f"ERROR [TASK_FILE_MISSING] {path.as_posix()}")
+                    return 1
+                with metrics.phase("parse"):
+                    text, task = read_document(path)
+                task_id = str(task.get("id") or "")
+                with metrics.phase("fold"):
+                    try:
+                        merged, count = materialize(task, logs.get(task_id))
+                    except EventLogError as exc:
+                        print(f"ERROR [TASK_EVENT_LOG_INVALID] {exc}")
+                        return 1
+                if count == 0:
+                    continue
+                stale += 1
+                folded += count
+                if args.check:
+                    print(f"WARN [TASK_SNAPSHOT_STALE] task={task_id} pending_events={count} file={path.as_posix()}")
+                    continue
+                with metrics.phase("write"):
+                    write_atomic(path, rewrite(text, task, merged))
+                print(f"OK [TASK_SNAPSHOT] task={task_id} events={count} file={path.as_posix()}")
+    except LockTimeout as exc:
+        print(f"ERROR [TASK_SNAPSHOT_LOCK_TIMEOUT] {exc}")
+        return 1
+
+    metrics.gauge("tasks_stale", stale)
+    metrics.gauge("events_folded", folded)
+    if args.check:
+        print(
+            f"{'ERROR' if stale else 'OK'} [TASK_SNAPSHOT_CHECK] tasks={len(files)} stale={stale} "
+            f"pending_events={folded}"
+        )
+        return 1 if stale else 0
+    print(f"OK [TASK_SNAPSHOT_DONE] tasks={len(files)} written={stale} events={folded}")
+    return 0
+
+
+def main() -> int:
+    return run_with_metrics("task-snapshot", parse_args(), run)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
 import re
 import sys
+from typing import Callable
 
 try:
     import yaml  # type: ignore
@@ -12,6 +14,13 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
+from agentteams_lib.catalog import CatalogEdge, CatalogGraph
+from agentteams_lib.intake import ARCHIVE_DIR, ARCHIVE_SUFFIX, archive_files, loose_files, read_archive
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.signals import SignalsReader
+from agentteams_lib.watch import ErrorSet, Watcher, add_watch_arguments, report, watch_loop
+from agentteams_lib.yamlio import load_path
+
 TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
 INTAKE_REQUIRED_KEYS = [
     "project_id",
@@ -60,12 +69,18 @@ SKILL_REQUIRED_KEYS = [
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Validate .takt/control-plane schema")
     parser.add_argument("--path", default=".takt/control-plane", help="control-plane root")
+    parser.add_argument(
+        "--include-archive",
+        action="store_true",
+        help="also validate snapshots rolled into intake/<project>/archive/ by fleet compact",
+    )
+    add_watch_arguments(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
 def load_yaml(path: Path) -> dict:
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data if isinstance(data, dict) else {}
+    return load_path(path)
 
 
 def as_list(value: object) -> list:
@@ -105,206 +120,332 @@ def validate_registry(path: Path, errors: list[str]) -> set[str]:
 
 
 def validate_intake_file(path: Path, project_ids: set[str], errors: list[str]) -> None:
-    data = load_yaml(path)
+    validate_intake_data(path.as_posix(), load_yaml(path), project_ids, errors)
+
+
+def validate_intake_data(label: str, data: dict, project_ids: set[str], errors: list[str]) -> None:
     for key in INTAKE_REQUIRED_KEYS:
         if key not in data:
-            errors.append(f"{path.as_posix()}: missing key '{key}'")
+            errors.append(f"{label}: missing key '{key}'")
 
     if not data:
         return
 
     project_id = str(data.get("project_id") or "").strip()
     if project_ids and project_id not in project_ids:
-        errors.append(f"{path.as_posix()}: unknown project_id '{project_id}'")
+        errors.append(f"{label}: unknown project_id '{project_id}'")
 
     captured_at = str(data.get("captured_at") or "")
     if not TIMESTAMP_PATTERN.fullmatch(captured_at):
-        errors.append(f"{path.as_posix()}: captured_at must match YYYY-MM-DDTHH:MM:SSZ")
+        errors.append(f"{label}: captured_at must match YYYY-MM-DDTHH:MM:SSZ")
 
     window_days = data.get("window_days")
     if not isinstance(window_days, int) or window_days <= 0:
-        errors.append(f"{path.as_posix()}: window_days must be a positive integer")
+        errors.append(f"{label}: window_days must be a positive integer")
 
     task_counts = data.get("task_counts")
     if not isinstance(task_counts, dict):
-        errors.append(f"{path.as_posix()}: task_counts must be a map")
+        errors.append(f"{label}: task_counts must be a map")
     else:
         for key in ["todo", "in_progress", "in_review", "blocked", "done"]:
             value = task_counts.get(key)
             if not isinstance(value, int) or value < 0:
-                errors.append(f"{path.as_posix()}: task_counts.{key} must be an integer >= 0")
+                errors.append(f"{label}: task_counts.{key} must be an integer >= 0")
 
     for metric in ["lead_time_p50_hours", "queue_p95_hours", "rework_rate", "blocked_ratio"]:
         value = data.get(metric)
         if not isinstance(value, (int, float)):
-            errors.append(f"{path.as_posix()}: {metric} must be numeric")
+            errors.append(f"{label}: {metric} must be numeric")
             continue
         if metric in {"rework_rate", "blocked_ratio"} and not (0 <= float(value) <= 1):
-            errors.append(f"{path.as_posix()}: {metric} must be between 0 and 1")
+            errors.append(f"{label}: {metric} must be between 0 and 1")
 
     incident_fingerprints = data.get("incident_fingerprints")
     if not isinstance(incident_fingerprints, list):
-        errors.append(f"{path.as_posix()}: incident_fingerprints must be a list")
+        errors.append(f"{label}: incident_fingerprints must be a list")
     else:
         for idx, item in enumerate(incident_fingerprints):
             if not isinstance(item, dict):
-                errors.append(f"{path.as_posix()}: incident_fingerprints[{idx}] must be a map")
+                errors.append(f"{label}: incident_fingerprints[{idx}] must be a map")
                 continue
             for key in ["hash", "error_class", "failing_step", "policy", "rule_id"]:
                 if not str(item.get(key) or "").strip():
-                    errors.append(f"{path.as_posix()}: incident_fingerprints[{idx}].{key} is required")
+                    errors.append(f"{label}: incident_fingerprints[{idx}].{key} is required")
 
     policy_failures = data.get("policy_failures")
     if not isinstance(policy_failures, list):
-        errors.append(f"{path.as_posix()}: policy_failures must be a list")
+        errors.append(f"{label}: policy_failures must be a list")
 
     top_overlaps = data.get("top_overlaps")
     if not isinstance(top_overlaps, list):
-        errors.append(f"{path.as_posix()}: top_overlaps must be a list")
+        errors.append(f"{label}: top_overlaps must be a list")
     else:
         for idx, item in enumerate(top_overlaps):
             if not isinstance(item, dict):
-                errors.append(f"{path.as_posix()}: top_overlaps[{idx}] must be a map")
+                errors.append(f"{label}: top_overlaps[{idx}] must be a map")
                 continue
             capability = str(item.get("capability") or "").strip()
             ratio = item.get("responsibility_overlap_ratio")
             if not capability:
-                errors.append(f"{path.as_posix()}: top_overlaps[{idx}].capability is required")
+                errors.append(f"{label}: top_overlaps[{idx}].capability is required")
             if not isinstance(ratio, (int, float)) or not (0 <= float(ratio) <= 1):
                 errors.append(
-                    f"{path.as_posix()}: top_overlaps[{idx}].responsibility_overlap_ratio must be between 0 and 1"
+                    f"{label}: top_overlaps[{idx}].responsibility_overlap_ratio must be between 0 and 1"
                 )
 
 
-def validate_catalog(
-    path: Path, list_key: str, required_keys: list[str], id_key: str, errors: list[str]
-) -> set[str]:
-    if not path.exists():
+def validate_intake_archive(archive: Path, project_ids: set[str], errors: list[str]) -> int:
+    try:
+        records = read_archive(archive)
+    except (OSError, ValueError) as exc:
+        errors.append(f"{archive.as_posix()}: unreadable intake archive: {exc}")
+        return 0
+    for record in records:
+        validate_intake_data(f"{archive.as_posix()}#{record['name']}", record["data"], project_ids, errors)
+    return len(records)
+
+
+def validate_catalog(graph: CatalogGraph, kind: str, required_keys: list[str], errors: list[str]) -> set[str]:
+    section = graph.sections[kind]
+    path, list_key, id_key = section.path, section.spec.list_key, section.spec.id_key
+    if not section.exists:
         errors.append(f"missing file: {path.as_posix()}")
         return set()
 
-    data = load_yaml(path)
-    items = as_list(data.get(list_key))
-    if not items:
+    if not section.items:
         errors.append(f"{path.as_posix()}: {list_key} must be a non-empty list")
         return set()
 
-    ids: set[str] = set()
-    for idx, item in enumerate(items):
+    for idx, item in enumerate(section.items):
         if not isinstance(item, dict):
             errors.append(f"{path.as_posix()}: {list_key}[{idx}] must be a map")
             continue
         for key in required_keys:
             if key not in item:
                 errors.append(f"{path.as_posix()}: {list_key}[{idx}].{key} is required")
+    for item_id in section.duplicates:
+        errors.append(f"{path.as_posix()}: duplicate {id_key} '{item_id}'")
+    return graph.ids(kind)
+
+
+def validate_graph_references(graph: CatalogGraph, errors: list[str], warnings: list[str]) -> None:
+    def where(edge: CatalogEdge) -> str:
+        section = graph.sections[edge.source.kind]
+        return f"{section.path.as_posix()}: {section.spec.list_key}[{edge.source.index}].{edge.field_name}"
+
+    for edge in graph.dangling_edges():
+        errors.append(f"{where(edge)} references unknown {edge.target_kind} '{edge.target_id}'")
+
+    for edge in graph.enabled_to_disabled():
+        state = "inactive" if edge.target_kind == "team" else "disabled"
+        message = f"{where(edge)} references {state} {edge.target_kind} '{edge.target_id}'"
+        # An enabled rule requiring a disabled skill fails every task it matches; inactive
+        # teams are staged rollouts (generate-refresh-pr adds them switched off) and only warn.
+        (errors if edge.source.kind == "rule" and edge.target_kind == "skill" else warnings).append(message)
+
+    skills = graph.sections["skill"]
+    for node in graph.unreferenced("skill", by={"team", "rule"}):
+        if node.enabled:
+            warnings.append(
+                f"{skills.path.as_posix()}: skills[{node.index}] '{node.node_id}' "
+                "is not referenced by any team skill_refs or rule require_skills"
+            )
+
+
+def validate_catalogs(
+    root: Path, errors: list[str], warnings: list[str]
+) -> tuple[CatalogGraph, set[str], set[str], set[str]]:
+    graph = CatalogGraph.load(root, load_yaml)
+    team_ids = validate_catalog(graph, "team", TEAM_REQUIRED_KEYS, errors)
+    rule_ids = validate_catalog(graph, "rule", RULE_REQUIRED_KEYS, errors)
+    skill_ids = validate_catalog(graph, "skill", SKILL_REQUIRED_KEYS, errors)
 
-        item_id = str(item.get(id_key) or "").strip()
-        if item_id:
-            if item_id in ids:
-                errors.append(f"{path.as_posix()}: duplicate {id_key} '{item_id}'")
-            ids.add(item_id)
-    return ids
+    skills_dir = root.parent / "skills"
+    if not skills_dir.is_dir():
+        errors.append(f"missing directory: {skills_dir.as_posix()}")
+    else:
+        skill_files = {entry.name for entry in os.scandir(skills_dir) if entry.is_file()}
+        for skill_id in sorted(skill_ids):
+            if f"{skill_id}.md" not in skill_files:
+                errors.append(f"missing skill file: {(skills_dir / f'{skill_id}.md').as_posix()}")
 
+    validate_graph_references(graph, errors, warnings)
+    return graph, team_ids, rule_ids, skill_ids
 
-def validate_signals_latest(path: Path, errors: list[str]) -> None:
-    if not path.exists():
-        errors.append(f"missing file: {path.as_posix()}")
+
+def validate_signals(path: Path, errors: list[str]) -> None:
+    signals = SignalsReader(path, load_yaml)
+    if not signals.exists:
+        errors.append(f"missing file: {signals.source.as_posix()}")
         return
 
-    data = load_yaml(path)
+    keys = signals.keys()
     for key in ["generated_at", "window_days", "projects", "fingerprint_project_counts", "overload_candidates"]:
-        if key not in data:
-            errors.append(f"{path.as_posix()}: missing key '{key}'")
+        if key not in keys:
+            errors.append(f"{signals.source.as_posix()}: missing key '{key}'")
+    for rel in signals.missing_shards():
+        errors.append(f"{signals.source.as_posix()}: missing shard '{rel}'")
 
 
-def main() -> int:
-    args = parse_args()
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
     root = Path(args.path).resolve()
 
     if not root.exists():
         print(f"ERROR [CONTROL_PLANE_MISSING] {root.as_posix()}")
         return 1
+    if args.watch:
+        return watch(args, metrics, root)
 
     errors: list[str] = []
+    warnings: list[str] = []
+    intake_files: list[Path] = []
+    archived_count = 0
     project_ids = validate_registry(root / "registry" / "projects.yaml", errors)
 
     intake_dir = root / "intake"
     if not intake_dir.exists():
         errors.append(f"missing directory: {intake_dir.as_posix()}")
     else:
-        intake_files = sorted(intake_dir.glob("*/*.yaml"))
-        if not intake_files:
+        intake_files = loose_files(intake_dir)
+        if not intake_files and not archive_files(intake_dir):
             errors.append(f"{intake_dir.as_posix()}: no intake YAML files found")
-        for file in intake_files:
-            validate_intake_file(file, project_ids, errors)
-
-    validate_signals_latest(root / "signals" / "latest.yaml", errors)
-
-    team_ids = validate_catalog(
-        root / "team-catalog" / "teams.yaml", "teams", TEAM_REQUIRED_KEYS, "team_id", errors
-    )
-    rule_ids = validate_catalog(
-        root / "rule-catalog" / "routing-rules.yaml", "rules", RULE_REQUIRED_KEYS, "rule_id", errors
-    )
-    skill_ids = validate_catalog(
-        root / "skill-catalog" / "skills.yaml", "skills", SKILL_REQUIRED_KEYS, "skill_id", errors
-    )
-
-    skills_dir = root.parent / "skills"
-    if not skills_dir.exists():
-        errors.append(f"missing directory: {skills_dir.as_posix()}")
-    else:
-        for skill_id in skill_ids:
-            expected = skills_dir / f"{skill_id}.md"
-            if not expected.exists():
-                errors.append(f"missing skill file: {expected.as_posix()}")
-
-    # Lightweight cross-reference checks
-    teams_file = root / "team-catalog" / "teams.yaml"
-    if teams_file.exists():
-        data = load_yaml(teams_file)
-        for idx, team in enumerate(as_list(data.get("teams"))):
-            if not isinstance(team, dict):
-                continue
-            for skill_ref in as_list(team.get("skill_refs")):
-                skill_text = str(skill_ref).strip()
-                if skill_text and skill_text not in skill_ids:
-                    errors.append(
-                        f"{teams_file.as_posix()}: teams[{idx}].skill_refs references unknown skill '{skill_text}'"
-                    )
-
-    rules_file = root / "rule-catalog" / "routing-rules.yaml"
-    if rules_file.exists():
-        data = load_yaml(rules_file)
-        for idx, rule in enumerate(as_list(data.get("rules"))):
-            if not isinstance(rule, dict):
-                continue
-            for team in as_list(rule.get("require_teams")):
-                team_text = str(team).strip()
-                if team_text and team_text not in team_ids:
-                    errors.append(
-                        f"{rules_file.as_posix()}: rules[{idx}].require_teams references unknown team '{team_text}'"
-                    )
-            for skill in as_list(rule.get("require_skills")):
-                skill_text = str(skill).strip()
-                if skill_text and skill_text not in skill_ids:
-                    errors.append(
-                        f"{rules_file.as_posix()}: rules[{idx}].require_skills references unknown skill '{skill_text}'"
-                    )
-
+        with metrics.phase("intake"):
+            for file in intake_files:
+                validate_intake_file(file, project_ids, errors)
+            if args.include_archive:
+                for archive in archive_files(intake_dir):
+                    archived_count += validate_intake_archive(archive, project_ids, errors)
+        metrics.gauge("intake_files", len(intake_files))
+        metrics.gauge("intake_archived", archived_count)
+
+    validate_signals(root / "signals", errors)
+
+    with metrics.phase("catalogs"):
+        graph, team_ids, rule_ids, skill_ids = validate_catalogs(root, errors, warnings)
+    metrics.gauge("catalog_edges", len(graph.edges))
+
+    metrics.gauge("projects", len(project_ids))
+    metrics.gauge("teams", len(team_ids))
+    metrics.gauge("rules", len(rule_ids))
+    metrics.gauge("skills", len(skill_ids))
+    for warning in warnings:
+        print(f"WARN [CONTROL_PLANE_REFERENCE] {warning}")
     if errors:
         for err in errors:
             print(f"ERROR [CONTROL_PLANE_INVALID] {err}")
         return 1
 
-    intake_count = len(list((root / "intake").glob("*/*.yaml")))
     print(
         "OK [CONTROL_PLANE_VALID] "
-        f"projects={len(project_ids)} intake_files={intake_count} teams={len(team_ids)} "
-        f"rules={len(rule_ids)} skills={len(skill_ids)}"
+        f"projects={len(project_ids)} intake_files={len(intake_files)} "
+        + (f"intake_archived={archived_count} " if args.include_archive else "")
+        + f"teams={len(team_ids)} rules={len(rule_ids)} skills={len(skill_ids)}"
     )
     return 0
 
 
+def findings(errors: list[str], warnings: list[str] | None = None) -> list[str]:
+    return [f"WARN [CONTROL_PLANE_REFERENCE] {warning}" for warning in warnings or []] + [
+        f"ERROR [CONTROL_PLANE_INVALID] {err}" for err in errors
+    ]
+
+
+def guarded(label: str, check: Callable[[], object], errors: list[str]) -> object:
+    """Run a section check, reporting a half-saved YAML file as an error instead of stopping the watcher."""
+    try:
+        return check()
+    except yaml.YAMLError as exc:
+        errors.append(f"{label}: invalid YAML: {' '.join(str(exc).split())}")
+        return None
+
+
+def watch(args: argparse.Namespace, metrics: RunMetrics, root: Path) -> int:
+    """Validate once, then revalidate only the section (or intake file) that changed.
+
+    Intake snapshots stay parsed in memory, so a registry change rechecks project ids without re-reading them.
+    """
+    registry = root / "registry" / "projects.yaml"
+    intake_dir = root / "intake"
+    signals_dir = root / "signals"
+    catalog_dirs = {root / "team-catalog", root / "rule-catalog", root / "skill-catalog", root.parent / "skills"}
+    watcher = Watcher([root, root.parent / "skills"], debounce=args.debounce_ms / 1000, poll=args.poll)
+    current = ErrorSet()
+    project_ids: set[str] = set()
+    intake: dict[Path, dict] = {}
+
+    def check_intake(path: Path) -> list[str]:
+        errors: list[str] = []
+        if path.name.endswith(ARCHIVE_SUFFIX):
+            validate_intake_archive(path, project_ids, errors)
+        elif path in intake:
+            validate_intake_data(path.as_posix(), intake[path], project_ids, errors)
+        return findings(errors)
+
+    def revalidate(changed: set[Path], everything: bool = False) -> dict[str, list[str]]:
+        nonlocal project_ids
+        updates: dict[str, list[str]] = {}
+        recheck: set[Path] = set()
+        if everything or registry in changed:
+            errors: list[str] = []
+            ids = guarded(registry.as_posix(), lambda: validate_registry(registry, errors), errors) or set()
+            updates["registry"] = findings(errors)
+            if ids != project_ids:
+                project_ids = ids
+                recheck = set(intake) | (set(archive_files(intake_dir)) if args.include_archive else set())
+
+        for path in sorted(changed | recheck):
+            loose = path.suffix == ".yaml" and path.parent.parent == intake_dir
+            archived = path.name.endswith(ARCHIVE_SUFFIX) and path.parent.name == ARCHIVE_DIR
+            if not (loose or (archived and args.include_archive)):
+                continue
+            if not path.exists():
+                intake.pop(path, None)
+                updates[path.as_posix()] = []
+                continue
+            if loose and path in changed:
+                try:
+                    intake[path] = load_yaml(path)
+                except yaml.YAMLError as exc:
+                    intake.pop(path, None)
+                    detail = " ".join(str(exc).split())
+                    updates[path.as_posix()] = findings([f"{path.as_posix()}: invalid YAML: {detail}"])
+                    continue
+            updates[path.as_posix()] = check_intake(path)
+
+        if everything or any(intake_dir in path.parents for path in changed):
+            errors = []
+            if not intake_dir.is_dir():
+                errors.append(f"missing directory: {intake_dir.as_posix()}")
+            elif not intake and not archive_files(intake_dir):
+                errors.append(f"{intake_dir.as_posix()}: no intake YAML files found")
+            updates["intake"] = findings(errors)
+
+        if everything or any(signals_dir in path.parents for path in changed):
+            errors = []
+            guarded(signals_dir.as_posix(), lambda: validate_signals(signals_dir, errors), errors)
+            updates["signals"] = findings(errors)
+
+        if everything or any(path.parent in catalog_dirs for path in changed):
+            errors, warnings = [], []
+            with metrics.phase("catalogs"):
+                guarded("catalogs", lambda: validate_catalogs(root, errors, warnings), errors)
+            updates["catalogs"] = findings(errors, warnings)
+        return updates
+
+    with metrics.phase("intake"):
+        initial = set(loose_files(intake_dir)) | (set(archive_files(intake_dir)) if args.include_archive else set())
+    report(current, revalidate(initial, everything=True))
+    print(
+        f"OK [WATCH_STARTED] backend={watcher.backend} path={root.as_posix()} "
+        f"intake_files={len(intake)} errors={current.errors}",
+        flush=True,
+    )
+    return watch_loop(watcher, current, revalidate, metrics)
+
+
+def main() -> int:
+    return run_with_metrics("validate-control-plane-schema", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
-import sys
+
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.textscan import TokenMatcher, iter_files, scan_files
 
 REQUIRED_FILES = [
     Path("README.md"),
@@ -30,11 +33,14 @@ SCAN_PATHS = [
 ]
 
 
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate README/guide consistency and forbidden tokens")
+    parser.add_argument("--workers", type=int, default=0, help="scan threads (0 = auto, 1 = serial)")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
 
 
-def main() -> int:
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
     repo_root = Path(__file__).resolve().parent.parent
     errors: list[str] = []
 
@@ -44,30 +50,30 @@ def main() -> int:
             errors.append(f"missing required document: {rel.as_posix()}")
 
     readme = repo_root / "README.md"
-    if readme.exists():
-        content = read_text(readme)
-        for token in REQUIRED_README_TOKENS:
-            if token not in content:
-                errors.append(f"README.md missing token: {token}")
-
-    for rel in SCAN_PATHS:
-        full = repo_root / rel
-        if not full.exists():
+    with metrics.phase("discovery"):
+        files = list(dict.fromkeys(iter_files([repo_root / rel for rel in SCAN_PATHS])))
+        if readme.exists() and readme not in files:
+            files.append(readme)
+
+    matcher = TokenMatcher([FORBIDDEN_TOKEN, *REQUIRED_README_TOKENS])
+    with metrics.phase("scan"):
+        scans = scan_files(files, matcher, args.workers)
+
+    for scan in scans:
+        metrics.inc("files_processed")
+        if scan.binary:
+            metrics.inc("files_binary")
             continue
-
-        files: list[Path] = []
-        if full.is_file():
-            files = [full]
-        else:
-            files = [p for p in full.rglob("*") if p.is_file()]
-
-        for file in files:
-            if file.suffix.lower() in {".png", ".jpg", ".jpeg", ".gif", ".exe", ".tar", ".gz", ".zip", ".pyc"}:
-                continue
-            text = read_text(file)
-            if FORBIDDEN_TOKEN in text:
-                relpath = file.relative_to(repo_root).as_posix()
-                errors.append(f"forbidden token '{FORBIDDEN_TOKEN}' found in {relpath}")
+        if scan.error:
+            errors.append(f"unreadable file {scan.path.relative_to(repo_root).as_posix()}: {scan.error}")
+            continue
+        if scan.path == readme:
+            for token in REQUIRED_README_TOKENS:
+                if token not in scan.found:
+                    errors.append(f"README.md missing token: {token}")
+        if FORBIDDEN_TOKEN in scan.found:
+            relpath = scan.path.relative_to(repo_root).as_posix()
+            errors.append(f"forbidden token '{FORBIDDEN_TOKEN}' found in {relpath}")
 
     if errors:
         for err in errors:
@@ -78,5 +84,9 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    return run_with_metrics("validate-doc-consistency", parse_args(), run)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main())
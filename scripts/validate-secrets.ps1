@@ -1,7 +1,9 @@
 #!/usr/bin/env pwsh
 [CmdletBinding()]
 param(
-  [string]$GitleaksVersion = '8.24.2'
+  [string]$GitleaksVersion = '8.24.2',
+  [ValidateSet('auto', 'gitleaks', 'python')]
+  [string]$Scanner = $(if ($env:AGENTTEAMS_SECRET_SCANNER) { $env:AGENTTEAMS_SECRET_SCANNER } else { 'auto' })
 )
 
 Set-StrictMode -Version Latest
@@ -68,9 +70,32 @@ function Resolve-GitleaksPath {
   }
 }
 
+function Get-PythonCommand {
+  $py = Get-Command python -ErrorAction SilentlyContinue
+  if (-not $py) {
+    $py = Get-Command py -ErrorAction SilentlyContinue
+  }
+  return $py
+}
+
+function Invoke-PythonScanner {
+  $py = Get-PythonCommand
+  if (-not $py) {
+    throw 'python is required for the built-in secret scanner.'
+  }
+  & $py.Source .\scripts\scan-secrets.py --source . --config .gitleaks.toml
+}
+
 try {
-  $gitleaksPath = Resolve-GitleaksPath -RepoRoot $repoRoot -Version $GitleaksVersion
-  & $gitleaksPath detect --source . --no-git --config .gitleaks.toml --redact
+  # auto / gitleaks run gitleaks with its full upstream ruleset; the built-in scanner is opt-in (-Scanner python)
+  # because it maps useDefault to a reduced bundled ruleset.
+  if ($Scanner -eq 'python') {
+    Invoke-PythonScanner
+  }
+  else {
+    $gitleaksPath = Resolve-GitleaksPath -RepoRoot $repoRoot -Version $GitleaksVersion
+    & $gitleaksPath detect --source . --no-git --config .gitleaks.toml --redact
+  }
   if ($LASTEXITCODE -ne 0) {
     Write-Error 'secret scan failed'
     exit $LASTEXITCODE
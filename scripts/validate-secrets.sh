@@ -5,6 +5,10 @@ repo_root="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$repo_root"
 
 gitleaks_version="${GITLEAKS_VERSION:-8.24.2}"
+# auto / gitleaks: use gitleaks (downloaded into .tools/ when missing), which runs the full upstream ruleset.
+# python: opt in to the built-in offline scanner (scripts/scan-secrets.py); it maps useDefault to a
+#         reduced bundled ruleset and warns when it does.
+scanner="${AGENTTEAMS_SECRET_SCANNER:-auto}"
 
 resolve_gitleaks_bin() {
   if command -v gitleaks >/dev/null 2>&1; then
@@ -65,7 +69,36 @@ resolve_gitleaks_bin() {
   echo "$local_bin"
 }
 
-gitleaks_bin="$(resolve_gitleaks_bin)"
-"$gitleaks_bin" detect --source . --no-git --config .gitleaks.toml --redact
+python_bin() {
+  if command -v python3 >/dev/null 2>&1; then
+    echo "python3"
+  elif command -v python >/dev/null 2>&1; then
+    echo "python"
+  fi
+}
+
+run_python_scanner() {
+  local py_bin
+  py_bin="$(python_bin)"
+  if [[ -z "$py_bin" ]]; then
+    echo "ERROR: python or python3 is required for the built-in secret scanner." >&2
+    return 1
+  fi
+  "$py_bin" ./scripts/scan-secrets.py --source . --config .gitleaks.toml "$@"
+}
+
+case "$scanner" in
+  auto|gitleaks)
+    gitleaks_bin="$(resolve_gitleaks_bin)"
+    "$gitleaks_bin" detect --source . --no-git --config .gitleaks.toml --redact
+    ;;
+  python)
+    run_python_scanner "$@"
+    ;;
+  *)
+    echo "ERROR: AGENTTEAMS_SECRET_SCANNER must be auto, gitleaks, or python (got: $scanner)" >&2
+    exit 1
+    ;;
+esac
 
 echo "secret scan is valid"
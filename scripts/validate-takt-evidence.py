@@ -2,9 +2,8 @@
 from __future__ import annotations
 
 import argparse
-from datetime import datetime, timezone
+from fnmatch import fnmatch
 from pathlib import Path
-import re
 import subprocess
 import sys
 
@@ -14,8 +13,28 @@ except Exception as exc:  # pragma: no cover
     print(f"ERROR [PYTHON_DEP_MISSING] PyYAML is required: {exc}")
     sys.exit(1)
 
-TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
-APPROVAL_STATUS = {"pending", "approved", "rejected"}
+from agentteams_lib.approvals import APPROVAL_STATUS, ApprovalChain, leader_teams
+from agentteams_lib.metrics import RunMetrics, add_metrics_arguments, run_with_metrics
+from agentteams_lib.routing import RULES_CATALOG, SKILLS_CATALOG, RoutingTable
+from agentteams_lib.taskevents import EVENTS_SUFFIX, EventLogError, event_log_index, materialize
+from agentteams_lib.tasklayout import TASK_FILE_PATTERN, has_archive, in_scope, task_files
+from agentteams_lib.taskmodel import Task
+from agentteams_lib.watch import ErrorSet, Watcher, add_watch_arguments, report, watch_loop
+
+CATALOG_CACHE: dict[str, dict] = {}
+CATALOG_CACHE_STATS = {"hits": 0, "misses": 0}
+ROUTING_TABLES: dict[str, RoutingTable] = {}
+APPROVAL_MESSAGES = {
+    "team_leaders_missing": "missing team leader gate entries: {teams}",
+    "team_leaders_not_approved": "team leader approvals must be approved before QA: {teams}",
+    "qa_not_approved": "qa_gate must be approved for status={status}",
+    "leader_not_approved": "leader_gate must be approved for status=done",
+    "team_after_qa": "team leader approval for {team} occurs after QA approval",
+    "leader_before_qa": "leader_gate approved before qa_gate approval",
+    "leader_at_before_qa_at": "leader_gate.at must be later than qa_gate.at",
+    "rejected_done": "status=done cannot contain rejected gate results",
+    "rework_missing": "rejected gate requires rework declaration by AI team after rejection",
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -23,6 +42,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--tasks", default=".takt/tasks", help="task directory")
     parser.add_argument("--logs", default=".takt/logs", help="logs directory")
     parser.add_argument("--allow-empty-logs", action="store_true", help="do not fail on empty logs")
+    parser.add_argument(
+        "--skip-governance-audit",
+        action="store_true",
+        help="do not run audit-takt-governance.py --strict (the caller runs it separately)",
+    )
+    parser.add_argument(
+        "--active-only",
+        action="store_true",
+        help="check only the active partition (skip .takt/tasks/done/)",
+    )
+    add_watch_arguments(parser)
+    add_metrics_arguments(parser)
     return parser.parse_args()
 
 
@@ -31,299 +62,115 @@ def load_yaml(path: Path) -> dict:
     return data if isinstance(data, dict) else {}
 
 
+def load_task(path: Path, event_logs: dict[str, Path]) -> Task:
+    """Task snapshot with any events appended to its ``<id>.events.jsonl`` since the snapshot."""
+    task = load_yaml(path)
+    return Task.from_dict(materialize(task, event_logs.get(str(task.get("id") or "")))[0])
+
+
 def load_yaml_if_exists(path: Path) -> dict:
     if not path.exists():
         return {}
     return load_yaml(path)
 
 
+def load_catalog(path: Path) -> dict:
+    key = path.as_posix()
+    if key in CATALOG_CACHE:
+        CATALOG_CACHE_STATS["hits"] += 1
+        return CATALOG_CACHE[key]
+    CATALOG_CACHE_STATS["misses"] += 1
+    data = load_yaml_if_exists(path)
+    CATALOG_CACHE[key] = data
+    return data
+
+
 def as_list(value: object) -> list:
     return value if isinstance(value, list) else []
 
 
-def team_of(role_ref: object) -> str:
-    value = str(role_ref or "").strip()
-    if "/" in value:
-        return value.split("/", 1)[0].strip()
-    return value
-
-
-def parse_iso_utc(value: object) -> datetime | None:
-    raw = str(value or "").strip()
-    if not TIMESTAMP_PATTERN.fullmatch(raw):
-        return None
-    try:
-        return datetime.fromisoformat(raw.replace("Z", "+00:00")).astimezone(timezone.utc)
-    except ValueError:
-        return None
-
-
-def required_teams(task: dict) -> set[str]:
-    routing = task.get("routing")
-    if isinstance(routing, dict) and isinstance(routing.get("required_teams"), list):
-        teams = {str(v).strip() for v in routing.get("required_teams") if str(v).strip()}
-        if teams:
-            teams.add("coordinator")
-            return teams
-    return {"coordinator"}
-
-
-def capability_tags(task: dict) -> set[str]:
-    routing = task.get("routing")
-    if not isinstance(routing, dict):
-        return set()
-    tags = routing.get("capability_tags")
-    if not isinstance(tags, list):
-        return set()
-    return {str(v).strip() for v in tags if str(v).strip()}
-
-
-def declared_teams(task: dict) -> set[str]:
-    teams: set[str] = set()
-
-    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-    for entry in declarations:
-        if not isinstance(entry, dict):
-            continue
-        team = team_of(entry.get("team"))
-        if team:
-            teams.add(team)
-
-    handoffs = task.get("handoffs") if isinstance(task.get("handoffs"), list) else []
-    for entry in handoffs:
-        if not isinstance(entry, dict):
-            continue
-        src = team_of(entry.get("from"))
-        dst = team_of(entry.get("to"))
-        if src:
-            teams.add(src)
-        if dst:
-            teams.add(dst)
-
-    return teams
-
-
-def extract_rule_skill_evidence(task: dict) -> tuple[set[str], set[str]]:
-    rules: set[str] = set()
-    skills: set[str] = set()
-
-    def collect_controls(controls: object) -> None:
-        if not isinstance(controls, list):
-            return
-        for value in controls:
-            text = str(value or "").strip()
-            if text.startswith("rule:"):
-                rules.add(text.removeprefix("rule:"))
-            if text.startswith("skill:"):
-                skills.add(text.removeprefix("skill:"))
-
-    declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-    for entry in declarations:
-        if not isinstance(entry, dict):
-            continue
-        collect_controls(entry.get("controlled_by"))
-
-    approvals = task.get("approvals") if isinstance(task.get("approvals"), dict) else {}
-    team_leader_gates = approvals.get("team_leader_gates")
-    if isinstance(team_leader_gates, list):
-        for gate in team_leader_gates:
-            if isinstance(gate, dict):
-                collect_controls(gate.get("controlled_by"))
-
-    qa_gate = approvals.get("qa_gate")
-    if isinstance(qa_gate, dict):
-        collect_controls(qa_gate.get("controlled_by"))
-    leader_gate = approvals.get("leader_gate")
-    if isinstance(leader_gate, dict):
-        collect_controls(leader_gate.get("controlled_by"))
-
-    return rules, skills
-
-
-def approval_chain_errors(task_file: Path, task: dict, status: str) -> list[str]:
+def approval_chain_errors(task_file: Path, task: Task, required_teams: list[str]) -> list[str]:
     errors: list[str] = []
-    approvals = task.get("approvals")
-    if not isinstance(approvals, dict):
+    if not task.has_approvals:
         errors.append(f"{task_file.as_posix()}: approvals map is required")
         return errors
 
-    required_team_leaders = sorted(team for team in required_teams(task) if team != "qa-review-guild")
-    team_leader_gates = approvals.get("team_leader_gates")
-    if not isinstance(team_leader_gates, list):
+    if not task.has_gate_list:
         errors.append(f"{task_file.as_posix()}: approvals.team_leader_gates must be a list")
-        team_leader_gates = []
-
-    latest_team_state: dict[str, tuple[datetime, str]] = {}
-    latest_team_state_any: dict[str, str] = {}
-    for gate in team_leader_gates:
-        if not isinstance(gate, dict):
-            continue
-        team = str(gate.get("team") or "").strip()
-        gate_status = str(gate.get("status") or "").strip()
-        gate_at = parse_iso_utc(gate.get("at"))
-        if team:
-            latest_team_state_any[team] = gate_status
-        if team and gate_at is not None:
-            existing = latest_team_state.get(team)
-            if existing is None or gate_at >= existing[0]:
-                latest_team_state[team] = (gate_at, gate_status)
-
-    qa_gate = approvals.get("qa_gate") if isinstance(approvals.get("qa_gate"), dict) else {}
-    qa_status = str(qa_gate.get("status") or "").strip()
-    qa_at = parse_iso_utc(qa_gate.get("at"))
-
-    leader_gate = approvals.get("leader_gate") if isinstance(approvals.get("leader_gate"), dict) else {}
-    leader_status = str(leader_gate.get("status") or "").strip()
-    leader_at = parse_iso_utc(leader_gate.get("at"))
-
-    if qa_status not in APPROVAL_STATUS:
+
+    chain = ApprovalChain.from_task(task, leader_teams(required_teams))
+    if chain.qa.status not in APPROVAL_STATUS:
         errors.append(f"{task_file.as_posix()}: approvals.qa_gate.status is invalid")
-    if leader_status not in APPROVAL_STATUS:
+    if chain.leader.status not in APPROVAL_STATUS:
         errors.append(f"{task_file.as_posix()}: approvals.leader_gate.status is invalid")
 
-    if status in {"in_review", "done"}:
-        missing = sorted(team for team in required_team_leaders if team not in latest_team_state_any)
-        if missing:
-            errors.append(
-                f"{task_file.as_posix()}: missing team leader gate entries: {','.join(missing)}"
-            )
+    for violation in chain.violations(task.status):
+        message = APPROVAL_MESSAGES[violation.code].format(
+            status=task.status, teams=",".join(violation.teams), team=",".join(violation.teams)
+        )
+        errors.append(f"{task_file.as_posix()}: {message}")
+    return errors
 
-        not_approved = sorted(
-            team
-            for team in required_team_leaders
-            if latest_team_state.get(team, (datetime.min.replace(tzinfo=timezone.utc), "pending"))[1] != "approved"
+
+def routing_table(root: Path) -> RoutingTable:
+    key = root.as_posix()
+    if key not in ROUTING_TABLES:
+        cp_root = root / ".takt" / "control-plane"
+        ROUTING_TABLES[key] = RoutingTable.compile(
+            as_list(load_catalog(cp_root / RULES_CATALOG).get("rules")),
+            as_list(load_catalog(cp_root / SKILLS_CATALOG).get("skills")),
         )
-        if not_approved:
-            errors.append(
-                f"{task_file.as_posix()}: team leader approvals must be approved before QA: {','.join(not_approved)}"
-            )
+    return ROUTING_TABLES[key]
 
-        if qa_status != "approved":
-            errors.append(f"{task_file.as_posix()}: qa_gate must be approved for status={status}")
 
-    if status == "done" and leader_status != "approved":
-        errors.append(f"{task_file.as_posix()}: leader_gate must be approved for status=done")
+def routing_signature(task: Task, root: Path) -> tuple:
+    """What the evidence checks take from the catalogs for ``task``."""
+    decision = routing_table(root).route(task)
+    return tuple(decision.required_teams), tuple(decision.rule_ids), tuple(decision.required_skills)
 
-    if qa_status == "approved" and qa_at is not None:
-        for team in required_team_leaders:
-            state = latest_team_state.get(team)
-            if state is None:
-                continue
-            if state[0] > qa_at:
-                errors.append(
-                    f"{task_file.as_posix()}: team leader approval for {team} occurs after QA approval"
-                )
-
-    if leader_status == "approved":
-        if qa_status != "approved":
-            errors.append(f"{task_file.as_posix()}: leader_gate approved before qa_gate approval")
-        if leader_at is not None and qa_at is not None and leader_at < qa_at:
-            errors.append(f"{task_file.as_posix()}: leader_gate.at must be later than qa_gate.at")
-
-    rejection_times: list[datetime] = []
-    for team in required_team_leaders:
-        state = latest_team_state.get(team)
-        if state and state[1] == "rejected":
-            rejection_times.append(state[0])
-    if qa_status == "rejected" and qa_at is not None:
-        rejection_times.append(qa_at)
-    if leader_status == "rejected" and leader_at is not None:
-        rejection_times.append(leader_at)
-
-    if rejection_times:
-        if status == "done":
-            errors.append(f"{task_file.as_posix()}: status=done cannot contain rejected gate results")
-        latest_rejection = max(rejection_times)
-        declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-        has_rework = False
-        for entry in declarations:
-            if not isinstance(entry, dict):
-                continue
-            action = str(entry.get("action") or "").strip().lower()
-            if not action:
-                continue
-            if "rework" not in action and "fix" not in action and "address_rejection" not in action:
-                continue
-            at = parse_iso_utc(entry.get("at"))
-            if at is not None and at >= latest_rejection:
-                has_rework = True
-                break
-        if not has_rework:
-            errors.append(
-                f"{task_file.as_posix()}: rejected gate requires rework declaration by AI team after rejection"
+
+def validate_task_evidence(task_file: Path, task: Task, root: Path) -> list[str]:
+    evidence_errors: list[str] = []
+    status = task.status
+    routing = routing_table(root).route(task)
+    expected_teams = set(routing.required_teams)
+    expected_rules, expected_skills = set(routing.rule_ids), set(routing.required_skills)
+
+    if status in {"in_progress", "in_review", "blocked", "done"} and task.declaration_count == 0:
+        evidence_errors.append(
+            f"{task_file.as_posix()}: status={status} requires at least one declaration"
+        )
+
+    if status in {"in_review", "done"}:
+        missing_teams = sorted(expected_teams - task.observed_teams)
+        if missing_teams:
+            evidence_errors.append(
+                f"{task_file.as_posix()}: missing declared teams for status={status}: {','.join(missing_teams)}"
             )
 
-    return errors
+        if task.handoff_count == 0:
+            evidence_errors.append(
+                f"{task_file.as_posix()}: status={status} requires at least one handoff evidence"
+            )
 
+        missing_rules = sorted(expected_rules - task.rules)
+        if missing_rules:
+            evidence_errors.append(
+                f"{task_file.as_posix()}: missing rule evidence for status={status}: {','.join(missing_rules)}"
+            )
 
-def rule_matches_task(rule: dict, task: dict) -> bool:
-    when = rule.get("when") if isinstance(rule.get("when"), dict) else {}
-    status = str(task.get("status") or "")
-    tags = capability_tags(task)
-
-    if isinstance(when.get("any_status"), list):
-        statuses = {str(v).strip() for v in when.get("any_status") if str(v).strip()}
-        if statuses and status not in statuses:
-            return False
-
-    trigger_tags = when.get("capability_tags")
-    if isinstance(trigger_tags, list):
-        required_tags = {str(v).strip() for v in trigger_tags if str(v).strip()}
-        if required_tags and not tags.intersection(required_tags):
-            return False
-
-    return True
-
-
-def expected_rule_and_skill_ids(task: dict, root: Path) -> tuple[set[str], set[str]]:
-    expected_rules: set[str] = set()
-    expected_skills: set[str] = set()
-
-    required = required_teams(task)
-    tags = capability_tags(task)
-
-    rules_data = load_yaml_if_exists(root / ".takt" / "control-plane" / "rule-catalog" / "routing-rules.yaml")
-    rules = rules_data.get("rules") if isinstance(rules_data.get("rules"), list) else []
-    for rule in rules:
-        if not isinstance(rule, dict):
-            continue
-        if not bool(rule.get("enabled", False)):
-            continue
-        rule_id = str(rule.get("rule_id") or "").strip()
-        if not rule_id:
-            continue
-        if not rule_matches_task(rule, task):
-            continue
-        expected_rules.add(rule_id)
-        for skill in as_list(rule.get("require_skills")):
-            skill_text = str(skill).strip()
-            if skill_text:
-                expected_skills.add(skill_text)
-
-    skills_data = load_yaml_if_exists(root / ".takt" / "control-plane" / "skill-catalog" / "skills.yaml")
-    skills = skills_data.get("skills") if isinstance(skills_data.get("skills"), list) else []
-    for skill in skills:
-        if not isinstance(skill, dict):
-            continue
-        if not bool(skill.get("enabled", False)):
-            continue
-        skill_id = str(skill.get("skill_id") or "").strip()
-        if not skill_id:
-            continue
-        applies = {str(v).strip() for v in as_list(skill.get("applies_to_teams")) if str(v).strip()}
-        if applies and not required.intersection(applies):
-            continue
-        trigger = skill.get("trigger") if isinstance(skill.get("trigger"), dict) else {}
-        trigger_tags = {str(v).strip() for v in as_list(trigger.get("capability_tags")) if str(v).strip()}
-        if trigger_tags and tags and not tags.intersection(trigger_tags):
-            continue
-        expected_skills.add(skill_id)
-
-    return expected_rules, expected_skills
+        missing_skills = sorted(expected_skills - task.skills)
+        if missing_skills:
+            evidence_errors.append(
+                f"{task_file.as_posix()}: missing skill evidence for status={status}: {','.join(missing_skills)}"
+            )
 
+    # Leader gates follow the same routed teams (declared plus rule-derived) as the declaration check.
+    evidence_errors.extend(approval_chain_errors(task_file, task, routing.required_teams))
+    return evidence_errors
 
-def main() -> int:
-    args = parse_args()
+
+def run(args: argparse.Namespace, metrics: RunMetrics) -> int:
     root = Path.cwd()
 
     task_dir = (root / args.tasks).resolve()
@@ -333,75 +180,58 @@ def main() -> int:
         print(f"ERROR [EVIDENCE_TASK_DIR_MISSING] {task_dir.as_posix()}")
         return 1
 
-    tasks = sorted(task_dir.glob("TASK-*.yaml"))
-    if not tasks:
-        print(f"ERROR [EVIDENCE_TASKS_EMPTY] no TASK-*.yaml under {task_dir.as_posix()}")
+    with metrics.phase("discovery"):
+        tasks = task_files(task_dir, include_archive=not args.active_only)
+        event_logs = event_log_index(task_dir, include_archive=not args.active_only)
+    if not tasks and not (args.active_only and has_archive(task_dir)):
+        print(f"ERROR [EVIDENCE_TASKS_EMPTY] no {TASK_FILE_PATTERN} under {task_dir.as_posix()}")
         return 1
+    if args.watch:
+        return watch(args, metrics, root, task_dir, tasks)
 
     evidence_errors: list[str] = []
     for task_file in tasks:
-        task = load_yaml(task_file)
-        status = str(task.get("status") or "")
-        handoffs = task.get("handoffs") if isinstance(task.get("handoffs"), list) else []
-        declarations = task.get("declarations") if isinstance(task.get("declarations"), list) else []
-        expected_teams = required_teams(task)
-        observed_teams = declared_teams(task)
-        observed_rules, observed_skills = extract_rule_skill_evidence(task)
-        expected_rules, expected_skills = expected_rule_and_skill_ids(task, root)
-
-        if status in {"in_progress", "in_review", "blocked", "done"} and len(declarations) == 0:
-            evidence_errors.append(
-                f"{task_file.as_posix()}: status={status} requires at least one declaration"
-            )
-
-        if status in {"in_review", "done"}:
-            missing_teams = sorted(expected_teams - observed_teams)
-            if missing_teams:
-                evidence_errors.append(
-                    f"{task_file.as_posix()}: missing declared teams for status={status}: {','.join(missing_teams)}"
-                )
-
-            if len(handoffs) == 0:
-                evidence_errors.append(
-                    f"{task_file.as_posix()}: status={status} requires at least one handoff evidence"
-                )
-
-            missing_rules = sorted(expected_rules - observed_rules)
-            if missing_rules:
-                evidence_errors.append(
-                    f"{task_file.as_posix()}: missing rule evidence for status={status}: {','.join(missing_rules)}"
-                )
-
-            missing_skills = sorted(expected_skills - observed_skills)
-            if missing_skills:
-                evidence_errors.append(
-                    f"{task_file.as_posix()}: missing skill evidence for status={status}: {','.join(missing_skills)}"
-                )
-
-        evidence_errors.extend(approval_chain_errors(task_file, task, status))
+        with metrics.phase("parse"):
+            try:
+                task = load_task(task_file, event_logs)
+            except EventLogError as exc:
+                evidence_errors.append(f"{task_file.as_posix()}: event log: {exc}")
+                continue
+        metrics.inc("files_processed")
+        with metrics.phase("validate"):
+            task_errors = validate_task_evidence(task_file, task, root)
+        if task_errors:
+            metrics.inc("tasks_invalid")
+            evidence_errors.extend(task_errors)
 
     log_files = [p for p in logs_dir.glob("*") if p.is_file()] if logs_dir.exists() else []
     if not log_files and not args.allow_empty_logs:
         evidence_errors.append(f"{logs_dir.as_posix()}: no evidence log files found")
+    metrics.gauge("log_files", len(log_files))
 
     audit_script = root / "scripts" / "audit-takt-governance.py"
-    if not audit_script.exists():
+    if args.skip_governance_audit:
+        pass
+    elif not audit_script.exists():
         evidence_errors.append(f"missing script: {audit_script.as_posix()}")
     else:
-        proc = subprocess.run(
-            [sys.executable, str(audit_script), "--strict"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        )
+        with metrics.phase("audit"):
+            proc = subprocess.run(
+                [sys.executable, str(audit_script), "--strict", *([] if args.active_only else ["--include-archive"])],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
         out = proc.stdout.strip()
         if out:
             print(out)
         if proc.returncode != 0:
             evidence_errors.append("strict governance audit failed")
 
+    metrics.inc("cache_hits", CATALOG_CACHE_STATS["hits"])
+    metrics.inc("cache_misses", CATALOG_CACHE_STATS["misses"])
     if evidence_errors:
         for err in evidence_errors:
             print(f"ERROR [TAKT_EVIDENCE_INVALID] {err}")
@@ -411,5 +241,82 @@ def main() -> int:
     return 0
 
 
+def watch(args: argparse.Namespace, metrics: RunMetrics, root: Path, task_dir: Path, tasks: list[Path]) -> int:
+    """Validate once, then revalidate changed tasks, and on a catalog change only the tasks whose routing moved.
+
+    Evidence logs and the strict governance audit are full-directory checks and are not rerun while watching.
+    """
+    cp_root = root / ".takt" / "control-plane"
+    catalogs = {(cp_root / RULES_CATALOG).resolve(), (cp_root / SKILLS_CATALOG).resolve()}
+    watcher = Watcher(
+        [task_dir, *{path.parent for path in catalogs}], debounce=args.debounce_ms / 1000, poll=args.poll
+    )
+    findings = ErrorSet()
+    loaded: dict[Path, Task] = {}
+    signatures: dict[Path, tuple] = {}
+
+    def check(task_file: Path, event_logs: dict[str, Path]) -> list[str]:
+        loaded.pop(task_file, None)
+        signatures.pop(task_file, None)
+        if not task_file.exists():
+            return []
+        with metrics.phase("parse"):
+            try:
+                loaded[task_file] = load_task(task_file, event_logs)
+            except EventLogError as exc:
+                return [f"{task_file.as_posix()}: event log: {exc}"]
+            except yaml.YAMLError as exc:
+                return [f"{task_file.as_posix()}: invalid YAML: {' '.join(str(exc).split())}"]
+        metrics.inc("files_processed")
+        return check_loaded(task_file)
+
+    def check_loaded(task_file: Path) -> list[str]:
+        task = loaded[task_file]
+        signatures[task_file] = routing_signature(task, root)
+        with metrics.phase("validate"):
+            return validate_task_evidence(task_file, task, root)
+
+    def revalidate(changed: set[Path]) -> dict[str, list[str]]:
+        event_logs = event_log_index(task_dir, include_archive=not args.active_only)
+        file_for_id = {task.id: path for path, task in loaded.items()}
+        edited: set[Path] = set()
+        for path in changed:
+            if not in_scope(task_dir, path, include_archive=not args.active_only):
+                continue
+            if path.name.endswith(EVENTS_SUFFIX):
+                owner = file_for_id.get(path.name[: -len(EVENTS_SUFFIX)])
+                if owner is not None:
+                    edited.add(owner)
+            elif fnmatch(path.name, TASK_FILE_PATTERN):
+                edited.add(path)
+        catalog_changed = bool(catalogs & changed)
+        if catalog_changed:
+            CATALOG_CACHE.clear()
+            ROUTING_TABLES.clear()
+        updates = {path.as_posix(): check(path, event_logs) for path in sorted(edited)}
+        if catalog_changed:
+            with metrics.phase("route"):
+                moved = [
+                    path
+                    for path, task in loaded.items()
+                    if path not in edited and routing_signature(task, root) != signatures[path]
+                ]
+            for path in sorted(moved):
+                updates[path.as_posix()] = check_loaded(path)
+        return {source: [f"ERROR [TAKT_EVIDENCE_INVALID] {err}" for err in errs] for source, errs in updates.items()}
+
+    report(findings, revalidate(set(tasks)))
+    print(
+        f"OK [WATCH_STARTED] backend={watcher.backend} path={task_dir.as_posix()} "
+        f"tasks={len(loaded)} errors={findings.errors}",
+        flush=True,
+    )
+    return watch_loop(watcher, findings, revalidate, metrics)
+
+
+def main() -> int:
+    return run_with_metrics("validate-takt-evidence", parse_args(), run)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())